@@ -0,0 +1,81 @@
+"""
+Benchmark of scripted command throughput.
+
+Writes a script of add, phone and change commands and pipes it through main.py twice:
+once into the interactive prompt, as provisioning scripts used to, and once with
+--batch, which writes the results through one buffered writer. The results go to a
+pipe that is drained by this process, as they would be by a calling script.
+
+Usage:
+    $ python -m benchmarks.bench_batch [--commands N] [--wal]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+
+def make_script(path: str, commands: int) -> None:
+    """
+    Writes a script adding contacts, looking them up and changing their phones.
+
+    Args:
+        path (str): The path of the script.
+        commands (int): The number of commands.
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        for i in range(commands):
+            contact = i // 3
+            phone = f"050{contact:07d}"
+            if i % 3 == 0:
+                file.write(f"add Contact{contact} {phone}\n")
+            elif i % 3 == 1:
+                file.write(f"phone Contact{contact}\n")
+            else:
+                file.write(f"change Contact{contact} {phone} 067{contact:07d}\n")
+        file.write("exit\n")
+
+def run(label: str, argv: List[str], script: str, commands: int) -> None:
+    """
+    Runs main.py on a script and prints its throughput.
+
+    Args:
+        label (str): The name of the mode.
+        argv (list[str]): The command-line options of main.py.
+        script (str): The path of the script, piped to standard input.
+        commands (int): The number of commands in the script.
+    """
+    started = time.perf_counter()
+    with open(script, "rb") as stdin:
+        process = subprocess.Popen([sys.executable, "main.py", *argv], stdin=stdin,
+                                   stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        lines = sum(1 for _ in process.stdout)
+        process.wait()
+    seconds = time.perf_counter() - started
+    print(f"{label:>12}: {seconds:>7.2f} s, {commands / seconds:>10,.0f} commands/s "
+          f"({lines:,} output lines)")
+
+def main() -> None:
+    """
+    Runs the benchmark and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--commands", type=int, default=300_000)
+    parser.add_argument("--wal", action="store_true",
+                        help="keep the contacts in a write-ahead log")
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        script = os.path.join(directory, "script.txt")
+        make_script(script, options.commands)
+        print(f"{options.commands:,} commands")
+        for label, argv in (("interactive", []), ("--batch", ["--batch", "-"])):
+            if options.wal:
+                argv = ["--wal", os.path.join(directory, f"{label.strip('-')}.wal"), *argv]
+            run(label, argv, script, options.commands)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark of loading contacts row by row against AddressBook.bulk_add.
+
+Loads the same rows into an empty in-memory address book through the add command
+handler, one row at a time, and through a single bulk_add call. About a fifth of the
+rows repeat an earlier name and a tenth of the phone numbers are invalid.
+
+Usage:
+    $ python -m benchmarks.bench_bulk [--rows N]
+"""
+
+import argparse
+import random
+import time
+from typing import List, Tuple
+
+from bot.cli import add_contact
+from bot.models import AddressBook
+
+def make_rows(rows: int) -> List[Tuple[str, str]]:
+    """
+    Generates import rows of a name and a phone number.
+
+    Args:
+        rows (int): The number of rows.
+
+    Returns:
+        list[tuple[str, str]]: The rows.
+    """
+    names = int(rows * 0.8) or 1
+    result = []
+    for _ in range(rows):
+        number = f"{random.randrange(10 ** 10):010d}"
+        if random.random() < 0.1:
+            number = number[:9]
+        result.append((f"Contact{random.randrange(names)}", number))
+    return result
+
+def per_row(rows: List[Tuple[str, str]]) -> AddressBook:
+    """
+    Loads the rows with the add command handler.
+
+    Args:
+        rows (list[tuple[str, str]]): The rows.
+
+    Returns:
+        AddressBook: The loaded address book.
+    """
+    book = AddressBook()
+    for name, phone in rows:
+        add_contact([name, phone], book)
+    return book
+
+def bulk(rows: List[Tuple[str, str]]) -> AddressBook:
+    """
+    Loads the rows with AddressBook.bulk_add.
+
+    Args:
+        rows (list[tuple[str, str]]): The rows.
+
+    Returns:
+        AddressBook: The loaded address book.
+    """
+    book = AddressBook()
+    book.bulk_add((name, (phone,)) for name, phone in rows)
+    return book
+
+def main() -> None:
+    """
+    Runs the benchmark and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    options = parser.parse_args()
+
+    rows = make_rows(options.rows)
+    for label, load in (("add_contact per row", per_row), ("bulk_add", bulk)):
+        started = time.perf_counter()
+        book = load(rows)
+        seconds = time.perf_counter() - started
+        print(f"{label:>20}: {len(rows) / seconds:>10,.0f} rows/s ({len(book):,} contacts)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark of the per-command dispatch overhead.
+
+Routes commands to a handler that does nothing, so only the routing is timed: a
+direct call, CommandRegistry.dispatch, and a linear chain of name comparisons like the
+former if/elif loop of main.py, over the names of the built-in commands. The chain is
+timed for the first and the last command, its best and worst case.
+
+Usage:
+    $ python -m benchmarks.bench_dispatch [--calls N]
+"""
+
+import argparse
+import time
+from typing import Callable, List
+
+from bot.cli.commands import REGISTRY, Command, CommandRegistry
+from bot.models import AddressBook
+
+def noop(args: List[str], address_book: AddressBook) -> str:
+    """
+    A handler doing nothing.
+
+    Args:
+        args (list[str]): The arguments of the command.
+        address_book (AddressBook): The address book.
+
+    Returns:
+        str: An empty output.
+    """
+    return ""
+
+def make_chain(names: List[str]) -> Callable[[str, List[str], AddressBook], str]:
+    """
+    Creates a router comparing the command with every name in turn, as an if/elif
+    chain does.
+
+    Args:
+        names (list[str]): The command names, in the order they are compared.
+
+    Returns:
+        Callable[[str, list[str], AddressBook], str]: The router.
+    """
+    def route(command: str, args: List[str], address_book: AddressBook) -> str:
+        for name in names:
+            if command == name:
+                return noop(args, address_book)
+        return "Invalid command."
+    return route
+
+def run(label: str, call: Callable[[], object], calls: int) -> None:
+    """
+    Times repeated calls and prints the cost of one.
+
+    Args:
+        label (str): The name of the router.
+        call (Callable[[], object]): Routes one command.
+        calls (int): The number of calls.
+    """
+    started = time.perf_counter()
+    for _ in range(calls):
+        call()
+    seconds = time.perf_counter() - started
+    print(f"{label:>26}: {seconds / calls * 1e9:>8,.0f} ns/command")
+
+def main() -> None:
+    """
+    Runs the benchmark and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    options = parser.parse_args()
+
+    names = list(REGISTRY)
+    registry = CommandRegistry()
+    for name in names:
+        registry.register(Command(name, noop, 0, 2))
+    chain = make_chain(names)
+    book = AddressBook()
+    args = ["John", "0501234567"]
+    first, last = names[0], names[-1]
+
+    print(f"{len(names)} commands, {options.calls:,} calls each")
+    run("direct call", lambda: noop(args, book), options.calls)
+    run(f"registry ({last})", lambda: registry.dispatch(last, args, book), options.calls)
+    run(f"if/elif chain ({first})", lambda: chain(first, args, book), options.calls)
+    run(f"if/elif chain ({last})", lambda: chain(last, args, book), options.calls)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Load generator for the HTTP/JSON API of the assistant bot.
+
+Starts `main.py --http` on a free local port, then has many client threads send requests
+at the same time: an add of a new contact (POST /contacts) followed by lookups of it
+(GET /contacts/<name>). Every client either keeps one connection open for all its
+requests (keep-alive) or opens a new connection per request, and each mode reports the
+requests per second and the 50th and 99th percentile of the latency. With --idle N,
+N more clients keep a connection open during the load but send only one request every
+IDLE_PERIOD seconds, as idle browsers and pooled HTTP clients do. A final run pages
+through the whole address book with GET /contacts?limit=N.
+
+Usage:
+    $ python -m benchmarks.bench_http [--clients N] [--requests N] [--workers N]
+          [--idle N] [--page N] [--mode keepalive|connect ...]
+    $ python -m benchmarks.bench_http --clients 64 --requests 500 --workers 16 --idle 32
+"""
+
+import argparse
+import http.client
+import json
+import socket
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, List, Optional
+from urllib.parse import quote
+
+IDLE_PERIOD = 2.0
+
+def free_port() -> int:
+    """
+    Returns a local TCP port that is free to listen on.
+
+    Returns:
+        int: The port.
+    """
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+def wait_for_server(port: int, seconds: float = 10.0) -> None:
+    """
+    Waits until the server accepts connections.
+
+    Args:
+        port (int): The port of the server.
+        seconds (float): How long to wait.
+
+    Raises:
+        OSError: If the server does not accept connections in time.
+    """
+    deadline = time.monotonic() + seconds
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port)).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+def call(connection: http.client.HTTPConnection, method: str, path: str,
+         body: Optional[dict] = None) -> Any:
+    """
+    Sends a request and returns its decoded JSON reply.
+
+    Args:
+        connection (http.client.HTTPConnection): The connection.
+        method (str): The HTTP method.
+        path (str): The path of the endpoint.
+        body (dict | None): The JSON body, if any.
+
+    Returns:
+        Any: The decoded reply, None if it is empty.
+
+    Raises:
+        RuntimeError: If the server answers with an error.
+    """
+    data = None if body is None else json.dumps(body).encode()
+    headers = {} if data is None else {"Content-Type": "application/json"}
+    connection.request(method, path, data, headers)
+    response = connection.getresponse()
+    payload = response.read()
+    if response.status >= 400:
+        raise RuntimeError(f"{method} {path}: {response.status} {payload!r}")
+    return json.loads(payload) if payload else None
+
+def drive(client: int, requests: int, port: int, keepalive: bool, start: threading.Event,
+          latencies: List[float]) -> None:
+    """
+    Sends the requests of one client, recording the latency of every request.
+
+    Args:
+        client (int): The number of the client.
+        requests (int): The number of requests.
+        port (int): The port of the server.
+        keepalive (bool): Whether to reuse one connection for all requests.
+        start (threading.Event): Set when all clients are ready.
+        latencies (list[float]): Receives the latencies in seconds.
+    """
+    connection = http.client.HTTPConnection("127.0.0.1", port) if keepalive else None
+    timings = []
+    start.wait()
+    for i in range(requests):
+        name = f"Client{client}x{i // 4}"
+        started = time.perf_counter()
+        current = connection or http.client.HTTPConnection("127.0.0.1", port)
+        if i % 4 == 0:
+            call(current, "POST", "/contacts",
+                 {"name": name, "phone": f"05{client % 100:02d}{i // 4:06d}"})
+        else:
+            call(current, "GET", f"/contacts/{quote(name)}")
+        if connection is None:
+            current.close()
+        timings.append(time.perf_counter() - started)
+    if connection is not None:
+        connection.close()
+    latencies.extend(timings)
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """
+    Returns a percentile of sorted values.
+
+    Args:
+        ordered (list[float]): The values in ascending order.
+        fraction (float): The percentile as a fraction, e.g. 0.99.
+
+    Returns:
+        float: The value below which the given fraction of the values lie.
+    """
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def load(port: int, clients: int, requests: int, keepalive: bool) -> None:
+    """
+    Runs the load of one mode and prints the results.
+
+    Args:
+        port (int): The port of the server.
+        clients (int): The number of concurrent clients.
+        requests (int): The number of requests sent by every client.
+        keepalive (bool): Whether every client reuses one connection.
+    """
+    start = threading.Event()
+    latencies: List[float] = []
+    threads = [threading.Thread(target=drive,
+                                args=(number, requests, port, keepalive, start, latencies))
+               for number in range(clients)]
+    for thread in threads:
+        thread.start()
+    started = time.perf_counter()
+    start.set()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - started
+
+    latencies.sort()
+    total = clients * requests
+    mode = "keep-alive" if keepalive else "connection per request"
+    print(f"{mode}: {clients:,} clients x {requests:,} requests in {seconds:.2f} s, "
+          f"{total / seconds:,.0f} requests/s")
+    print(f"  latency p50 {percentile(latencies, 0.5) * 1000:.2f} ms, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.2f} ms, "
+          f"max {latencies[-1] * 1000:.2f} ms")
+
+def hold_idle(port: int, count: int, ready: threading.Event, stop: threading.Event) -> None:
+    """
+    Keeps connections open without load: every IDLE_PERIOD seconds each sends one
+    request, often enough for the server not to close it as idle.
+
+    Args:
+        port (int): The port of the server.
+        count (int): The number of connections.
+        ready (threading.Event): Set once every connection is open.
+        stop (threading.Event): Set to close the connections.
+    """
+    connections = [http.client.HTTPConnection("127.0.0.1", port) for _ in range(count)]
+    while True:
+        for connection in connections:
+            call(connection, "GET", "/contacts?limit=1")
+        ready.set()
+        if stop.wait(IDLE_PERIOD):
+            break
+    for connection in connections:
+        connection.close()
+
+def page_through(port: int, page: int) -> None:
+    """
+    Lists the whole address book page by page and prints the time taken.
+
+    Args:
+        port (int): The port of the server.
+        page (int): The number of contacts per page.
+    """
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    started = time.perf_counter()
+    contacts = pages = 0
+    after = None
+    while True:
+        path = f"/contacts?limit={page}" + ("" if after is None else f"&after={quote(after)}")
+        reply = call(connection, "GET", path)
+        contacts += len(reply["contacts"])
+        pages += 1
+        after = reply["next"]
+        if after is None:
+            break
+    seconds = time.perf_counter() - started
+    connection.close()
+    print(f"paged all: {contacts:,} contacts in {pages:,} pages of {page:,} "
+          f"in {seconds * 1000:.1f} ms")
+
+def main() -> None:
+    """
+    Starts a server, runs the load and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=16,
+                        help="the worker threads of the server (default: 16)")
+    parser.add_argument("--idle", type=int, default=0,
+                        help="mostly idle connections held open during the load (default: 0)")
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--mode", choices=("keepalive", "connect"), nargs="+",
+                        default=["keepalive", "connect"],
+                        help="the modes to run (default: keepalive connect)")
+    options = parser.parse_args()
+
+    port = free_port()
+    server = subprocess.Popen([sys.executable, "main.py", "--http", f"127.0.0.1:{port}",
+                               "--workers", str(options.workers)], stdout=subprocess.DEVNULL)
+    try:
+        wait_for_server(port)
+        ready, stop = threading.Event(), threading.Event()
+        idle = threading.Thread(target=hold_idle, args=(port, options.idle, ready, stop))
+        idle.start()
+        ready.wait()
+        for mode in options.mode:
+            load(port, options.clients, options.requests, mode == "keepalive")
+        stop.set()
+        idle.join()
+        page_through(port, options.page)
+    finally:
+        server.terminate()
+        server.wait()
+
+if __name__ == "__main__":
+    main()
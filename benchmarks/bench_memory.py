@@ -0,0 +1,55 @@
+"""
+Benchmark of the memory used per contact by an in-memory address book.
+
+Measures the memory allocated (with tracemalloc) while building an address book of
+contacts with one and with three phone numbers, including the book's indexes and the
+name and phone number strings parsed from the input.
+
+Usage:
+    $ python -m benchmarks.bench_memory [--contacts N]
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from bot.models import AddressBook, Record
+
+def bytes_per_contact(contacts: int, phones: int) -> float:
+    """
+    Measures the memory allocated per contact.
+
+    Args:
+        contacts (int): The number of contacts to add.
+        phones (int): The number of phone numbers per contact.
+
+    Returns:
+        float: The allocated bytes per contact.
+    """
+    gc.collect()
+    tracemalloc.start()
+    book = AddressBook()
+    for i in range(contacts):
+        record = Record(f"Contact{i}")
+        for j in range(phones):
+            record.add_phone(f"{i * phones + j:010d}")
+        book.add_record(record)
+    gc.collect()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return allocated / contacts
+
+def main() -> None:
+    """
+    Runs the benchmark and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--contacts", type=int, default=100_000)
+    options = parser.parse_args()
+
+    for phones in (1, 3):
+        size = bytes_per_contact(options.contacts, phones)
+        print(f"{phones} phone(s): {size:>8,.0f} bytes per contact")
+
+if __name__ == "__main__":
+    main()
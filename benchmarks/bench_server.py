@@ -0,0 +1,169 @@
+"""
+Load generator for the command server of the assistant bot.
+
+Opens many connections to a server, then has all of them send commands at the same
+time: an add of a new contact followed by lookups of its phone. With a pipeline depth
+of 1 a connection waits for every reply before sending its next command; with a depth
+of N it sends N commands at once and then reads their N replies. Every depth given is
+run in turn, and each run reports the requests per second and the 50th and 99th
+percentile of the round-trip latency.
+
+Without --address, a fresh server with an in-memory address book is started on a
+temporary Unix socket for every run.
+
+Usage:
+    $ python -m benchmarks.bench_server [--address HOST:PORT|unix:PATH]
+          [--connections N] [--requests N] [--pipeline DEPTH ...]
+    One client adding 10k phones, one at a time and pipelined:
+    $ python -m benchmarks.bench_server --connections 1 --requests 10000 --pipeline 1 1000
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+
+from bot.server import BotClient, connect
+
+async def wait_for_server(address: str, seconds: float = 10.0) -> None:
+    """
+    Waits until a server accepts connections.
+
+    Args:
+        address (str): The address of the server.
+        seconds (float): How long to wait.
+
+    Raises:
+        OSError: If the server does not accept connections in time.
+    """
+    deadline = time.monotonic() + seconds
+    while True:
+        try:
+            client = await connect(address)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+        else:
+            await client.close()
+            return
+
+def commands(connection: int, requests: int) -> List[str]:
+    """
+    Returns the commands sent by one connection.
+
+    Args:
+        connection (int): The number of the connection.
+        requests (int): The number of commands.
+
+    Returns:
+        list[str]: Adds of new contacts, each followed by lookups of its phone.
+    """
+    lines = []
+    for i in range(requests):
+        name = f"Client{connection}x{i // 4}"
+        if i % 4 == 0:
+            lines.append(f"add {name} 05{connection % 100:02d}{i // 4:06d}")
+        else:
+            lines.append(f"phone {name}")
+    return lines
+
+async def drive(client: BotClient, lines: List[str], depth: int, start: asyncio.Event,
+                latencies: List[float]) -> None:
+    """
+    Sends commands one at a time or in pipelined batches, recording the latency of
+    every round trip.
+
+    Args:
+        client (BotClient): The connection.
+        lines (list[str]): The commands.
+        depth (int): The number of commands sent before reading their replies.
+        start (asyncio.Event): Set when all connections are open.
+        latencies (list[float]): Receives the round-trip latencies in seconds.
+    """
+    await start.wait()
+    for i in range(0, len(lines), depth):
+        started = time.perf_counter()
+        if depth == 1:
+            await client.request(lines[i])
+        else:
+            await client.pipeline(lines[i:i + depth])
+        latencies.append(time.perf_counter() - started)
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """
+    Returns a percentile of sorted values.
+
+    Args:
+        ordered (list[float]): The values in ascending order.
+        fraction (float): The percentile as a fraction, e.g. 0.99.
+
+    Returns:
+        float: The value below which the given fraction of the values lie.
+    """
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+async def load(address: str, connections: int, requests: int, depth: int) -> None:
+    """
+    Runs the load and prints the results.
+
+    Args:
+        address (str): The address of the server.
+        connections (int): The number of concurrent connections.
+        requests (int): The number of requests sent by every connection.
+        depth (int): The number of requests sent before reading their replies.
+    """
+    await wait_for_server(address)
+    clients = [await connect(address) for _ in range(connections)]
+    start = asyncio.Event()
+    latencies: List[float] = []
+    tasks = [asyncio.create_task(drive(client, commands(number, requests), depth, start,
+                                       latencies))
+             for number, client in enumerate(clients)]
+    started = time.perf_counter()
+    start.set()
+    await asyncio.gather(*tasks)
+    seconds = time.perf_counter() - started
+    for client in clients:
+        await client.close()
+
+    latencies.sort()
+    total = connections * requests
+    print(f"pipeline depth {depth:,}: {connections:,} connections x {requests:,} requests "
+          f"in {seconds:.2f} s, {total / seconds:,.0f} requests/s")
+    print(f"  round trip p50 {percentile(latencies, 0.5) * 1000:.2f} ms, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.2f} ms, "
+          f"max {latencies[-1] * 1000:.2f} ms")
+
+def main() -> None:
+    """
+    Starts a server if needed, runs the load and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--address", help="the server to load (default: start one)")
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--pipeline", type=int, nargs="+", default=[1, 20], metavar="DEPTH",
+                        help="the pipeline depths to run (default: 1 20)")
+    options = parser.parse_args()
+
+    for depth in options.pipeline:
+        if options.address is not None:
+            asyncio.run(load(options.address, options.connections, options.requests, depth))
+            continue
+        with tempfile.TemporaryDirectory() as directory:
+            address = f"unix:{os.path.join(directory, 'bot.sock')}"
+            server = subprocess.Popen([sys.executable, "main.py", "--serve", address],
+                                      stdout=subprocess.DEVNULL)
+            try:
+                asyncio.run(load(address, options.connections, options.requests, depth))
+            finally:
+                server.terminate()
+                server.wait()
+
+if __name__ == "__main__":
+    main()
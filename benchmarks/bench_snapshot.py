@@ -0,0 +1,63 @@
+"""
+Benchmark of cold-start time with and without log compaction.
+
+Builds a persistent address book, then measures how long reopening it takes when the
+whole history is in the write-ahead log and after it was compacted into a memory-mapped
+snapshot, and how long lookups into the mapped snapshot take.
+
+Usage:
+    $ python -m benchmarks.bench_snapshot [--contacts N]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from bot.models import Record
+from bot.storage import PersistentAddressBook
+
+def main() -> None:
+    """
+    Runs the benchmark and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--contacts", type=int, default=200_000)
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "book.wal")
+        book = PersistentAddressBook(path, fsync="never", compact_threshold=None)
+        for i in range(options.contacts):
+            record = Record(f"Contact{i}")
+            record.add_phone(f"{i:010d}")
+            record.add_phone(f"{i + 1:010d}")
+            book.add_record(record)
+        book.close()
+
+        started = time.perf_counter()
+        book = PersistentAddressBook(path, compact_threshold=None)
+        print(f"replay {os.path.getsize(path):>12,} byte log:      "
+              f"{(time.perf_counter() - started) * 1000:>9.1f} ms")
+
+        size, seconds = book.compact()
+        print(f"write  {size:>12,} byte snapshot: {seconds * 1000:>9.1f} ms")
+        book.close()
+
+        started = time.perf_counter()
+        book = PersistentAddressBook(path, compact_threshold=None)
+        print(f"map snapshot + replay tail:      "
+              f"{(time.perf_counter() - started) * 1000:>9.1f} ms "
+              f"(snapshot {book.load_seconds * 1000:.1f} ms)")
+
+        names = [f"Contact{random.randrange(options.contacts)}" for _ in range(10_000)]
+        started = time.perf_counter()
+        for name in names:
+            book.find(name)
+        print(f"find in mapped snapshot:         "
+              f"{(time.perf_counter() - started) / len(names) * 1e6:>9.1f} us")
+        book.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark of the SQLite-backed address book against the in-memory one.
+
+For every book size it measures the insert throughput, the latency of name and phone
+lookups, and the throughput of a full iteration. The in-memory book is only run up to
+--memory-max contacts, since larger books may not fit in RAM; that is the case the
+SQLite book is for.
+
+Usage:
+    $ python -m benchmarks.bench_sqlite [--sizes 10000,1000000,10000000] [--memory-max N]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import Dict
+
+from bot.models import AddressBook, Record
+from bot.storage import SQLiteAddressBook
+
+LOOKUPS = 10_000
+
+def bench_book(book: AddressBook, size: int) -> Dict[str, float]:
+    """
+    Measures an address book of a given size.
+
+    Args:
+        book (AddressBook): An empty address book.
+        size (int): The number of contacts to add.
+
+    Returns:
+        dict[str, float]: The measured rates and latencies.
+    """
+    results = {}
+    started = time.perf_counter()
+    for i in range(size):
+        record = Record(f"Contact{i}")
+        record.add_phone(f"{i:010d}")
+        book.add_record(record)
+    if isinstance(book, SQLiteAddressBook):
+        book.commit()
+    results["insert/s"] = size / (time.perf_counter() - started)
+
+    picks = [random.randrange(size) for _ in range(LOOKUPS)]
+    started = time.perf_counter()
+    for i in picks:
+        book.find(f"Contact{i}")
+    results["find us"] = (time.perf_counter() - started) / LOOKUPS * 1e6
+
+    started = time.perf_counter()
+    for i in picks:
+        book.find_by_phone(f"{i:010d}")
+    results["by phone us"] = (time.perf_counter() - started) / LOOKUPS * 1e6
+
+    started = time.perf_counter()
+    count = sum(1 for _ in book.values())
+    results["iterate/s"] = count / (time.perf_counter() - started)
+    return results
+
+def main() -> None:
+    """
+    Runs the benchmark for every book size and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="10000,1000000,10000000",
+                        help="comma-separated book sizes (default: 10000,1000000,10000000)")
+    parser.add_argument("--memory-max", type=int, default=2_000_000,
+                        help="the largest size run with the in-memory book "
+                             "(default: 2000000)")
+    options = parser.parse_args()
+
+    print(f"{'book':>8} {'size':>11} {'insert/s':>10} {'find us':>9} "
+          f"{'by phone us':>12} {'iterate/s':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in (int(size) for size in options.sizes.split(",")):
+            path = os.path.join(directory, f"{size}.db")
+            books = [("sqlite", SQLiteAddressBook(path))]
+            if size <= options.memory_max:
+                books.insert(0, ("memory", AddressBook()))
+            else:
+                print(f"{'memory':>8} {size:>11,} {'skipped, over --memory-max':>44}")
+            while books:
+                label, book = books.pop(0)
+                results = bench_book(book, size)
+                book.close()
+                print(f"{label:>8} {size:>11,} {results['insert/s']:>10,.0f} "
+                      f"{results['find us']:>9.1f} {results['by phone us']:>12.1f} "
+                      f"{results['iterate/s']:>10,.0f}")
+                del book
+
+if __name__ == "__main__":
+    main()
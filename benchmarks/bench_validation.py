@@ -0,0 +1,125 @@
+"""
+Benchmark of phone number validation for bulk imports.
+
+Compares constructing Phone and catching ValueError for every row with the
+non-raising Phone.try_parse and validate_phones APIs and with the column-wise
+validate_phone_column, on a column where a tenth of the numbers are invalid. The
+column-wise check is vectorized only when NumPy is installed.
+
+Usage:
+    $ python -m benchmarks.bench_validation [--rows N]
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, List
+
+from bot.models import Phone, validate_phones, validate_phone_column
+from bot.models import phone_column
+
+def make_column(rows: int) -> List[str]:
+    """
+    Generates a column of phone numbers with about 10% invalid values.
+
+    Args:
+        rows (int): The number of phone numbers.
+
+    Returns:
+        list[str]: The phone numbers.
+    """
+    column = []
+    for _ in range(rows):
+        number = f"{random.randrange(10 ** 10):010d}"
+        if random.random() < 0.1:
+            number = random.choice((number[:9], number + "1", number[:5] + "-" + number[6:]))
+        column.append(number)
+    return column
+
+def with_exceptions(column: List[str]) -> int:
+    """
+    Validates a column by constructing Phone and catching ValueError.
+
+    Args:
+        column (list[str]): The phone numbers.
+
+    Returns:
+        int: The number of valid phone numbers.
+    """
+    valid = 0
+    for value in column:
+        try:
+            Phone(value)
+            valid += 1
+        except ValueError:
+            pass
+    return valid
+
+def with_try_parse(column: List[str]) -> int:
+    """
+    Validates a column with Phone.try_parse.
+
+    Args:
+        column (list[str]): The phone numbers.
+
+    Returns:
+        int: The number of valid phone numbers.
+    """
+    return sum(1 for value in column if Phone.try_parse(value) is not None)
+
+def with_mask(column: List[str]) -> int:
+    """
+    Validates a column with validate_phones.
+
+    Args:
+        column (list[str]): The phone numbers.
+
+    Returns:
+        int: The number of valid phone numbers.
+    """
+    return sum(validate_phones(column))
+
+def with_column(column: List[str]) -> int:
+    """
+    Validates a column with validate_phone_column.
+
+    Args:
+        column (list[str]): The phone numbers.
+
+    Returns:
+        int: The number of valid phone numbers.
+    """
+    numbers, _ = validate_phone_column(column)
+    return len(numbers)
+
+def run(label: str, validate: Callable[[List[str]], int], column: List[str]) -> None:
+    """
+    Times one validation strategy and prints its throughput.
+
+    Args:
+        label (str): The name of the strategy.
+        validate (Callable[[list[str]], int]): The strategy.
+        column (list[str]): The phone numbers.
+    """
+    started = time.perf_counter()
+    valid = validate(column)
+    seconds = time.perf_counter() - started
+    print(f"{label:>22}: {len(column) / seconds:>12,.0f} rows/s ({valid:,} valid)")
+
+def main() -> None:
+    """
+    Runs the benchmark and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    options = parser.parse_args()
+
+    column = make_column(options.rows)
+    run("Phone() + except", with_exceptions, column)
+    run("Phone.try_parse", with_try_parse, column)
+    run("validate_phones", with_mask, column)
+    engine = "numpy" if phone_column.np is not None else "pure Python"
+    run(f"phone column ({engine})", with_column, column)
+
+if __name__ == "__main__":
+    main()
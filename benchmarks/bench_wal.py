@@ -0,0 +1,58 @@
+"""
+Benchmark of the write-ahead log throughput under the different fsync policies.
+
+Every mutation adds a contact with one phone number through the AddressBook API,
+which produces two log entries (the record and its phone).
+
+Usage:
+    $ python -m benchmarks.bench_wal [--mutations N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from bot.models import Record
+from bot.storage import PersistentAddressBook, FSYNC_POLICIES
+
+def bench_policy(fsync: str, mutations: int, directory: str) -> float:
+    """
+    Measures the mutation throughput of a persistent address book.
+
+    Args:
+        fsync (str): The fsync policy of the write-ahead log.
+        mutations (int): The number of contacts to add.
+        directory (str): The directory for the log file.
+
+    Returns:
+        float: The number of mutations per second, including the final sync.
+    """
+    path = os.path.join(directory, f"{fsync}.wal")
+    book = PersistentAddressBook(path, fsync=fsync)
+    started = time.perf_counter()
+    for i in range(mutations):
+        record = Record(f"Contact{i}")
+        record.add_phone(f"{i:010d}")
+        book.add_record(record)
+    book.close()
+    return mutations / (time.perf_counter() - started)
+
+def main() -> None:
+    """
+    Runs the benchmark for every fsync policy and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mutations", type=int, default=100_000)
+    parser.add_argument("--always-mutations", type=int, default=2_000,
+                        help="mutations for the 'always' policy, which fsyncs each one")
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for fsync in FSYNC_POLICIES:
+            mutations = options.always_mutations if fsync == "always" else options.mutations
+            rate = bench_policy(fsync, mutations, directory)
+            print(f"{fsync:>6}: {mutations:>9,} mutations, {rate:>12,.0f} mutations/s")
+
+if __name__ == "__main__":
+    main()
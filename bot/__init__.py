@@ -4,10 +4,22 @@ This module provides the main function to run an assistant bot for managing cont
 The assistant bot supports the following commands:
 - 'close' or 'exit': Exit the program.
 - 'hello': Greet the user.
+- 'help': Display the commands, or how to use one of them.
 - 'add': Add a new contact.
 - 'change': Update an existing contact.
+- 'delete': Delete a contact.
 - 'phone': Display a contact's phone number.
-- 'all': Display all contacts.
+- 'all': Display all contacts in alphabetical order, optionally one page at a time.
+- 'range': Display the contacts whose names lie between two names.
+- 'search': Display the first contacts whose names start with a prefix.
+- 'fuzzy': Display the contacts whose names are spelled similarly to a given name.
+- 'sounds': Display the contacts whose names sound like a given name, in any script.
+- 'who': Display the contacts owning a phone number.
+- 'prefix': Display the phone numbers starting with some digits, or in a range.
+- 'compact': Snapshot the persistent address book and truncate its log.
+- 'import': Import contacts from a CSV file.
+- 'export': Export all contacts to a JSON Lines file.
+- 'import-jsonl': Import contacts from a JSON Lines file.
 
 Imports:
 - `handlers` from `.cli`: Contains functions to handle various contact management commands.
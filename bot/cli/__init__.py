@@ -2,18 +2,42 @@
 This module provides various command handlers and utility functions for the assistant bot.
 
 The module includes the following imports:
-- `add_contact`, `change_contact`, `show_phone`, `show_all`
-from `.handlers`: Functions for managing contact records.
+- `add_contact`, `change_contact`, `delete_contact`, `show_phone`, `show_all`,
+`show_range`, `search_contacts`, `show_similar`, `show_sounding`, `show_phone_prefix`,
+`show_owner`, `compact_book`, `import_contacts`, `import_jsonl_contacts`,
+`export_contacts` from `.handlers`: Functions for managing contact records.
 - `input_error` from `.input_error`: A custom exception class for handling input-related errors.
 - `parse_input` from `.parse_input`: A function for parsing user input into commands and arguments.
+- `install_completion` from `.completion`: A function enabling tab-completion of commands
+and contact names.
+- `Command`, `CommandRegistry`, `REGISTRY`, `SERVER_REGISTRY` from `.commands`: The command
+registries mapping command names to their handlers, for local and network front ends.
 
 Functions:
 - `add_contact`: Adds a new contact to the address book.
 - `change_contact`: Updates an existing contact in the address book.
+- `delete_contact`: Deletes a contact from the address book.
 - `show_phone`: Displays the phone number of a specified contact.
-- `show_all`: Displays all contacts in the address book.
+- `show_all`: Streams all contacts in the address book in alphabetical order, optionally
+one page at a time.
+- `show_range`: Streams the contacts whose names lie between two names.
+- `search_contacts`: Displays the first contacts whose names start with a prefix.
+- `show_similar`: Displays the contacts whose names are spelled similarly to a given name.
+- `show_sounding`: Displays the contacts whose names sound like a given name, in any script.
+- `show_phone_prefix`: Streams the phone numbers starting with some digits and their owners.
+- `show_owner`: Displays the contacts owning a specified phone number.
+- `compact_book`: Snapshots a persistent address book and truncates its log.
+- `import_contacts`: Imports contacts from a CSV file into the address book.
+- `import_jsonl_contacts`: Imports contacts from a JSON Lines file into the address book.
+- `export_contacts`: Exports all contacts to a JSON Lines file.
 - `input_error`: Handles input-related errors by raising a custom exception.
 - `parse_input`: Parses the user's input into a command and a list of arguments.
+- `install_completion`: Enables tab-completion in the interactive prompt when readline
+is available.
+
+Classes:
+- `Command`: A command name with its handler, number of arguments and description.
+- `CommandRegistry`: Dispatches a command and its arguments to the handler with one lookup.
 
 Example:
     Using the functions from this module to manage contacts:
@@ -24,6 +48,12 @@ Example:
 Usage:
     Import the necessary functions into your script to handle user commands for managing contacts.
 """
-from .handlers import add_contact, change_contact, show_phone, show_all
+from .handlers import (
+    add_contact, change_contact, delete_contact, show_phone, show_all, show_range, search_contacts,
+    show_similar, show_sounding, show_phone_prefix, show_owner, compact_book, import_contacts,
+    import_jsonl_contacts, export_contacts,
+)
 from .input_error import input_error
 from .parse_input import parse_input
+from .completion import install_completion
+from .commands import Command, CommandRegistry, REGISTRY, SERVER_REGISTRY
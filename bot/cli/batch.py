@@ -0,0 +1,92 @@
+"""
+Module running the assistant bot non-interactively on a script of commands.
+
+Functions:
+- run_batch(lines: Iterable[str], address_book: AddressBook, output: TextIO, ...) -> int:
+  Runs every command of a script and writes the results to one output stream.
+- open_script(path: str) -> TextIO: Opens a script file, or standard input for "-".
+- open_output() -> TextIO: Opens standard output with a large write buffer.
+
+Usage:
+- A script holds one command per line, in the grammar of the interactive prompt; blank
+lines and lines starting with "#" are skipped, and 'close' or 'exit' ends the script.
+- The results are written through one buffered writer instead of a `print` per result
+with a prompt before it, so a script of a million commands spends its time in the
+handlers rather than in writing to the terminal or pipe.
+
+Example:
+    with open_script("provision.txt") as script:
+        run_batch(script, address_book, open_output())
+"""
+
+import sys
+from typing import Iterable, TextIO
+
+from bot.models import AddressBook
+from bot.cli.commands import REGISTRY, CommandRegistry
+from bot.cli.parse_input import parse_input
+
+OUTPUT_BUFFER = 1 << 20
+
+def run_batch(lines: Iterable[str], address_book: AddressBook, output: TextIO,
+              registry: CommandRegistry = REGISTRY) -> int:
+    """
+    Runs every command of a script and writes the results, one per line.
+
+    Args:
+        lines (Iterable[str]): The lines of the script.
+        address_book (AddressBook): The address book the commands operate on.
+        output (TextIO): Receives the results; flushed once the script ends.
+        registry (CommandRegistry): The commands, REGISTRY by default.
+
+    Returns:
+        int: The number of commands run.
+    """
+    write = output.write
+
+    def progress(message: str) -> None:
+        write(message + "\n")
+
+    commands = 0
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        command, *args = parse_input(line)
+        commands += 1
+        for chunk in registry.dispatch(command, args, address_book, progress):
+            write(chunk + "\n")
+        found = registry.get(command)
+        if found is not None and found.exits:
+            break
+    output.flush()
+    return commands
+
+def open_script(path: str) -> TextIO:
+    """
+    Opens a script of commands.
+
+    Args:
+        path (str): The path of the script, or "-" for standard input.
+
+    Returns:
+        TextIO: The script, read line by line.
+
+    Raises:
+        OSError: If the file cannot be opened.
+    """
+    if path == "-":
+        return open(sys.stdin.fileno(), encoding="utf-8", closefd=False)
+    return open(path, encoding="utf-8")
+
+def open_output() -> TextIO:
+    """
+    Opens standard output with a large write buffer, after flushing what `print` has
+    already written to it.
+
+    Returns:
+        TextIO: The buffered standard output; closing it leaves standard output open.
+    """
+    sys.stdout.flush()
+    return open(sys.stdout.fileno(), "w", encoding="utf-8", buffering=OUTPUT_BUFFER,
+                closefd=False)
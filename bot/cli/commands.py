@@ -0,0 +1,311 @@
+"""
+Module providing the command registry of the assistant bot.
+
+Classes:
+- Command: A command name with its handler, the number of arguments it takes and its
+description.
+- CommandRegistry: Maps command names to commands and dispatches parsed input to them.
+
+Functions:
+- build_registry(files: bool = True) -> CommandRegistry: Creates a registry of the
+built-in commands, optionally without the commands reading or writing files.
+
+Attributes:
+- REGISTRY: The registry of the built-in commands shared by the local front ends.
+- SERVER_REGISTRY: The built-in commands without those reading or writing files, for
+front ends open to network clients.
+
+Usage:
+- Every front end (the interactive prompt, batch mode, servers) parses a line with
+`parse_input` and passes the command and its arguments to `CommandRegistry.dispatch`,
+which finds the command with one dictionary lookup, checks the number of arguments and
+returns the output of the handler as chunks of text. Every command is kept as a plain
+(handler, min_args, max_args, progress) tuple for dispatch, and routing takes the same
+time whatever the number of commands, unlike an if/elif chain that compares the
+command with every name before it.
+- Extra commands are registered without editing main.py, with `register` or the
+`command` decorator; a handler takes the arguments and the address book and returns a
+string or an iterator of strings.
+
+Example:
+    from bot.cli.commands import REGISTRY
+
+    @REGISTRY.command("count", usage="count", description="Display the number of contacts.")
+    def count(args, address_book):
+        return f"{len(address_book)} contacts."
+
+    for chunk in REGISTRY.dispatch("count", [], address_book):
+        print(chunk)
+"""
+
+from typing import (
+    Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union,
+)
+
+from bot.models import AddressBook
+from bot.cli import handlers
+
+Handler = Callable[..., Union[str, Iterable[str]]]
+
+class Command(NamedTuple):
+    """
+    A command of the assistant bot.
+
+    Attributes:
+        name (str): The name typed to run the command.
+        handler (Handler): Called with the arguments and the address book (and the
+        `progress` callback if `progress` is set); returns a string or an iterator of
+        strings.
+        min_args (int): The smallest number of arguments.
+        max_args (int | None): The largest number of arguments, or None for no limit.
+        usage (str): How the command is typed, e.g. `add <name> <phone>`.
+        description (str): What the command does.
+        exits (bool): Whether the front end stops after running the command.
+        progress (bool): Whether the handler reports progress through a callback.
+        blocking (bool): Whether the command may run long enough to block an event
+        loop, so that asynchronous front ends run it in a worker thread.
+    """
+
+    name: str
+    handler: Handler
+    min_args: int = 0
+    max_args: Optional[int] = None
+    usage: str = ""
+    description: str = ""
+    exits: bool = False
+    progress: bool = False
+    blocking: bool = False
+
+class CommandRegistry:
+    """
+    A table of commands by name, dispatching parsed input to their handlers.
+
+    Methods:
+        register(command: Command) -> Command:
+            Adds a command, replacing any command with the same name.
+
+        command(name: str, ...) -> Callable[[Handler], Handler]:
+            A decorator registering a function as the handler of a command.
+
+        get(name: str) -> Command | None:
+            Returns the command with a name.
+
+        dispatch(name: str, args: list[str], address_book: AddressBook, progress=None)
+                -> Iterable[str]:
+            Runs a command and returns its output.
+
+        help(name: str | None = None) -> str:
+            Describes one command or lists all of them.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty registry.
+        """
+        self._commands: Dict[str, Command] = {}
+        self._routes: Dict[str, Tuple[Handler, int, float, bool]] = {}
+
+    def register(self, command: Command) -> Command:
+        """
+        Adds a command, replacing any command with the same name.
+
+        Args:
+            command (Command): The command to add.
+
+        Returns:
+            Command: The added command.
+        """
+        self._commands[command.name] = command
+        max_args = float("inf") if command.max_args is None else command.max_args
+        self._routes[command.name] = (command.handler, command.min_args, max_args,
+                                      command.progress)
+        return command
+
+    def command(self, name: str, min_args: int = 0, max_args: Optional[int] = None,
+                usage: str = "", description: str = "", exits: bool = False,
+                progress: bool = False,
+                blocking: bool = False) -> Callable[[Handler], Handler]:
+        """
+        Returns a decorator registering a function as the handler of a command.
+
+        Args:
+            name (str): The name of the command.
+            min_args (int): The smallest number of arguments.
+            max_args (int | None): The largest number of arguments, or None for no limit.
+            usage (str): How the command is typed; defaults to its name.
+            description (str): What the command does.
+            exits (bool): Whether the front end stops after running the command.
+            progress (bool): Whether the handler takes a `progress` callback.
+            blocking (bool): Whether the command may block an event loop for long.
+
+        Returns:
+            Callable[[Handler], Handler]: The decorator, which returns the function unchanged.
+        """
+        def decorator(handler: Handler) -> Handler:
+            self.register(Command(name, handler, min_args, max_args, usage or name,
+                                  description, exits, progress, blocking))
+            return handler
+        return decorator
+
+    def get(self, name: str) -> Optional[Command]:
+        """
+        Returns the command with a name.
+
+        Args:
+            name (str): The name of the command.
+
+        Returns:
+            Command | None: The command, or None if there is no command with this name.
+        """
+        return self._commands.get(name)
+
+    def dispatch(self, name: str, args: List[str], address_book: AddressBook,
+                 progress: Optional[Callable[[str], None]] = None) -> Iterable[str]:
+        """
+        Runs a command against an address book and returns its output.
+
+        Args:
+            name (str): The name of the command.
+            args (list[str]): The arguments of the command.
+            address_book (AddressBook): The address book the command operates on.
+            progress (Callable[[str], None] | None): Receives the progress messages of
+            long-running commands.
+
+        Returns:
+            Iterable[str]: The chunks of output, produced lazily by streaming commands,
+            or a single message if the command is unknown or has the wrong number of
+            arguments.
+        """
+        route = self._routes.get(name)
+        if route is None:
+            return ("Invalid command.",)
+        handler, min_args, max_args, reports_progress = route
+        if not min_args <= len(args) <= max_args:
+            return (f"Invalid number of arguments. Usage: {self._commands[name].usage}",)
+        if reports_progress:
+            result = handler(args, address_book, progress=progress)
+        else:
+            result = handler(args, address_book)
+        return (result,) if result.__class__ is str else result
+
+    def help(self, name: Optional[str] = None) -> str:
+        """
+        Describes one command or lists all of them.
+
+        Args:
+            name (str | None): The name of the command, or None to list every command.
+
+        Returns:
+            str: The usage and help of the command or of every command.
+        """
+        if name is not None:
+            command = self._commands.get(name)
+            if command is None:
+                return f"No command {name}."
+            return f"{command.usage}\n  {command.description}"
+        width = max(len(command.usage) for command in self._commands.values())
+        return "\n".join(f"{command.usage:<{width}}  {command.description}"
+                         for command in self._commands.values())
+
+    def __contains__(self, name: object) -> bool:
+        """
+        Checks whether a command is registered.
+
+        Args:
+            name (object): The name of the command.
+
+        Returns:
+            bool: True if the command is registered, otherwise False.
+        """
+        return name in self._commands
+
+    def __iter__(self) -> Iterator[str]:
+        """
+        Iterates over the command names in the order they were registered.
+
+        Returns:
+            Iterator[str]: The command names.
+        """
+        return iter(self._commands)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of registered commands.
+
+        Returns:
+            int: The number of commands.
+        """
+        return len(self._commands)
+
+def build_registry(files: bool = True) -> CommandRegistry:
+    """
+    Creates a registry of the built-in commands.
+
+    Args:
+        files (bool): Whether to include `import`, `export` and `import-jsonl`, which
+        read or write any file the user names. Front ends open to network clients leave
+        them out, since the paths are resolved on the server.
+
+    Returns:
+        CommandRegistry: The registry.
+    """
+    registry = CommandRegistry()
+
+    def goodbye(args: List[str], address_book: AddressBook) -> str:
+        return "Good bye!"
+
+    def hello(args: List[str], address_book: AddressBook) -> str:
+        return "How can I help you?"
+
+    def show_help(args: List[str], address_book: AddressBook) -> str:
+        return registry.help(args[0] if args else None)
+
+    def compact(args: List[str], address_book: AddressBook) -> str:
+        return handlers.compact_book(address_book)
+
+    commands = [
+        Command("close", goodbye, usage="close", description="Exit the program.", exits=True),
+        Command("exit", goodbye, usage="exit", description="Exit the program.", exits=True),
+        Command("hello", hello, usage="hello", description="Greet the user."),
+        Command("help", show_help, 0, 1, "help [<command>]",
+                "Display the commands, or how to use one of them."),
+        Command("add", handlers.add_contact, 2, 2, "add <name> <phone>",
+                "Add a new contact, or a phone number to an existing one."),
+        Command("change", handlers.change_contact, 3, 3,
+                "change <name> <old_phone> <new_phone>", "Update a contact's phone number."),
+        Command("delete", handlers.delete_contact, 1, 1, "delete <name>",
+                "Delete a contact and its phone numbers."),
+        Command("phone", handlers.show_phone, 1, 1, "phone <name>",
+                "Display a contact's phone numbers."),
+        Command("all", handlers.show_all, 0, 4, "all [--limit N] [--after <name>]",
+                "Display all contacts in alphabetical order, optionally one page at a time."),
+        Command("range", handlers.show_range, 2, 2, "range <first> <last>",
+                "Display the contacts whose names lie between two names."),
+        Command("search", handlers.search_contacts, 1, 2, "search <prefix> [<limit>]",
+                "Display the first contacts whose names start with a prefix."),
+        Command("fuzzy", handlers.show_similar, 1, 2, "fuzzy <name> [<edits>]",
+                "Display the contacts whose names are spelled similarly to a given name."),
+        Command("sounds", handlers.show_sounding, 1, 1, "sounds <name>",
+                "Display the contacts whose names sound like a given name, in any script."),
+        Command("who", handlers.show_owner, 1, 1, "who <phone>",
+                "Display the contacts owning a phone number."),
+        Command("prefix", handlers.show_phone_prefix, 1, 2, "prefix <digits> [<last>]",
+                "Display the phone numbers starting with some digits, or in a range."),
+        Command("compact", compact, 0, 0, "compact",
+                "Snapshot the persistent address book and truncate its log.", blocking=True),
+    ]
+    file_commands = [
+        Command("import", handlers.import_contacts, 1, 1, "import <file.csv>",
+                "Import contacts from a CSV file.", progress=True, blocking=True),
+        Command("export", handlers.export_contacts, 1, 1, "export <file.jsonl>",
+                "Export all contacts to a JSON Lines file.", blocking=True),
+        Command("import-jsonl", handlers.import_jsonl_contacts, 1, 1,
+                "import-jsonl <file.jsonl>", "Import contacts from a JSON Lines file.",
+                progress=True, blocking=True),
+    ]
+    for command in commands + file_commands if files else commands:
+        registry.register(command)
+    return registry
+
+REGISTRY = build_registry()
+SERVER_REGISTRY = build_registry(files=False)
@@ -0,0 +1,74 @@
+"""
+Module providing tab-completion of commands and contact names for the assistant bot.
+
+Functions:
+- make_completer(address_book: AddressBook, commands: Sequence[str]) -> Callable:
+  Creates a readline completer for commands and contact names.
+- install_completion(address_book: AddressBook, commands: Sequence[str]) -> bool:
+  Enables tab-completion in the interactive prompt, if readline is available.
+
+Usage:
+- The first word of the input completes to a command, the following words complete to
+contact names through `AddressBook.names_with_prefix`, which seeks into the sorted name
+index, so completing stays fast however large the address book is.
+- readline is not available on every platform; without it the prompt simply works
+without completion.
+"""
+
+from itertools import islice
+from typing import Callable, List, Optional, Sequence
+
+from bot.models import AddressBook
+
+try:
+    import readline
+except ImportError:
+    readline = None
+
+COMPLETION_LIMIT = 50
+
+def make_completer(address_book: AddressBook,
+                   commands: Sequence[str]) -> Callable[[str, int], Optional[str]]:
+    """
+    Creates a readline completer for commands and contact names.
+
+    Args:
+        address_book (AddressBook): The address book whose names are completed.
+        commands (Sequence[str]): The command names.
+
+    Returns:
+        Callable[[str, int], str | None]: A function returning the completion number
+        `state` of `text`, or None when there are no more completions.
+    """
+    matches: List[str] = []
+
+    def complete(text: str, state: int) -> Optional[str]:
+        if state == 0:
+            before = ""
+            if readline is not None:
+                before = readline.get_line_buffer()[:readline.get_begidx()]
+            if not before.strip():
+                matches[:] = [command for command in commands if command.startswith(text)]
+            else:
+                matches[:] = islice(address_book.names_with_prefix(text), COMPLETION_LIMIT)
+        return matches[state] if state < len(matches) else None
+
+    return complete
+
+def install_completion(address_book: AddressBook, commands: Sequence[str]) -> bool:
+    """
+    Enables tab-completion of commands and contact names in the interactive prompt.
+
+    Args:
+        address_book (AddressBook): The address book whose names are completed.
+        commands (Sequence[str]): The command names.
+
+    Returns:
+        bool: True if completion was enabled, False if readline is not available.
+    """
+    if readline is None:
+        return False
+    readline.set_completer(make_completer(address_book, commands))
+    readline.set_completer_delims(" \t")
+    readline.parse_and_bind("tab: complete")
+    return True
@@ -9,11 +9,46 @@ Functions:
 - change_contact(args: list[str], address_book: AddressBook) -> str:
   Updates the phone number of an existing contact in the address book.
 
+- delete_contact(args: list[str], address_book: AddressBook) -> str:
+  Deletes a contact from the address book.
+
 - show_phone(args: list[str], address_book: AddressBook) -> str:
   Retrieves the phone number of a contact from the address book.
 
-- show_all(address_book: AddressBook) -> str:
-  Retrieves all contacts stored in the address book.
+- show_all(args: list[str], address_book: AddressBook) -> Iterator[str]:
+  Streams the contacts stored in the address book in alphabetical order, optionally
+  one page at a time.
+
+- show_range(args: list[str], address_book: AddressBook) -> Iterator[str]:
+  Streams the contacts whose names lie between two names.
+
+- search_contacts(args: list[str], address_book: AddressBook) -> str:
+  Retrieves the first contacts whose names start with a prefix.
+
+- show_similar(args: list[str], address_book: AddressBook) -> str:
+  Retrieves the contacts whose names are spelled similarly to a given name.
+
+- show_sounding(args: list[str], address_book: AddressBook) -> str:
+  Retrieves the contacts whose names sound like a given name, in any script.
+
+- show_phone_prefix(args: list[str], address_book: AddressBook) -> Iterator[str]:
+  Streams the phone numbers starting with some digits, or lying in a range, and their
+  owners.
+
+- show_owner(args: list[str], address_book: AddressBook) -> str:
+  Retrieves the contacts owning a phone number.
+
+- compact_book(address_book: AddressBook) -> str:
+  Snapshots a persistent address book and truncates its write-ahead log.
+
+- import_contacts(args: list[str], address_book: AddressBook, progress=None) -> str:
+  Imports contacts from a CSV file into the address book.
+
+- import_jsonl_contacts(args: list[str], address_book: AddressBook, progress=None) -> str:
+  Imports contacts from a JSON Lines file into the address book.
+
+- export_contacts(args: list[str], address_book: AddressBook) -> str:
+  Exports all contacts to a JSON Lines file.
 
 Usage:
 This module can be imported and used in other Python scripts to manage a collection
@@ -21,11 +56,44 @@ of contacts. Each function handles specific operations related to adding, updati
 and retrieving contact information.
 """
 
-from typing import List
+import csv
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
 
 from bot.models import AddressBook, Record
+from bot.storage import (
+    PersistentAddressBook, ImportStats, import_csv, import_jsonl, export_jsonl,
+)
 from bot.cli.input_error import input_error
 
+FUZZY_DISTANCE = 2
+SUGGESTION_DISTANCE = 1
+SUGGESTION_LIMIT = 3
+SUGGESTION_CANDIDATES = 10_000
+
+def _not_found(name: str, address_book: AddressBook) -> str:
+    """
+    Build the message for a missing contact, suggesting similarly spelled names.
+    The suggestions must stay cheap, since every miss asks for them: they come only
+    from a trigram index that already exists (e.g. built by the fuzzy command), within
+    SUGGESTION_DISTANCE edits, and are skipped when more than SUGGESTION_CANDIDATES
+    names would have to be checked.
+
+    Parameters:
+    name (str): The name that was not found.
+    address_book (AddressBook): The address book that was searched.
+
+    Returns:
+    str: The not-found message with up to SUGGESTION_LIMIT suggestions.
+    """
+    similar = address_book.find_similar(name, SUGGESTION_DISTANCE, SUGGESTION_LIMIT,
+                                        max_candidates=SUGGESTION_CANDIDATES, build=False)
+    message = f"No contact found with name {name}."
+    if similar:
+        names = ", ".join(record.name.value for _, record in similar)
+        message += f" Did you mean: {names}?"
+    return message
+
 @input_error
 def add_contact(args: List[str], address_book: AddressBook) -> str:
     """
@@ -77,7 +145,7 @@ def change_contact(args: List[str], address_book: AddressBook) -> str:
     record = address_book.find(name_str)
 
     if not record:
-        return f"No contact found with name {name_str}."
+        return _not_found(name_str, address_book)
 
     if not record.find_phone(old_phone_str):
         return f"No phone number {old_phone_str} found for contact {name_str}."
@@ -85,6 +153,29 @@ def change_contact(args: List[str], address_book: AddressBook) -> str:
     record.edit_phone(old_phone_str, new_phone_str)
     return "Contact updated."
 
+@input_error
+def delete_contact(args: List[str], address_book: AddressBook) -> str:
+    """
+    Delete a contact and all of its phone numbers from the address book.
+
+    Parameters:
+    args (list[str]): List of arguments containing the name of the contact.
+    address_book (AddressBook): The address book where the contact exists.
+
+    Returns:
+    str: Success message, or a message indicating that the contact was not found.
+    """
+    if len(args) != 1:
+        return "Give me only name."
+
+    name_str = args[0]
+    record = address_book.find(name_str)
+    if record is None:
+        return _not_found(name_str, address_book)
+
+    address_book.delete(record.name.value)
+    return "Contact deleted."
+
 @input_error
 def show_phone(args: List[str], address_book: AddressBook) -> str:
     """
@@ -105,27 +196,414 @@ def show_phone(args: List[str], address_book: AddressBook) -> str:
     record = address_book.find(name_str)
 
     if not record:
-        return f"No contact found with name {name_str}."
+        return _not_found(name_str, address_book)
 
     return str(record)
 
 
+PAGE_CHUNK = 1000
+
+def _parse_page_args(args: List[str]) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Parse the `--limit N` and `--after <name>` paging options.
+
+    Parameters:
+    args (list[str]): The arguments of the command.
+
+    Returns:
+    tuple[int | None, str | None]: The page size and the name to start after.
+
+    Raises:
+    ValueError: If an option is unknown, lacks its value, or the limit is not positive.
+    """
+    limit, after = None, None
+    options = iter(args)
+    for option in options:
+        value = next(options, None)
+        if value is None:
+            raise ValueError(f"Option {option} needs a value.")
+        if option == "--limit":
+            if not value.isdigit() or int(value) < 1:
+                raise ValueError("The limit must be a positive number.")
+            limit = int(value)
+        elif option == "--after":
+            after = value
+        else:
+            raise ValueError(f"Unknown option {option}.")
+    return limit, after
+
+def _stream_lines(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Join lines for printing in chunks of up to PAGE_CHUNK lines.
+
+    Parameters:
+    lines (Iterable[str]): The lines to join.
+
+    Returns:
+    Iterator[str]: The joined chunks.
+    """
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) == PAGE_CHUNK:
+            yield "\n".join(chunk)
+            chunk = []
+    if chunk:
+        yield "\n".join(chunk)
+
+def _stream_records(records: Iterable[Record]) -> Iterator[str]:
+    """
+    Format records for printing in chunks of up to PAGE_CHUNK records.
+
+    Parameters:
+    records (Iterable[Record]): The records to format.
+
+    Returns:
+    Iterator[str]: The formatted chunks.
+    """
+    return _stream_lines(str(record) for record in records)
+
+@input_error
+def show_all(args: List[str], address_book: AddressBook) -> Iterator[str]:
+    """
+    Stream the contacts stored in the address book in alphabetical order, in chunks,
+    optionally one page at a time: `all --limit N --after <name>` lists up to N
+    contacts whose names sort after <name>. The first chunk is produced without
+    reading the rest of the address book.
+
+    Parameters:
+    args (list[str]): The paging options.
+    address_book (AddressBook): The address book containing contacts.
+
+    Returns:
+    Iterator[str]: Chunks of up to PAGE_CHUNK contacts, followed by the command for
+    the next page if the listing was cut by the limit, or a single message indicating
+    that there are no contacts to list or the options are invalid.
+    """
+    try:
+        limit, after = _parse_page_args(args)
+    except ValueError as error:
+        yield f"{error} Usage: all [--limit N] [--after <name>]"
+        return
+
+    records = address_book.records_after(after)
+    page = records if limit is None else islice(records, limit)
+    last = None
+
+    def track(listed: Iterable[Record]) -> Iterator[Record]:
+        nonlocal last
+        for record in listed:
+            last = record.name.value
+            yield record
+
+    yield from _stream_records(track(page))
+
+    if last is None:
+        yield "No contacts." if after is None else f"No contacts after {after}."
+    elif limit is not None and next(records, None) is not None:
+        yield f"More contacts: all --limit {limit} --after {last}"
+
 @input_error
-def show_all(address_book: AddressBook) -> str:
+def show_range(args: List[str], address_book: AddressBook) -> Iterator[str]:
     """
-    Retrieve all contacts stored in the address book.
+    Stream, in alphabetical order, the contacts whose names lie between two names,
+    both included.
 
     Parameters:
+    args (list[str]): List of arguments containing the first and the last name.
     address_book (AddressBook): The address book containing contacts.
 
     Returns:
-    str: All contacts in the address book or a message indicating it's empty.
+    Iterator[str]: Chunks of up to PAGE_CHUNK contacts, or a single message indicating
+    that the range is empty or the arguments are invalid.
+    """
+    if len(args) != 2:
+        yield "Give me the first and the last name of the range."
+        return
+
+    start, end = args
+    found = False
+    for chunk in _stream_records(address_book.range(start, end)):
+        found = True
+        yield chunk
+
+    if not found:
+        yield f"No contacts from {start} to {end}."
+
+SEARCH_LIMIT = 10
+
+@input_error
+def search_contacts(args: List[str], address_book: AddressBook) -> str:
+    """
+    Retrieve the first contacts, in alphabetical order, whose names start with a prefix.
+
+    Parameters:
+    args (list[str]): List of arguments containing the prefix and optionally the
+    maximum number of contacts to show (SEARCH_LIMIT by default).
+    address_book (AddressBook): The address book to search.
+
+    Returns:
+    str: The matching contacts, with a note if there are more of them, or a message
+    indicating that nothing matches or the arguments are invalid.
     """
-    if not address_book.data:
-        return "No contacts."
+    if len(args) not in (1, 2):
+        return "Give me a name prefix and optionally the number of results."
+
+    prefix = args[0]
+    if len(args) == 2 and (not args[1].isdigit() or int(args[1]) < 1):
+        return "The number of results must be a positive number."
+    limit = int(args[1]) if len(args) == 2 else SEARCH_LIMIT
+
+    records = address_book.search(prefix, limit + 1)
+    if not records:
+        return f"No contacts starting with {prefix}."
+
+    lines = [str(record) for record in records[:limit]]
+    if len(records) > limit:
+        lines.append(f"More contacts start with {prefix}: give a longer prefix "
+                     f"or a larger number of results.")
+    return "\n".join(lines)
+
+@input_error
+def show_similar(args: List[str], address_book: AddressBook) -> str:
+    """
+    Retrieve the contacts whose names are spelled similarly to a given name.
+
+    Parameters:
+    args (list[str]): List of arguments containing the name and optionally the largest
+    number of edits (FUZZY_DISTANCE by default).
+    address_book (AddressBook): The address book to search.
+
+    Returns:
+    str: The similar contacts, nearest first, or a message indicating that nothing
+    is similar or the arguments are invalid.
+    """
+    if len(args) not in (1, 2):
+        return "Give me a name and optionally the largest number of edits."
+
+    name_str = args[0]
+    if len(args) == 2 and not args[1].isdigit():
+        return "The number of edits must be a number."
+    max_distance = int(args[1]) if len(args) == 2 else FUZZY_DISTANCE
+
+    similar = address_book.find_similar(name_str, max_distance, SEARCH_LIMIT)
+    if not similar:
+        return f"No contacts similar to {name_str}."
+
+    return "\n".join(f"{record} (edits: {distance})" for distance, record in similar)
+
+@input_error
+def show_sounding(args: List[str], address_book: AddressBook) -> str:
+    """
+    Retrieve the contacts whose names sound like a given name, whatever its spelling
+    or script.
+
+    Parameters:
+    args (list[str]): List of arguments containing the name.
+    address_book (AddressBook): The address book to search.
+
+    Returns:
+    str: The matching contacts in alphabetical order, or a message indicating that
+    nothing sounds alike or the arguments are invalid.
+    """
+    if len(args) != 1:
+        return "Give me a name."
+
+    name_str = args[0]
+    records = address_book.find_sounding(name_str, SEARCH_LIMIT)
+    if not records:
+        return f"No contacts sounding like {name_str}."
+
+    return "\n".join(str(record) for record in records)
+
+@input_error
+def show_phone_prefix(args: List[str], address_book: AddressBook) -> Iterator[str]:
+    """
+    Stream, in numeric order, the phone numbers starting with some digits and their
+    owners: `prefix 050` lists the numbers starting with 050 and
+    `prefix 0440000000 0449999999` the numbers in a range.
+
+    Parameters:
+    args (list[str]): List of arguments containing the prefix, or the first and the
+    last number of the range.
+    address_book (AddressBook): The address book to search.
+
+    Returns:
+    Iterator[str]: Chunks of up to PAGE_CHUNK phone numbers with their contacts, or a
+    single message indicating that nothing matches or the arguments are invalid.
+    """
+    if len(args) not in (1, 2):
+        yield "Give me a phone prefix, or the first and the last number of a range."
+        return
+
+    first, last = args[0], args[-1]
+    try:
+        matches = address_book.find_by_phone_range(first, last)
+    except ValueError as error:
+        yield str(error)
+        return
+
+    found = False
+    for chunk in _stream_lines(f"{phone}: {record}" for phone, record in matches):
+        found = True
+        yield chunk
+
+    if not found:
+        yield (f"No phone numbers starting with {first}." if len(args) == 1
+               else f"No phone numbers from {first} to {last}.")
+
+@input_error
+def show_owner(args: List[str], address_book: AddressBook) -> str:
+    """
+    Retrieve the contacts owning a phone number from the address book.
+
+    Parameters:
+    args (list[str]): List of arguments containing the phone number.
+    address_book (AddressBook): The address book to search.
+
+    Returns:
+    str: The contacts owning the phone number if found, otherwise a message indicating
+    that nobody owns it.
+    """
+    if len(args) != 1:
+        return "Give me only phone."
+
+    phone_str = args[0]
+    records = address_book.find_by_phone(phone_str)
+
+    if not records:
+        return f"No contact found with phone {phone_str}."
+
+    return "\n".join(str(record) for record in records)
+
+@input_error
+def compact_book(address_book: AddressBook) -> str:
+    """
+    Snapshot a persistent address book and truncate its write-ahead log.
+
+    Parameters:
+    address_book (AddressBook): The address book to compact.
+
+    Returns:
+    str: The size of the snapshot and the time spent writing it, or a message
+    indicating that the address book is not persistent.
+    """
+    if not isinstance(address_book, PersistentAddressBook):
+        return "Nothing to compact: the address book is not persistent (use --wal)."
+
+    size, seconds = address_book.compact()
+    return (f"Snapshot of {len(address_book)} contacts ({size} bytes) "
+            f"written in {seconds * 1000:.1f} ms, log truncated.")
+
+PROGRESS_ROWS = 100_000
+
+def _progress_reporter(progress: Optional[Callable[[str], None]]) -> Callable[[ImportStats], None]:
+    """
+    Creates an import progress callback that reports every PROGRESS_ROWS rows.
+
+    Parameters:
+    progress (Callable[[str], None] | None): Receives the progress messages.
+
+    Returns:
+    Callable[[ImportStats], None]: The callback for the running import totals.
+    """
+    reported = 0
+
+    def report(stats: ImportStats) -> None:
+        nonlocal reported
+        if progress is not None and stats.rows // PROGRESS_ROWS > reported:
+            reported = stats.rows // PROGRESS_ROWS
+            progress(f"Imported {stats.rows:,} rows, {stats.rejected:,} rejected...")
+
+    return report
+
+@input_error
+def import_contacts(args: List[str], address_book: AddressBook,
+                    progress: Optional[Callable[[str], None]] = None) -> str:
+    """
+    Import contacts from a CSV file of names and phone numbers into the address book.
+    The file is streamed, and phone numbers of existing contacts are merged into their
+    records.
+
+    Parameters:
+    args (list[str]): List of arguments containing the path of the CSV file.
+    address_book (AddressBook): The address book to import into.
+    progress (Callable[[str], None] | None): Receives a progress message every
+    PROGRESS_ROWS rows.
+
+    Returns:
+    str: The number of imported rows and rejected values, or a message indicating
+    that the file could not be read.
+    """
+    if len(args) != 1:
+        return "Give me only the path of a CSV file."
+
+    path = args[0]
+    try:
+        stats = import_csv(address_book, path, progress=_progress_reporter(progress))
+    except OSError as error:
+        return f"Cannot read {path}: {error.strerror}."
+    except UnicodeDecodeError:
+        return f"Cannot parse {path}: it is not a UTF-8 text file."
+    except csv.Error as error:
+        return f"Cannot parse {path}: {error}."
+
+    return f"Imported {stats.rows:,} rows from {path}, {stats.rejected:,} rejected."
+
+@input_error
+def import_jsonl_contacts(args: List[str], address_book: AddressBook,
+                          progress: Optional[Callable[[str], None]] = None) -> str:
+    """
+    Import contacts from a JSON Lines file written by the export command into the
+    address book. The file is streamed, and phone numbers of existing contacts are
+    merged into their records.
+
+    Parameters:
+    args (list[str]): List of arguments containing the path of the JSON Lines file.
+    address_book (AddressBook): The address book to import into.
+    progress (Callable[[str], None] | None): Receives a progress message every
+    PROGRESS_ROWS records.
+
+    Returns:
+    str: The number of imported records and rejected values, or a message indicating
+    that the file could not be read.
+    """
+    if len(args) != 1:
+        return "Give me only the path of a JSON Lines file."
+
+    path = args[0]
+    try:
+        stats = import_jsonl(address_book, path, progress=_progress_reporter(progress))
+    except OSError as error:
+        return f"Cannot read {path}: {error.strerror}."
+    except UnicodeDecodeError:
+        return f"Cannot parse {path}: it is not a UTF-8 text file."
+
+    return f"Imported {stats.rows:,} records from {path}, {stats.rejected:,} rejected."
+
+@input_error
+def export_contacts(args: List[str], address_book: AddressBook) -> str:
+    """
+    Export all contacts to a JSON Lines file, one record per line.
+
+    Parameters:
+    args (list[str]): List of arguments containing the path of the JSON Lines file.
+    address_book (AddressBook): The address book to export.
+
+    Returns:
+    str: The number of exported records, or a message indicating that the file could
+    not be written.
+    """
+    if len(args) != 1:
+        return "Give me only the path of the export file."
 
-    return str(address_book)
+    path = args[0]
+    try:
+        count = export_jsonl(address_book, path)
+    except OSError as error:
+        return f"Cannot write {path}: {error.strerror}."
 
+    return f"Exported {count:,} contacts to {path}."
 
 if __name__ == "__main__":
     print()
@@ -134,7 +612,7 @@ if __name__ == "__main__":
 
     # Test show_all
     # Should show all contacts
-    print(show_all(contacts_list))
+    print("\n".join(show_all([], contacts_list)))
     print()
 
     # Test add_contact
@@ -177,5 +655,5 @@ if __name__ == "__main__":
 
     # Test show_all
     # Should show all contacts
-    print(show_all(contacts_list))
+    print("\n".join(show_all([], contacts_list)))
     print()
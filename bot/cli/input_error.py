@@ -5,11 +5,14 @@ The `input_error` decorator manages errors such as missing arguments,
 invalid values, and missing keys.
 """
 
-from typing import Callable, Any
+from inspect import isgeneratorfunction
+from typing import Callable, Any, Iterator
 
 def input_error(func: Callable[..., str]) -> Callable[..., str]:
     """
     Decorator to handle input errors in functions that process user input.
+    Handlers that stream their output as a generator are wrapped by a generator, which
+    ends the output with the error message if one of the errors is raised mid-stream.
 
     Args:
         func (Callable[..., str]): The function to decorate.
@@ -17,6 +20,19 @@ def input_error(func: Callable[..., str]) -> Callable[..., str]:
     Returns:
         Callable[..., str]: A decorated function that handles input errors.
     """
+    if isgeneratorfunction(func):
+        def stream(*args: Any, **kwargs: Any) -> Iterator[str]:
+            try:
+                yield from func(*args, **kwargs)
+            except ValueError:
+                yield "Give me name and phone, please."
+            except KeyError:
+                yield "Contact not found."
+            except IndexError:
+                yield "Give me name, please."
+
+        return stream
+
     def wrapper(*args: Any, **kwargs: Any) -> str:
         try:
             return func(*args, **kwargs)
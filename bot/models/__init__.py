@@ -5,16 +5,41 @@ The module includes the following imports:
 - `Field` from `.field`: Represents a generic field in a contact record.
 - `Name` from `.name`: Represents the name field in a contact record.
 - `Phone` from `.phone`: Represents the phone field in a contact record.
+- `validate_phones` from `.phone`: Checks many phone numbers without raising exceptions.
+- `validate_phone_column` from `.phone_column`: Validates a whole column of phone numbers,
+using NumPy when it is installed.
+- `PhoneList` from `.phone_list`: An insertion-ordered collection of phone numbers.
 - `Record` from `.record`: Represents a contact record containing multiple fields.
 - `AddressBook` from `.address_book`: Represents a collection of contact records.
+- `PhoneIndex` from `.phone_index`: A reverse index from phone numbers to contact names.
+- `SortedKeys` from `.sorted_keys`: A sorted set of keys with range queries.
+- `TrigramIndex` from `.fuzzy_index`: An approximate-match index over contact names.
+- `normalize_name` from `.name`: Returns the case- and Unicode-insensitive key of a name.
+- `NameKeys` from `.name_keys`: An index from normalized name keys to contact names.
+- `PhoneticIndex`, `sound_code` and `transliterate` from `.phonetic_index`: An index of
+contact names by how they sound, and the transliteration and phonetic code behind it.
 
 Classes:
 - `Field`: A base class for various types of fields in a contact record.
 - `Name`: A class representing a contact's name.
 - `Phone`: A class representing a contact's phone number.
+- `PhoneList`: A list-like container of a record's unique phone numbers.
 - `Record`: A class representing a contact record, which can contain
 multiple fields such as name and phone.
 - `AddressBook`: A class representing an address book, which contains multiple contact records.
+- `PhoneIndex`: A class mapping phone numbers to the names of the records that own them.
+- `SortedKeys`: A class keeping unique keys in sorted order for ordered iteration and
+range queries.
+- `TrigramIndex`: A class finding the names within a small edit distance of a query.
+- `NameKeys`: A class mapping normalized name keys to the names stored under them.
+- `PhoneticIndex`: A class finding the names that sound like a query in any script.
+
+Functions:
+- `validate_phones`: Returns a validity mask for a batch of phone numbers.
+- `validate_phone_column`: Returns the accepted numbers and the rejected rows of a column.
+- `normalize_name`: Returns the NFC-normalized, case-folded lookup key of a name.
+- `transliterate`: Spells a Cyrillic or accented name in upper-case Latin letters.
+- `sound_code`: Returns the Soundex-style phonetic code of a name.
 
 Usage:
 - Import the necessary classes into your script to create and manage contact records.
@@ -33,7 +58,14 @@ The above example demonstrates creating an address book, adding
 a contact record, and printing the address book.
 """
 from .field import Field
-from .name import Name
-from .phone import Phone
+from .name import Name, normalize_name
+from .phone import Phone, validate_phones
+from .phone_column import validate_phone_column
+from .phone_list import PhoneList
 from .record import Record
 from .address_book import AddressBook
+from .phone_index import PhoneIndex
+from .sorted_keys import SortedKeys
+from .fuzzy_index import TrigramIndex
+from .name_keys import NameKeys
+from .phonetic_index import PhoneticIndex, sound_code, transliterate
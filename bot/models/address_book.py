@@ -3,30 +3,86 @@ This module provides the AddressBook class, which is used to manage a collection
 
 Classes:
 - AddressBook: A class that extends UserDict to manage a collection of contact records.
-It supports adding, finding, and deleting contacts.
+It supports adding, finding, and deleting contacts, and finding contacts by phone number.
 
 Imports:
 - UserDict from collections: A dictionary-like class that allows extension and customization.
 - Record from .record: A class representing a contact record, which includes contact name
 and phone numbers.
+- PhoneIndex from .phone_index: A reverse index from phone numbers to contact names.
+- SortedKeys from .sorted_keys: A sorted set of keys with range queries.
+- TrigramIndex from .fuzzy_index: An approximate-match index over contact names.
+- NameKeys from .name_keys: An index from normalized name keys to contact names.
+- PhoneticIndex from .phonetic_index: An index of contact names by how they sound.
+- validate_phone_column from .phone_column: Validates a whole column of phone numbers.
 
 Usage:
 - The AddressBook class provides methods to add new contact records, find existing records
 by name, and delete records by name.
 - Each record in the address book is identified by the contact's name, which is used as
 the key in the underlying dictionary.
+- Records added to the address book notify it about phone changes, which keeps the
+reverse phone index in sync without scanning the records.
+- Imports use `bulk_add` (or `add_phone_column` for a name and a phone column), which
+validates the rows without raising, merges rows with the same name and stores every
+new record once.
+- Listings (`records_after`, `range`) and prefix searches walk the contact names in
+alphabetical order through a sorted name index. The index is built on first use and
+then kept up to date by the same hooks as the phone index, so books that are never
+listed do not pay for it.
+The trigram index behind `find_similar` and the phonetic index behind `find_sounding`
+are built and maintained the same way.
+- Phone ranges and prefixes (`find_by_phone_range`, `find_by_phone_prefix`) seek into a
+sorted index of (number, name) pairs keyed by the integer form of the phone numbers,
+built on first use and kept up to date by the phone hooks.
+- An address book created with `normalize_names=True` treats names that differ only in
+letter case or Unicode normalization form ("olena", "Olena", a decomposed accent) as
+the same contact: lookups, additions and deletions go through an index of normalized
+keys, computed once per stored name, so a lookup normalizes only the name asked for.
+Books that keep their names on disk store the keys there too (see `_stored_name`).
 
 Example:
     address_book = AddressBook()
     record = Record("John Doe")
     address_book.add_record(record)
     found_record = address_book.find("John Doe")
+    owners = address_book.find_by_phone("0501234567")
     address_book.delete("John Doe")
 """
 
 from collections import UserDict
+from itertools import islice, takewhile
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
+from .phone import Phone
+from .name import normalize_name
 from .record import Record
+from .phone_index import PhoneIndex
+from .sorted_keys import SortedKeys
+from .fuzzy_index import TrigramIndex
+from .name_keys import NameKeys
+from .phonetic_index import PhoneticIndex
+from .phone_column import validate_phone_column
+
+def _phone_bounds(first: str, last: str) -> Tuple[int, int]:
+    """
+    Converts the bounds of a phone range to integers, padding a bound shorter than
+    10 digits so that it covers every number starting with it.
+
+    Args:
+        first (str): The lower bound, up to 10 digits.
+        last (str): The upper bound, up to 10 digits.
+
+    Returns:
+        tuple[int, int]: The smallest and the largest phone number of the range.
+
+    Raises:
+        ValueError: If a bound is not a string of up to 10 digits.
+    """
+    for bound in (first, last):
+        if len(bound) > 10 or (bound and not (bound.isascii() and bound.isdigit())):
+            raise ValueError("Phone prefix must be up to 10 digits")
+    return int(first.ljust(10, "0")), int(last.ljust(10, "9"))
 
 class AddressBook(UserDict):
     """
@@ -42,8 +98,118 @@ class AddressBook(UserDict):
 
         delete(name: str) -> None:
             Deletes a record from the address book by the contact's name.
+
+        find_by_phone(phone_number: str) -> list[Record]:
+            Finds and returns the records owning a phone number.
+
+        find_by_phone_range(first: str, last: str) -> Iterator[tuple[str, Record]]:
+            Iterates in numeric order over the phone numbers between two bounds.
+
+        find_by_phone_prefix(prefix: str) -> Iterator[tuple[str, Record]]:
+            Iterates in numeric order over the phone numbers starting with some digits.
+
+        records_after(name: str | None = None) -> Iterator[Record]:
+            Iterates over the records in alphabetical order, resuming after a given name.
+
+        range(start: str | None = None, end: str | None = None) -> Iterator[Record]:
+            Iterates in alphabetical order over the records with names between two bounds.
+
+        names_with_prefix(prefix: str) -> Iterator[str]:
+            Iterates in alphabetical order over the names starting with a prefix.
+
+        search(prefix: str, limit: int = 10) -> list[Record]:
+            Returns the first records, alphabetically, whose names start with a prefix.
+
+        find_similar(name: str, max_distance: int = 2, limit: int = 10, ...)
+                -> list[tuple[int, Record]]:
+            Finds the records whose names are close to a possibly misspelled name.
+
+        find_sounding(name: str, limit: int = 10) -> list[Record]:
+            Finds the records whose names sound like a name, in any script.
+
+        bulk_add(rows: Iterable[tuple[str, Iterable[str]]]) -> list[tuple[str, str]]:
+            Adds many contacts and phone numbers in a single pass.
+
+        add_phone_column(names: Sequence[str], phone_numbers: Sequence[str]) -> list[int]:
+            Loads a column of phone numbers into the records of the given names.
     """
 
+    def __init__(self, *args, normalize_names: bool = False, **kwargs) -> None:
+        """
+        Initializes the address book and its reverse phone index.
+
+        Args:
+            normalize_names (bool): Whether names are looked up ignoring letter case
+            and Unicode normalization form.
+        """
+        self.normalize_names = normalize_names
+        self._phone_index = PhoneIndex()
+        self._sorted_names: Optional[SortedKeys] = None
+        self._similar_names: Optional[TrigramIndex] = None
+        self._sounding_names: Optional[PhoneticIndex] = None
+        self._sorted_phones: Optional[SortedKeys] = None
+        self._name_keys: Optional[NameKeys] = None
+        self._name_indexes: List = []
+        super().__init__(*args, **kwargs)
+
+    def __getitem__(self, name: str) -> Record:
+        """
+        Returns the record stored under a name.
+
+        Args:
+            name (str): The name of the contact.
+
+        Returns:
+            Record: The record of the contact.
+
+        Raises:
+            KeyError: If there is no record with this name.
+        """
+        return self.data[self._resolve(name)]
+
+    def __contains__(self, name: object) -> bool:
+        """
+        Checks whether a contact is in the address book.
+
+        Args:
+            name (object): The name of the contact.
+
+        Returns:
+            bool: True if the contact is in the address book, otherwise False.
+        """
+        return isinstance(name, str) and self._resolve(name) in self.data
+
+    def __setitem__(self, name: str, record: Record) -> None:
+        """
+        Stores a record under a name, replacing and unindexing any previous record,
+        including one whose name differs only in its normalized form.
+
+        Args:
+            name (str): The name of the contact.
+            record (Record): The record to be stored.
+        """
+        existing = self._resolve(name)
+        if existing != name:
+            del self[existing]
+        previous = self.data.get(name)
+        if previous is not None:
+            self._on_record_removed(previous)
+        self.data[name] = record
+        self._on_record_added(record)
+
+    def __delitem__(self, name: str) -> None:
+        """
+        Removes the record stored under a name and unindexes it.
+
+        Args:
+            name (str): The name of the contact.
+
+        Raises:
+            KeyError: If there is no record with this name.
+        """
+        record = self.data.pop(self._resolve(name))
+        self._on_record_removed(record)
+
     def add_record(self, record: Record) -> None:
         """
         Adds a new record to the address book.
@@ -51,7 +217,7 @@ class AddressBook(UserDict):
         Args:
             record (Record): The record to be added.
         """
-        self.data[record.name.value] = record
+        self[record.name.value] = record
 
     def find(self, name: str) -> Record | None:
         """
@@ -63,7 +229,7 @@ class AddressBook(UserDict):
         Returns:
             Record | None: The found record or None if not found.
         """
-        return self.data.get(name, None)
+        return self.data.get(self._resolve(name), None)
 
     def delete(self, name: str) -> None:
         """
@@ -72,8 +238,479 @@ class AddressBook(UserDict):
         Args:
             name (str): The name of the contact to delete.
         """
-        if name in self.data:
-            del self.data[name]
+        if name in self:
+            del self[name]
+
+    def find_by_phone(self, phone_number: str) -> List[Record]:
+        """
+        Finds and returns the records owning a phone number.
+
+        Args:
+            phone_number (str): The phone number to look up.
+
+        Returns:
+            list[Record]: The records owning the phone number, empty if nobody owns it.
+        """
+        return [self.data[name] for name in self._phone_index.owners(phone_number)]
+
+    def find_by_phone_range(self, first: str, last: str) -> Iterator[Tuple[str, Record]]:
+        """
+        Iterates in numeric order over the phone numbers between two bounds, both
+        included, and the records owning them. A bound shorter than 10 digits stands for
+        all numbers starting with it, so `find_by_phone_range("044", "045")` runs from
+        0440000000 to 0459999999. The numbers are read lazily from the sorted phone index.
+
+        Args:
+            first (str): The lower bound, up to 10 digits.
+            last (str): The upper bound, up to 10 digits.
+
+        Returns:
+            Iterator[tuple[str, Record]]: The phone number and owner of every match; a
+            number owned by several contacts is returned once for each of them.
+
+        Raises:
+            ValueError: If a bound is not a string of up to 10 digits.
+        """
+        low, high = _phone_bounds(first, last)
+        return self._phones_between(low, high)
+
+    def find_by_phone_prefix(self, prefix: str) -> Iterator[Tuple[str, Record]]:
+        """
+        Iterates in numeric order over the phone numbers starting with some digits, such
+        as an operator code, and the records owning them.
+
+        Args:
+            prefix (str): The first digits of the phone numbers, up to 10 digits.
+
+        Returns:
+            Iterator[tuple[str, Record]]: The phone number and owner of every match.
+
+        Raises:
+            ValueError: If the prefix is not a string of up to 10 digits.
+        """
+        return self.find_by_phone_range(prefix, prefix)
+
+    def _phones_between(self, low: int, high: int) -> Iterator[Tuple[str, Record]]:
+        """
+        Iterates over the phone numbers between two integers and the records owning them.
+
+        Args:
+            low (int): The smallest phone number, as an integer.
+            high (int): The largest phone number, as an integer.
+
+        Returns:
+            Iterator[tuple[str, Record]]: The phone number and owner of every match.
+        """
+        for number, name in self._phone_range_index().irange((low,), (high + 1,),
+                                                             inclusive=(True, False)):
+            for record in self._records((name,)):
+                yield f"{number:010d}", record
+
+    def records_after(self, name: Optional[str] = None) -> Iterator[Record]:
+        """
+        Iterates over the records in alphabetical order of their names, starting right
+        after a name, so that a listing can be resumed page by page. The name does not
+        need to be in the address book.
+
+        Args:
+            name (str | None): The name of the last record already listed, or None to
+            start from the first record.
+
+        Returns:
+            Iterator[Record]: The records whose names sort after the name.
+        """
+        names = self._name_index().irange(name, None, inclusive=(False, True))
+        return self._records(names)
+
+    def range(self, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[Record]:
+        """
+        Iterates in alphabetical order over the records whose names lie between two
+        bounds, both included.
+
+        Args:
+            start (str | None): The first name of the range, or None for no lower bound.
+            end (str | None): The last name of the range, or None for no upper bound.
+
+        Returns:
+            Iterator[Record]: The records in the range.
+        """
+        return self._records(self._name_index().irange(start, end))
+
+    def names_with_prefix(self, prefix: str) -> Iterator[str]:
+        """
+        Iterates in alphabetical order over the contact names starting with a prefix.
+        The names sharing a prefix are adjacent in the sorted name index, so this
+        seeks to the first one and stops after the last one.
+
+        Args:
+            prefix (str): The beginning of the names.
+
+        Returns:
+            Iterator[str]: The matching names.
+        """
+        return takewhile(lambda name: name.startswith(prefix),
+                         self._name_index().irange(prefix))
+
+    def search(self, prefix: str, limit: int = 10) -> List[Record]:
+        """
+        Returns the first records, in alphabetical order, whose names start with a prefix.
+
+        Args:
+            prefix (str): The beginning of the names.
+            limit (int): The maximum number of records to return.
+
+        Returns:
+            list[Record]: Up to `limit` matching records.
+        """
+        return list(self._records(islice(self.names_with_prefix(prefix), limit)))
+
+    def find_similar(self, name: str, max_distance: int = 2, limit: int = 10,
+                     max_candidates: Optional[int] = None,
+                     build: bool = True) -> List[Tuple[int, Record]]:
+        """
+        Finds the records whose names are within a small edit distance of a possibly
+        misspelled name, ignoring case.
+
+        Args:
+            name (str): The name to look for.
+            max_distance (int): The largest number of edits; capped for short names.
+            limit (int): The maximum number of records to return.
+            max_candidates (int | None): The largest number of candidate names to check
+            (see TrigramIndex.search), or None for no limit.
+            build (bool): Whether to build the trigram index if it does not exist yet.
+            Without it nothing is found, so a caller that must stay cheap, such as a
+            did-you-mean hint, never pays for reading every name.
+
+        Returns:
+            list[tuple[int, Record]]: The edit distance and record of the closest
+            contacts, nearest first.
+        """
+        if not build and self._similar_names is None:
+            return []
+        matches = self._similar_index().search(name, max_distance, limit, max_candidates)
+        return [(distance, record) for distance, match in matches
+                for record in self._records((match,))]
+
+    def find_sounding(self, name: str, limit: int = 10) -> List[Record]:
+        """
+        Finds the records whose names sound like a name, whatever their spelling or
+        script, e.g. "Олександр" finds "Oleksandr" and "Alexander".
+
+        Args:
+            name (str): The name to look for.
+            limit (int): The maximum number of records to return.
+
+        Returns:
+            list[Record]: The records of the matching contacts, in alphabetical order.
+        """
+        return list(self._records(self._phonetic_index().search(name, limit)))
+
+    def _name_index(self) -> SortedKeys:
+        """
+        Returns the sorted index of the contact names, building it on first use.
+
+        Returns:
+            SortedKeys: The contact names in alphabetical order.
+        """
+        if self._sorted_names is None:
+            self._sorted_names = SortedKeys(iter(self))
+            self._name_indexes.append(self._sorted_names)
+        return self._sorted_names
+
+    def _similar_index(self) -> TrigramIndex:
+        """
+        Returns the trigram index of the contact names, building it on first use.
+
+        Returns:
+            TrigramIndex: The approximate-match index of the contact names.
+        """
+        if self._similar_names is None:
+            self._similar_names = TrigramIndex(iter(self))
+            self._name_indexes.append(self._similar_names)
+        return self._similar_names
+
+    def _phonetic_index(self) -> PhoneticIndex:
+        """
+        Returns the phonetic index of the contact names, building it on first use.
+
+        Returns:
+            PhoneticIndex: The contact names by their phonetic codes.
+        """
+        if self._sounding_names is None:
+            self._sounding_names = PhoneticIndex(iter(self))
+            self._name_indexes.append(self._sounding_names)
+        return self._sounding_names
+
+    def _phone_range_index(self) -> SortedKeys:
+        """
+        Returns the sorted index of the phone numbers, building it on first use.
+
+        Returns:
+            SortedKeys: The (number, name) pair of every phone number and its owner.
+        """
+        if self._sorted_phones is None:
+            self._sorted_phones = SortedKeys(
+                (number, record.name.value)
+                for record in self.values() for number in record.phones.numbers()
+            )
+        return self._sorted_phones
+
+    def _key_index(self) -> NameKeys:
+        """
+        Returns the index of the normalized name keys, building it on first use.
+
+        Returns:
+            NameKeys: The contact names by their normalized keys.
+        """
+        if self._name_keys is None:
+            self._name_keys = NameKeys(iter(self))
+            self._name_indexes.append(self._name_keys)
+        return self._name_keys
+
+    def _resolve(self, name: str) -> str:
+        """
+        Returns the name under which a contact is stored. With `normalize_names`, this
+        is the stored name with the same normalized key, if there is one.
+
+        Args:
+            name (str): The name as given.
+
+        Returns:
+            str: The stored name, or the given name if no stored name matches it.
+        """
+        if not self.normalize_names:
+            return name
+        stored = self._stored_name(name)
+        return stored if stored is not None else name
+
+    def _stored_name(self, name: str) -> Optional[str]:
+        """
+        Returns the stored name with the same normalized key as a name. Books that keep
+        their names outside memory override this to look the key up where they store it.
+
+        Args:
+            name (str): The name as given.
+
+        Returns:
+            str | None: The stored name, or None if no stored name has the same key.
+        """
+        return self._key_index().get(name)
+
+    def _index_name(self, name: str) -> None:
+        """
+        Adds a contact name to the name indexes built so far.
+
+        Args:
+            name (str): The name of the contact.
+        """
+        for index in self._name_indexes:
+            index.add(name)
+
+    def _unindex_name(self, name: str) -> None:
+        """
+        Removes a contact name from the name indexes built so far.
+
+        Args:
+            name (str): The name of the contact.
+        """
+        for index in self._name_indexes:
+            index.discard(name)
+
+    def _records(self, names: Iterable[str]) -> Iterator[Record]:
+        """
+        Looks up the records of a stream of names for a listing.
+
+        Args:
+            names (Iterable[str]): The names of the contacts.
+
+        Returns:
+            Iterator[Record]: The records of the names that are stored.
+        """
+        for name in names:
+            record = self.data.get(name)
+            if record is not None:
+                yield record
+
+    def add_phone_column(self, names: Sequence[str],
+                         phone_numbers: Sequence[str]) -> List[int]:
+        """
+        Loads a column of phone numbers, such as one read from a CSV export, adding
+        each valid number to the record of the name in the same row. Records are
+        created for names that are not in the address book yet.
+
+        Args:
+            names (Sequence[str]): The contact name of every row.
+            phone_numbers (Sequence[str]): The phone number of every row.
+
+        Returns:
+            list[int]: The indices of the rows that were rejected because the name is
+            empty or the phone number is invalid.
+
+        Raises:
+            ValueError: If the two columns have different lengths.
+        """
+        if len(names) != len(phone_numbers):
+            raise ValueError("The name and phone columns must have the same length")
+        numbers, invalid = validate_phone_column(phone_numbers)
+        skipped = set(invalid)
+        accepted = iter(numbers)
+        rejected = []
+
+        def entries():
+            for row, name in enumerate(names):
+                if row in skipped:
+                    rejected.append(row)
+                    continue
+                number = next(accepted)
+                if not name:
+                    rejected.append(row)
+                    continue
+                yield name, (number,)
+
+        self._merge(entries())
+        return rejected
+
+    def bulk_add(self, rows: Iterable[Tuple[str, Iterable[str]]]) -> List[Tuple[str, str]]:
+        """
+        Adds many contacts at once, such as the rows of an import file. Rows with the
+        same name are merged into one record, and the phone numbers of names that are
+        already in the address book are added to their records, like the add command
+        does. Invalid values are skipped instead of raising, and a new name without
+        a valid phone number is not added.
+
+        Args:
+            rows (Iterable[tuple[str, Iterable[str]]]): The name and phone numbers of
+            every row.
+
+        Returns:
+            list[tuple[str, str]]: The (name, phone number) pairs that were rejected
+            because the name is empty or the phone number is invalid.
+        """
+        rejected = []
+
+        def entries():
+            for name, phone_numbers in rows:
+                if not name:
+                    rejected.extend((name, phone_number) for phone_number in phone_numbers)
+                    continue
+                numbers = []
+                for phone_number in phone_numbers:
+                    number = Phone.to_number(phone_number)
+                    if number is None:
+                        rejected.append((name, phone_number))
+                    else:
+                        numbers.append(number)
+                yield name, numbers
+
+        self._merge(entries())
+        return rejected
+
+    def _merge(self, entries: Iterable[Tuple[str, Iterable[int]]]) -> None:
+        """
+        Merges validated phone numbers into the records of their names.
+
+        New records are filled while they are still detached and stored once at the
+        end, so each of them is indexed (and, in persistent books, logged) in one go
+        instead of once per phone number.
+
+        Args:
+            entries (Iterable[tuple[str, Iterable[int]]]): The name and phone numbers,
+            in their integer form, of every row.
+        """
+        created: Dict[str, Record] = {}
+        for name, numbers in entries:
+            key = normalize_name(name) if self.normalize_names else name
+            record = created.get(key)
+            if record is None:
+                record = self.find(name)
+                if record is None:
+                    if not numbers:
+                        continue
+                    record = created[key] = Record(name)
+            if record.book is None:
+                for number in numbers:
+                    record.phones.add_number(number)
+            else:
+                for number in numbers:
+                    record._add(Phone.from_number(number))
+        for record in created.values():
+            self.add_record(record)
+
+    def _on_record_added(self, record: Record) -> None:
+        """
+        Attaches a newly stored record to the address book and indexes its name and
+        phones.
+
+        Args:
+            record (Record): The record that was added.
+        """
+        record.book = self
+        for number in record.phones.numbers():
+            self._phone_index.add_number(number, record.name.value)
+            if self._sorted_phones is not None:
+                self._sorted_phones.add((number, record.name.value))
+        self._index_name(record.name.value)
+
+    def _on_record_removed(self, record: Record) -> None:
+        """
+        Detaches a removed record from the address book and unindexes its name and
+        phones.
+
+        Args:
+            record (Record): The record that was removed.
+        """
+        record.book = None
+        for number in record.phones.numbers():
+            self._phone_index.discard_number(number, record.name.value)
+            if self._sorted_phones is not None:
+                self._sorted_phones.discard((number, record.name.value))
+        self._unindex_name(record.name.value)
+
+    def _on_phone_added(self, record: Record, phone_number: str) -> None:
+        """
+        Indexes a phone number added to one of the records.
+
+        Args:
+            record (Record): The record the phone number was added to.
+            phone_number (str): The added phone number.
+        """
+        self._phone_index.add(phone_number, record.name.value)
+        if self._sorted_phones is not None:
+            self._sorted_phones.add((int(phone_number), record.name.value))
+
+    def _on_phone_removed(self, record: Record, phone_number: str) -> None:
+        """
+        Unindexes a phone number removed from one of the records.
+
+        Args:
+            record (Record): The record the phone number was removed from.
+            phone_number (str): The removed phone number.
+        """
+        self._phone_index.discard(phone_number, record.name.value)
+        if self._sorted_phones is not None:
+            self._sorted_phones.discard((int(phone_number), record.name.value))
+
+    def _on_phone_replaced(self, record: Record, old_phone_number: str,
+                           new_phone_number: str) -> None:
+        """
+        Reindexes a phone number edited in place in one of the records.
+
+        Args:
+            record (Record): The record whose phone number was edited.
+            old_phone_number (str): The replaced phone number.
+            new_phone_number (str): The new phone number.
+        """
+        self._phone_index.discard(old_phone_number, record.name.value)
+        self._phone_index.add(new_phone_number, record.name.value)
+        if self._sorted_phones is not None:
+            self._sorted_phones.discard((int(old_phone_number), record.name.value))
+            self._sorted_phones.add((int(new_phone_number), record.name.value))
+
+    def close(self) -> None:
+        """
+        Releases the resources held by the address book. An in-memory address book
+        holds none, but persistent subclasses flush their storage here.
+        """
 
     def __str__(self) -> str:
         """
@@ -82,4 +719,4 @@ class AddressBook(UserDict):
         Returns:
             str: A string representing all records in the address book.
         """
-        return "\n".join(str(record) for record in self.data.values())
+        return "\n".join(str(record) for record in self.values())
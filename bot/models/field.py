@@ -7,6 +7,10 @@ Classes:
 Usage:
 - The Field class can be used to encapsulate a single value and provide
 a string representation of it.
+- Fields declare `__slots__` instead of carrying a per-instance `__dict__`, which keeps
+large address books compact. Field itself declares no slots, so every subclass declares
+just the slots it stores its value in (Name a `value`, Phone an integer `number`) and
+no instance carries an unused one.
 """
 from typing import Any
 class Field:
@@ -21,6 +25,8 @@ class Field:
             Returns a string representation of the field's value.
     """
 
+    __slots__ = ()
+
     def __init__(self, value: Any) -> None:
         """
         Initializes a new Field instance with a given value.
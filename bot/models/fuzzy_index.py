@@ -0,0 +1,165 @@
+"""
+This module defines the TrigramIndex class, an approximate-match index over contact names.
+
+Classes:
+- TrigramIndex: An inverted index from the trigrams (three-letter substrings) of names
+to the names containing them, used to find names within a small edit distance of a
+misspelled query.
+
+Functions:
+- edit_distance(first: str, second: str, limit: int) -> int: The Levenshtein distance
+between two strings, computed only up to a limit.
+
+Usage:
+- A name is split into the trigrams of its case-folded form padded with spaces, so
+"Olena" gives "  o", " ol", "ole", "len", "ena" and "na ".
+- One edit changes at most three trigrams, so a name within `d` edits of the query
+shares at least `len(trigrams) - 3 * d` of its trigrams. By the pigeonhole principle
+such a name then appears in at least one of the `3 * d + 1` smallest posting sets of
+the query's trigrams, so only those sets are read and the large sets of common
+trigrams are skipped. Candidates of the wrong length or sharing too few trigrams are
+dropped, and the rest are checked with a bounded edit distance.
+- Short queries cannot be pruned that way, so the distance is capped at what their
+trigrams can support (one edit for names of up to five letters).
+- `max_candidates` bounds the cost of a search: a query whose smallest posting sets
+together hold more names gives up and finds nothing.
+
+Example:
+    index = TrigramIndex(["Oleksandr", "Olena", "Ivan"])
+    index.search("Olexandr")  # [(2, 'Oleksandr')]
+"""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+def edit_distance(first: str, second: str, limit: int) -> int:
+    """
+    Computes the Levenshtein distance between two strings, giving up as soon as it is
+    certain to exceed a limit.
+
+    Args:
+        first (str): The first string.
+        second (str): The second string.
+        limit (int): The largest distance of interest.
+
+    Returns:
+        int: The distance, or `limit + 1` if it is larger than the limit.
+    """
+    if abs(len(first) - len(second)) > limit:
+        return limit + 1
+    previous = list(range(len(second) + 1))
+    for i, first_char in enumerate(first, 1):
+        current = [i]
+        for j, second_char in enumerate(second, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (first_char != second_char)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return min(previous[-1], limit + 1)
+
+class TrigramIndex:
+    """
+    An inverted index from name trigrams to names, for approximate name matching.
+
+    Methods:
+        add(name: str) -> None:
+            Indexes a name.
+
+        discard(name: str) -> None:
+            Removes a name from the index.
+
+        search(query: str, max_distance: int = 2, limit: int = 10) -> list[tuple[int, str]]:
+            Finds the names closest to a query.
+    """
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        """
+        Initializes the index with some names.
+
+        Args:
+            names (Iterable[str]): The names to index.
+        """
+        self._postings: Dict[str, Set[str]] = {}
+        for name in names:
+            self.add(name)
+
+    @staticmethod
+    def _trigrams(name: str) -> Set[str]:
+        """
+        Returns the distinct trigrams of the padded, case-folded form of a name.
+
+        Args:
+            name (str): The name.
+
+        Returns:
+            set[str]: The trigrams.
+        """
+        padded = f"  {name.casefold()} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def add(self, name: str) -> None:
+        """
+        Indexes a name.
+
+        Args:
+            name (str): The name to index.
+        """
+        for trigram in self._trigrams(name):
+            names = self._postings.get(trigram)
+            if names is None:
+                self._postings[trigram] = {name}
+            else:
+                names.add(name)
+
+    def discard(self, name: str) -> None:
+        """
+        Removes a name from the index, if present.
+
+        Args:
+            name (str): The name to remove.
+        """
+        for trigram in self._trigrams(name):
+            names = self._postings.get(trigram)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self._postings[trigram]
+
+    def search(self, query: str, max_distance: int = 2, limit: int = 10,
+               max_candidates: Optional[int] = None) -> List[Tuple[int, str]]:
+        """
+        Finds the indexed names closest to a query, ignoring case.
+
+        Args:
+            query (str): The possibly misspelled name.
+            max_distance (int): The largest edit distance of interest; capped for
+            short queries.
+            limit (int): The maximum number of names to return.
+            max_candidates (int | None): The largest number of candidate names to check,
+            or None for no limit; a search with more candidates finds nothing.
+
+        Returns:
+            list[tuple[int, str]]: The edit distance and name of the closest names,
+            nearest first and alphabetically among equals.
+        """
+        trigrams = self._trigrams(query)
+        max_distance = max(0, min(max_distance, (len(trigrams) - 1) // 3))
+        postings = sorted((self._postings.get(trigram, set()) for trigram in trigrams), key=len)
+        smallest = postings[:3 * max_distance + 1]
+        if max_candidates is not None and sum(map(len, smallest)) > max_candidates:
+            return []
+        candidates = set().union(*smallest)
+        required = len(trigrams) - 3 * max_distance
+
+        key = query.casefold()
+        matches = []
+        for name in candidates:
+            if abs(len(name) - len(key)) > max_distance:
+                continue
+            if sum(name in names for names in postings) < required:
+                continue
+            distance = edit_distance(key, name.casefold(), max_distance)
+            if distance <= max_distance:
+                matches.append((distance, name))
+        matches.sort()
+        return matches[:limit]
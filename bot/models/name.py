@@ -8,6 +8,10 @@ Classes:
 - `Name`: A subclass of `Field` that represents a contact's name. It ensures that the
 name is not empty.
 
+Functions:
+- `normalize_name`: Returns the lookup key of a name, equal for names that differ only
+in letter case or in how their accented letters are encoded.
+
 Usage:
 - Import the `Name` class to create and manage the name field in a contact record.
 
@@ -19,8 +23,24 @@ Example:
         print(name.value)
 """
 
+import unicodedata
+
 from .field import Field
 
+def normalize_name(value: str) -> str:
+    """
+    Returns the lookup key of a name: its NFC-normalized, case-folded form, so that
+    "olena", "Olena" and "OLENA", or a precomposed and a decomposed "é", give the
+    same key.
+
+    Args:
+        value (str): The name.
+
+    Returns:
+        str: The lookup key of the name.
+    """
+    return unicodedata.normalize("NFC", unicodedata.normalize("NFC", value).casefold())
+
 class Name(Field):
     """
     Represents the name field in a contact record.
@@ -32,6 +52,8 @@ class Name(Field):
     - __init__: Initializes the Name instance and ensures the name is not empty.
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, value: str) -> None:
         """
         Initializes the Name instance with a value.
@@ -0,0 +1,76 @@
+"""
+This module defines the NameKeys class, an index from normalized name keys to contact names.
+
+Classes:
+- NameKeys: Maps the lookup key of every contact name (see `normalize_name`) to the
+name as it is stored.
+
+Usage:
+- An AddressBook opened with `normalize_names=True` keeps a NameKeys index, so a lookup
+normalizes only the name being looked up and then costs one dictionary access; the key
+of every stored name is computed once, when its record is added.
+
+Example:
+    keys = NameKeys(["Olena"])
+    keys.get("OLENA")  # 'Olena'
+"""
+
+from typing import Dict, Iterable, Optional
+
+from .name import normalize_name
+
+class NameKeys:
+    """
+    An index from normalized name keys to the contact names stored under them.
+
+    Methods:
+        add(name: str) -> None:
+            Indexes a name under its key.
+
+        discard(name: str) -> None:
+            Removes a name from the index.
+
+        get(name: str) -> str | None:
+            Returns the stored name with the same key as a name.
+    """
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        """
+        Initializes the index with some names.
+
+        Args:
+            names (Iterable[str]): The names to index.
+        """
+        self._names: Dict[str, str] = {normalize_name(name): name for name in names}
+
+    def add(self, name: str) -> None:
+        """
+        Indexes a name under its key.
+
+        Args:
+            name (str): The name to index.
+        """
+        self._names[normalize_name(name)] = name
+
+    def discard(self, name: str) -> None:
+        """
+        Removes a name from the index, if it is the name stored under its key.
+
+        Args:
+            name (str): The name to remove.
+        """
+        key = normalize_name(name)
+        if self._names.get(key) == name:
+            del self._names[key]
+
+    def get(self, name: str) -> Optional[str]:
+        """
+        Returns the stored name with the same key as a name.
+
+        Args:
+            name (str): The name to look up, in any letter case or Unicode form.
+
+        Returns:
+            str | None: The stored name, or None if no name has the same key.
+        """
+        return self._names.get(normalize_name(name))
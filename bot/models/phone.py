@@ -4,12 +4,51 @@ This module defines the Phone class, which represents a phone number.
 Classes:
 - Phone: A class that represents a phone number with validation.
 
+Functions:
+- validate_phones(values: Iterable[str]) -> list[bool]: Checks many phone numbers at
+once without raising exceptions.
+
 Usage:
 - The Phone class inherits from Field and validates that the phone number is exactly 10 digits long.
+- Since every valid number is 10 digits, a Phone keeps it as an integer (`number`) and
+formats the 10-digit string only when `value` is read. Containers such as PhoneList and
+PhoneIndex store just these integers, which are smaller and cheaper to hash and compare
+than strings.
+- Interactive commands construct Phone and get a ValueError for a bad number. Bulk
+imports use `Phone.try_parse` or `validate_phones` instead, which report invalid
+numbers without the cost of raising and catching an exception per row.
+- A number is valid when it is a string of exactly 10 decimal digits. The check is a
+length test plus `str.isdecimal`, the same rule as the regular expression `\\d{10}`
+without the regex engine.
 """
-import re
+from typing import Iterable, List, Optional
+
 from .field import Field
 
+def _is_valid(value: object) -> bool:
+    """
+    Checks whether a value is a phone number of exactly 10 digits.
+
+    Args:
+        value (object): The value to check.
+
+    Returns:
+        bool: True if the value is a valid phone number, otherwise False.
+    """
+    return isinstance(value, str) and len(value) == 10 and value.isdecimal()
+
+def validate_phones(values: Iterable[str]) -> List[bool]:
+    """
+    Checks many phone numbers at once without raising exceptions.
+
+    Args:
+        values (Iterable[str]): The phone numbers to check.
+
+    Returns:
+        list[bool]: A validity mask with one entry per phone number.
+    """
+    return [_is_valid(value) for value in values]
+
 class Phone(Field):
     """
     A class representing a phone number with validation.
@@ -18,13 +57,25 @@ class Phone(Field):
         Field: The base class representing a simple data field.
 
     Attributes:
-        value (str): The phone number stored in the field.
+        value (str): The phone number stored in the field, as 10 digits.
+        number (int): The phone number as an integer.
 
     Methods:
         __init__(value: str) -> None:
             Initializes a new Phone instance with validation.
+
+        from_number(number: int) -> Phone:
+            Creates a Phone from an already validated integer.
+
+        to_number(value: str) -> int | None:
+            Converts a phone number string to its integer form.
+
+        try_parse(value: str) -> Phone | None:
+            Creates a Phone, returning None instead of raising for an invalid number.
     """
 
+    __slots__ = ("number",)
+
     def __init__(self, value: str) -> None:
         """
         Initializes a new Phone instance with a given value, ensuring it is a valid phone number.
@@ -35,6 +86,99 @@ class Phone(Field):
         Raises:
             ValueError: If the phone number does not consist of exactly 10 digits.
         """
-        if not re.fullmatch(r'\d{10}', value):
-            raise ValueError("Phone number must be 10 digits")
         super().__init__(value)
+
+    @property
+    def value(self) -> str:
+        """
+        Returns the phone number as 10 digits.
+
+        Returns:
+            str: The phone number.
+        """
+        return f"{self.number:010d}"
+
+    @value.setter
+    def value(self, value: str) -> None:
+        """
+        Sets the phone number, ensuring it is a valid phone number.
+
+        Args:
+            value (str): The phone number.
+
+        Raises:
+            ValueError: If the phone number does not consist of exactly 10 digits.
+        """
+        number = Phone.to_number(value)
+        if number is None:
+            raise ValueError("Phone number must be 10 digits")
+        self.number = number
+
+    @staticmethod
+    def to_number(value: str) -> Optional[int]:
+        """
+        Converts a phone number string to its integer form.
+
+        Args:
+            value (str): The phone number.
+
+        Returns:
+            int | None: The phone number as an integer, or None if it is not 10 digits.
+        """
+        if not _is_valid(value):
+            return None
+        return int(value)
+
+    @classmethod
+    def try_parse(cls, value: str) -> Optional["Phone"]:
+        """
+        Creates a Phone from a string, returning None instead of raising for an
+        invalid phone number.
+
+        Args:
+            value (str): The phone number.
+
+        Returns:
+            Phone | None: The phone number, or None if it is not 10 digits.
+        """
+        if not _is_valid(value):
+            return None
+        return cls.from_number(int(value))
+
+    @classmethod
+    def from_number(cls, number: int) -> "Phone":
+        """
+        Creates a Phone from the integer form of an already validated phone number.
+
+        Args:
+            number (int): The phone number as an integer.
+
+        Returns:
+            Phone: The phone number.
+        """
+        phone = cls.__new__(cls)
+        phone.number = number
+        return phone
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Compares two phone numbers.
+
+        Args:
+            other (object): The object to compare with.
+
+        Returns:
+            bool: True if both are Phone instances with the same number.
+        """
+        if not isinstance(other, Phone):
+            return NotImplemented
+        return self.number == other.number
+
+    def __hash__(self) -> int:
+        """
+        Returns the hash of the phone number.
+
+        Returns:
+            int: The hash of the integer form of the phone number.
+        """
+        return hash(self.number)
@@ -0,0 +1,102 @@
+"""
+This module validates whole columns of phone numbers, such as those read from a CSV export.
+
+Functions:
+- validate_phone_column(values: Sequence[str]) -> tuple[list[int], list[int]]:
+  Validates a column of phone numbers and converts the valid ones to their integer form.
+
+Usage:
+- When NumPy is installed, the column is copied once into a fixed-width array and the
+10-digit rule is checked for all rows at once. Without NumPy the same result is
+computed row by row with `validate_phones`.
+- The accepted numbers can be passed straight to `AddressBook.add_phone_column`.
+
+Example:
+    numbers, rejected = validate_phone_column(["0501234567", "12345", "0671234567"])
+    numbers   # [501234567, 671234567]
+    rejected  # [1]
+"""
+
+from typing import List, Sequence, Tuple
+
+from .phone import Phone, validate_phones
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_WIDTH = 10
+_POWERS = 10 ** np.arange(9, -1, -1, dtype=np.int64) if np is not None else None
+
+def _validate_with_numpy(values: Sequence[str]) -> Tuple[List[int], List[int]]:
+    """
+    Validates a column of phone numbers with NumPy.
+
+    The lengths are checked on the original strings, because NumPy strips trailing NUL
+    characters when it stores them: "0501234567\x00" must fail like it does for Phone.
+    Cells that are not strings (e.g. None for an empty cell) get the length -1 and are
+    stored as empty strings, so they are rejected as Phone rejects them. The values are
+    then stored in a 10-character Unicode array and checked for ASCII digits. Rejected
+    rows with non-ASCII characters are re-checked one by one, because Phone also accepts
+    non-ASCII decimal digits.
+
+    Args:
+        values (Sequence[str]): The phone numbers.
+
+    Returns:
+        tuple[list[int], list[int]]: The accepted numbers in row order and the indices
+        of the rejected rows.
+    """
+    lengths = np.fromiter((len(value) if isinstance(value, str) else -1 for value in values),
+                          dtype=np.intp, count=len(values))
+    if (lengths < 0).any():
+        values = [value if isinstance(value, str) else "" for value in values]
+    column = np.asarray(values, dtype=f"U{_WIDTH}")
+    codes = column.view(np.uint32).reshape(len(column), _WIDTH)
+    digits = codes - ord("0")
+    valid = (digits <= 9).all(axis=1) & (lengths == _WIDTH)
+    numbers = digits.astype(np.int64) @ _POWERS
+
+    invalid = np.flatnonzero(~valid)
+    for row in invalid[(codes[invalid] > 127).any(axis=1) & (lengths[invalid] == _WIDTH)]:
+        number = Phone.to_number(values[row])
+        if number is not None:
+            valid[row] = True
+            numbers[row] = number
+    return numbers[valid].tolist(), np.flatnonzero(~valid).tolist()
+
+def _validate_with_python(values: Sequence[str]) -> Tuple[List[int], List[int]]:
+    """
+    Validates a column of phone numbers row by row.
+
+    Args:
+        values (Sequence[str]): The phone numbers.
+
+    Returns:
+        tuple[list[int], list[int]]: The accepted numbers in row order and the indices
+        of the rejected rows.
+    """
+    numbers, rejected = [], []
+    for row, (value, valid) in enumerate(zip(values, validate_phones(values))):
+        if valid:
+            numbers.append(int(value))
+        else:
+            rejected.append(row)
+    return numbers, rejected
+
+def validate_phone_column(values: Sequence[str]) -> Tuple[List[int], List[int]]:
+    """
+    Validates a column of phone numbers and converts the valid ones to their integer
+    form, using NumPy when it is installed.
+
+    Args:
+        values (Sequence[str]): The phone numbers.
+
+    Returns:
+        tuple[list[int], list[int]]: The accepted numbers in row order and the indices
+        of the rejected rows.
+    """
+    if np is None or not len(values):
+        return _validate_with_python(values)
+    return _validate_with_numpy(values)
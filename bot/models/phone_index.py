@@ -0,0 +1,133 @@
+"""
+This module defines the PhoneIndex class, a reverse index from phone numbers to contact names.
+
+Classes:
+- PhoneIndex: Maps every phone number stored in an address book to the names of the
+records that own it.
+
+Usage:
+- The AddressBook keeps a PhoneIndex in sync with its records so that the owner of a
+phone number can be found without scanning every record.
+- Phone numbers are keyed by their integer form (see Phone), which takes less memory
+than the 10-digit strings.
+
+Example:
+    index = PhoneIndex()
+    index.add("0501234567", "John")
+    index.owners("0501234567")  # ['John']
+"""
+
+from typing import Dict, List, Set, Union
+
+from .phone import Phone
+
+class PhoneIndex:
+    """
+    A reverse index from phone numbers to the names of the records that own them.
+
+    Most numbers belong to a single contact, so an owner is stored as a plain name
+    string and only promoted to a set when a number is shared by several contacts.
+
+    Methods:
+        add(phone: str, name: str) -> None:
+            Registers a name as an owner of a phone number.
+
+        add_number(number: int, name: str) -> None:
+            Registers a name as an owner of a phone number given as an integer.
+
+        discard(phone: str, name: str) -> None:
+            Removes a name from the owners of a phone number.
+
+        discard_number(number: int, name: str) -> None:
+            Removes a name from the owners of a phone number given as an integer.
+
+        owners(phone: str) -> List[str]:
+            Returns the names owning a phone number.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty PhoneIndex.
+        """
+        self._owners: Dict[int, Union[str, Set[str]]] = {}
+
+    def add(self, phone: str, name: str) -> None:
+        """
+        Registers a name as an owner of a phone number.
+
+        Args:
+            phone (str): The phone number.
+            name (str): The name of the record owning the phone number.
+        """
+        self.add_number(int(phone), name)
+
+    def add_number(self, number: int, name: str) -> None:
+        """
+        Registers a name as an owner of a phone number given in its integer form.
+
+        Args:
+            number (int): The phone number as an integer.
+            name (str): The name of the record owning the phone number.
+        """
+        current = self._owners.get(number)
+        if current is None or current == name:
+            self._owners[number] = name
+        elif isinstance(current, set):
+            current.add(name)
+        else:
+            self._owners[number] = {current, name}
+
+    def discard(self, phone: str, name: str) -> None:
+        """
+        Removes a name from the owners of a phone number, if present.
+
+        Args:
+            phone (str): The phone number.
+            name (str): The name of the record that no longer owns the phone number.
+        """
+        self.discard_number(int(phone), name)
+
+    def discard_number(self, number: int, name: str) -> None:
+        """
+        Removes a name from the owners of a phone number given in its integer form.
+
+        Args:
+            number (int): The phone number as an integer.
+            name (str): The name of the record that no longer owns the phone number.
+        """
+        current = self._owners.get(number)
+        if current is None:
+            return
+        if isinstance(current, set):
+            current.discard(name)
+            if len(current) == 1:
+                self._owners[number] = next(iter(current))
+        elif current == name:
+            del self._owners[number]
+
+    def owners(self, phone: str) -> List[str]:
+        """
+        Returns the names of the records owning a phone number.
+
+        Args:
+            phone (str): The phone number to look up.
+
+        Returns:
+            List[str]: The owner names in alphabetical order, empty if the number is unknown.
+        """
+        number = Phone.to_number(phone)
+        current = self._owners.get(number) if number is not None else None
+        if current is None:
+            return []
+        if isinstance(current, set):
+            return sorted(current)
+        return [current]
+
+    def __len__(self) -> int:
+        """
+        Returns the number of distinct phone numbers in the index.
+
+        Returns:
+            int: The number of indexed phone numbers.
+        """
+        return len(self._owners)
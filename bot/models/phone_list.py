@@ -0,0 +1,270 @@
+"""
+This module defines the PhoneList class, an insertion-ordered collection of phone numbers.
+
+Classes:
+- PhoneList: A list-like container of Phone instances with constant-time lookup,
+removal and in-place replacement by phone number.
+
+Usage:
+- Record stores its phone numbers in a PhoneList. It can be iterated, indexed and
+measured like a list, so code that reads `record.phones` keeps working.
+- The numbers are stored in an `array('q')` of their integer forms (see Phone), and Phone
+instances are created only when a number is read.
+- Most contacts have a handful of numbers, so a PhoneList only builds its lookup
+dictionary once it holds more than `INDEX_THRESHOLD` numbers; below that a scan of
+the few numbers is as fast and needs no extra memory.
+
+Example:
+    phones = PhoneList()
+    phones.add(Phone("1234567890"))
+    phones.replace("1234567890", Phone("5555555555"))
+    print([str(p) for p in phones])  # ['5555555555']
+"""
+
+from array import array
+from typing import Dict, Iterator, Optional
+
+from .phone import Phone
+
+INDEX_THRESHOLD = 8
+
+_EMPTY = -1
+
+class PhoneList:
+    """
+    An insertion-ordered collection of unique phone numbers.
+
+    Phones are kept as integers in an array of slots. Once there are more than
+    INDEX_THRESHOLD of them, a dictionary maps each number to its slot; removed phones
+    then leave an empty slot behind, so removal and replacement never shift the array,
+    and the slots are compacted once more than half of them are empty.
+
+    Methods:
+        add(phone: Phone) -> bool:
+            Appends a phone number unless it is already present.
+
+        add_number(number: int) -> bool:
+            Appends a phone number given in its integer form unless it is already present.
+
+        get(phone_number: str) -> Phone | None:
+            Returns the Phone instance for a number.
+
+        remove(phone_number: str) -> Phone | None:
+            Removes a phone number.
+
+        replace(old_phone_number: str, phone: Phone) -> bool:
+            Replaces a phone number in place, keeping its position.
+
+        numbers() -> Iterator[int]:
+            Iterates over the integer forms of the phone numbers.
+    """
+
+    __slots__ = ("_slots", "_positions")
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty PhoneList.
+        """
+        self._slots = array("q")
+        self._positions: Optional[Dict[int, int]] = None
+
+    def _position(self, number: Optional[int]) -> Optional[int]:
+        """
+        Returns the slot of a phone number.
+
+        Args:
+            number (int | None): The integer form of the phone number, None for an
+            invalid phone number.
+
+        Returns:
+            int | None: The slot of the phone number, or None if it is not present.
+        """
+        if number is None:
+            return None
+        if self._positions is not None:
+            return self._positions.get(number)
+        try:
+            return self._slots.index(number)
+        except ValueError:
+            return None
+
+    def add(self, phone: Phone) -> bool:
+        """
+        Appends a phone number unless it is already present.
+
+        Args:
+            phone (Phone): The phone number to append.
+
+        Returns:
+            bool: True if the phone number was appended, False if it was already present.
+        """
+        return self.add_number(phone.number)
+
+    def add_number(self, number: int) -> bool:
+        """
+        Appends a validated phone number given in its integer form unless it is
+        already present.
+
+        Args:
+            number (int): The phone number as an integer.
+
+        Returns:
+            bool: True if the phone number was appended, False if it was already present.
+        """
+        if self._position(number) is not None:
+            return False
+        if self._positions is not None:
+            self._positions[number] = len(self._slots)
+        self._slots.append(number)
+        if self._positions is None and len(self._slots) > INDEX_THRESHOLD:
+            self._compact()
+        return True
+
+    def get(self, phone_number: str) -> Optional[Phone]:
+        """
+        Returns the Phone instance stored for a phone number.
+
+        Args:
+            phone_number (str): The phone number to find.
+
+        Returns:
+            Phone | None: The Phone instance if found, otherwise None.
+        """
+        position = self._position(Phone.to_number(phone_number))
+        if position is None:
+            return None
+        return Phone.from_number(self._slots[position])
+
+    def remove(self, phone_number: str) -> Optional[Phone]:
+        """
+        Removes a phone number, leaving the other numbers in place.
+
+        Args:
+            phone_number (str): The phone number to remove.
+
+        Returns:
+            Phone | None: The removed Phone instance, or None if it was not present.
+        """
+        number = Phone.to_number(phone_number)
+        position = self._position(number)
+        if position is None:
+            return None
+        if self._positions is None:
+            del self._slots[position]
+        else:
+            del self._positions[number]
+            self._slots[position] = _EMPTY
+            if len(self._positions) * 2 < len(self._slots):
+                self._compact()
+        return Phone.from_number(number)
+
+    def replace(self, old_phone_number: str, phone: Phone) -> bool:
+        """
+        Replaces a phone number in place, keeping its position in the list.
+
+        If the new number is already present, the old number is simply removed.
+
+        Args:
+            old_phone_number (str): The phone number to replace.
+            phone (Phone): The new phone number.
+
+        Returns:
+            bool: True if the old phone number was present, otherwise False.
+        """
+        old_number = Phone.to_number(old_phone_number)
+        position = self._position(old_number)
+        if position is None:
+            return False
+        if self._position(phone.number) is not None:
+            if phone.number != old_number:
+                self.remove(old_phone_number)
+            return True
+        if self._positions is not None:
+            del self._positions[old_number]
+            self._positions[phone.number] = position
+        self._slots[position] = phone.number
+        return True
+
+    def _compact(self) -> None:
+        """
+        Drops the empty slots left behind by removals and rebuilds the lookup
+        dictionary, or drops it if few enough numbers remain.
+        """
+        self._slots = array("q", self.numbers())
+        if len(self._slots) > INDEX_THRESHOLD:
+            self._positions = {number: i for i, number in enumerate(self._slots)}
+        else:
+            self._positions = None
+
+    def numbers(self) -> Iterator[int]:
+        """
+        Iterates over the integer forms of the phone numbers in insertion order.
+
+        Returns:
+            Iterator[int]: The phone numbers as integers.
+        """
+        if self._positions is None:
+            return iter(self._slots)
+        return (number for number in self._slots if number != _EMPTY)
+
+    def __iter__(self) -> Iterator[Phone]:
+        """
+        Iterates over the phone numbers in insertion order.
+
+        Returns:
+            Iterator[Phone]: An iterator over Phone instances.
+        """
+        return map(Phone.from_number, self.numbers())
+
+    def __len__(self) -> int:
+        """
+        Returns the number of stored phone numbers.
+
+        Returns:
+            int: The number of phone numbers.
+        """
+        if self._positions is None:
+            return len(self._slots)
+        return len(self._positions)
+
+    def __contains__(self, phone: object) -> bool:
+        """
+        Checks whether a phone number is stored.
+
+        Args:
+            phone (object): A Phone instance or a phone number string.
+
+        Returns:
+            bool: True if the phone number is stored, otherwise False.
+        """
+        if isinstance(phone, Phone):
+            return self._position(phone.number) is not None
+        if isinstance(phone, str):
+            return self._position(Phone.to_number(phone)) is not None
+        return False
+
+    def __getitem__(self, index: int) -> Phone:
+        """
+        Returns the phone number at a position, like indexing a list.
+
+        Args:
+            index (int): The position of the phone number.
+
+        Returns:
+            Phone: The Phone instance at the position.
+
+        Raises:
+            IndexError: If the position is out of range.
+        """
+        if len(self) != len(self._slots):
+            self._compact()
+        return Phone.from_number(self._slots[index])
+
+    def __repr__(self) -> str:
+        """
+        Returns a list-like representation of the stored phone numbers.
+
+        Returns:
+            str: The representation of the phone numbers.
+        """
+        return repr([phone.value for phone in self])
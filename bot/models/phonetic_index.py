@@ -0,0 +1,154 @@
+"""
+This module defines the PhoneticIndex class, an index of contact names by how they sound.
+
+Classes:
+- PhoneticIndex: Maps the phonetic code of every contact name to the names with that
+code, so names spelled differently, or in another script, are found with one lookup.
+
+Functions:
+- transliterate(name: str) -> str: Spells a name in upper-case Latin letters.
+- sound_code(name: str) -> str: Returns the phonetic code of a name.
+
+Usage:
+- A name is first transliterated: Ukrainian and Russian letters are replaced by their
+Latin spelling and accents are dropped, so "Олена" and "Olena" are spelled alike.
+- The code is Soundex-style: consonants that sound alike share a digit, vowels only
+separate consonants, and repeated digits collapse. Unlike Soundex the first letter is
+coded as well, with a leading vowel, "H", "W" or "Y" coded as 0, so that "Kateryna" and
+"Catherine" or "Olena" and "Helen" get the same code. An "H" after "L", "M", "N" or "R"
+is coded as "G", as the Ukrainian "г" is the Russian "g" ("Serhii" and "Sergey").
+- Only the first CODE_LENGTH digits are kept, so the code groups names by how they
+start, as a spelling-independent search should.
+
+Example:
+    index = PhoneticIndex(["Oleksandr", "Kateryna"])
+    index.search("Александр")  # ['Oleksandr']
+    sound_code("Catherine")  # '2365'
+"""
+
+import unicodedata
+from typing import Dict, Iterable, List, Set
+
+CODE_LENGTH = 4
+
+_CYRILLIC = {
+    "а": "a", "б": "b", "в": "v", "г": "h", "ґ": "g", "д": "d", "е": "e", "є": "ie",
+    "ж": "zh", "з": "z", "и": "y", "і": "i", "ї": "i", "й": "i", "к": "k", "л": "l",
+    "м": "m", "н": "n", "о": "o", "п": "p", "р": "r", "с": "s", "т": "t", "у": "u",
+    "ф": "f", "х": "kh", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "shch", "ь": "", "ю": "iu",
+    "я": "ia", "ё": "e", "ъ": "", "ы": "y", "э": "e",
+}
+_TRANSLITERATION = str.maketrans(_CYRILLIC)
+
+_DIGITS = {
+    **dict.fromkeys("BFPV", "1"), **dict.fromkeys("CGJKQSXZ", "2"),
+    **dict.fromkeys("DT", "3"), "L": "4", **dict.fromkeys("MN", "5"), "R": "6",
+}
+_SEPARATORS = set("AEIOUY")
+
+def transliterate(name: str) -> str:
+    """
+    Spells a name in upper-case Latin letters, transliterating Cyrillic letters and
+    dropping accents and every character that is not a letter.
+
+    Args:
+        name (str): The name in any script.
+
+    Returns:
+        str: The upper-case Latin spelling of the name.
+    """
+    latin = unicodedata.normalize("NFKD", name.lower().translate(_TRANSLITERATION))
+    return "".join(char for char in latin.upper() if "A" <= char <= "Z")
+
+def sound_code(name: str) -> str:
+    """
+    Returns the phonetic code of a name.
+
+    Args:
+        name (str): The name in any script.
+
+    Returns:
+        str: Up to CODE_LENGTH digits, or an empty string if the name has no letters.
+    """
+    letters = transliterate(name).replace("PH", "F")
+    if not letters:
+        return ""
+    code = "0" if letters[0] in _SEPARATORS or letters[0] in "HW" else _DIGITS[letters[0]]
+    previous = code
+    for i in range(1, len(letters)):
+        letter = letters[i]
+        if letter == "H" and letters[i - 1] in "LMNR":
+            letter = "G"
+        if letter in _SEPARATORS:
+            previous = ""
+        elif letter in _DIGITS and _DIGITS[letter] != previous:
+            previous = _DIGITS[letter]
+            code += previous
+            if len(code) == CODE_LENGTH:
+                break
+    return code
+
+class PhoneticIndex:
+    """
+    An index from phonetic codes to the contact names with that code.
+
+    Methods:
+        add(name: str) -> None:
+            Indexes a name.
+
+        discard(name: str) -> None:
+            Removes a name from the index.
+
+        search(query: str, limit: int = 10) -> list[str]:
+            Finds the names that sound like a query.
+    """
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        """
+        Initializes the index with some names.
+
+        Args:
+            names (Iterable[str]): The names to index.
+        """
+        self._names: Dict[str, Set[str]] = {}
+        for name in names:
+            self.add(name)
+
+    def add(self, name: str) -> None:
+        """
+        Indexes a name under its phonetic code.
+
+        Args:
+            name (str): The name to index.
+        """
+        self._names.setdefault(sound_code(name), set()).add(name)
+
+    def discard(self, name: str) -> None:
+        """
+        Removes a name from the index, if present.
+
+        Args:
+            name (str): The name to remove.
+        """
+        code = sound_code(name)
+        names = self._names.get(code)
+        if names is not None:
+            names.discard(name)
+            if not names:
+                del self._names[code]
+
+    def search(self, query: str, limit: int = 10) -> List[str]:
+        """
+        Finds the indexed names with the same phonetic code as a query.
+
+        Args:
+            query (str): The name to look for, in any script or spelling.
+            limit (int): The maximum number of names to return.
+
+        Returns:
+            list[str]: The names that sound like the query, in alphabetical order.
+        """
+        code = sound_code(query)
+        if not code:
+            return []
+        return sorted(self._names.get(code, ()))[:limit]
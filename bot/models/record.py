@@ -7,10 +7,14 @@ Classes:
 - Record: Represents a contact record with a name and a list of phone numbers.
 """
 
-from typing import List, Optional
+from typing import TYPE_CHECKING, Iterable, List, Optional
 
 from .name import Name
 from .phone import Phone
+from .phone_list import PhoneList
+
+if TYPE_CHECKING:
+    from .address_book import AddressBook
 
 class Record:
     """
@@ -18,9 +22,13 @@ class Record:
 
     Attributes:
     - name (Name): The contact's name.
-    - phones (List[Phone]): A list of the contact's phone numbers.
+    - phones (PhoneList): The contact's unique phone numbers in insertion order.
+    - book (AddressBook | None): The address book the record belongs to, notified
+    about every phone change so that its indexes stay in sync.
     """
 
+    __slots__ = ("name", "phones", "book")
+
     def __init__(self, name: str) -> None:
         """
         Initializes a new Record instance with a name.
@@ -29,17 +37,51 @@ class Record:
         - name (str): The name of the contact.
         """
         self.name = Name(name)
-        self.phones: List[Phone] = []
+        self.phones = PhoneList()
+        self.book: Optional["AddressBook"] = None
 
     def add_phone(self, phone_number: str) -> None:
         """
         Adds a phone number to the contact's list of phone numbers.
+        Adding a number the contact already has does nothing.
 
         Args:
         - phone_number (str): The phone number to add.
+
+        Raises:
+        - ValueError: If the phone number is invalid.
+        """
+        self._add(Phone(phone_number))
+
+    def add_phones(self, phone_numbers: Iterable[str]) -> List[str]:
         """
-        phone = Phone(phone_number)
-        self.phones.append(phone)
+        Adds many phone numbers at once, skipping invalid ones instead of raising.
+        Intended for bulk imports; interactive commands use add_phone.
+
+        Args:
+        - phone_numbers (Iterable[str]): The phone numbers to add.
+
+        Returns:
+        - list[str]: The phone numbers that were rejected as invalid.
+        """
+        rejected = []
+        for phone_number in phone_numbers:
+            phone = Phone.try_parse(phone_number)
+            if phone is None:
+                rejected.append(phone_number)
+            else:
+                self._add(phone)
+        return rejected
+
+    def _add(self, phone: Phone) -> None:
+        """
+        Adds a validated phone number and notifies the address book.
+
+        Args:
+        - phone (Phone): The phone number to add.
+        """
+        if self.phones.add(phone) and self.book is not None:
+            self.book._on_phone_added(self, phone.value)
 
     def remove_phone(self, phone_number: str) -> None:
         """
@@ -48,18 +90,34 @@ class Record:
         Args:
         - phone_number (str): The phone number to remove.
         """
-        self.phones = [p for p in self.phones if p.value != phone_number]
+        phone = self.phones.remove(phone_number)
+        if phone is not None and self.book is not None:
+            self.book._on_phone_removed(self, phone.value)
 
     def edit_phone(self, old_phone_number: str, new_phone_number: str) -> None:
         """
-        Replaces an old phone number with a new phone number in the contact's list.
+        Replaces an old phone number with a new phone number in the contact's list,
+        keeping its position. If the old number is missing, the new one is appended.
 
         Args:
         - old_phone_number (str): The phone number to replace.
         - new_phone_number (str): The new phone number to add.
+
+        Raises:
+        - ValueError: If the new phone number is invalid.
         """
-        self.remove_phone(old_phone_number)
-        self.add_phone(new_phone_number)
+        phone = Phone(new_phone_number)
+        old_phone = self.phones.get(old_phone_number)
+        if old_phone is None:
+            self._add(phone)
+        elif phone == old_phone:
+            return
+        elif phone in self.phones:
+            self.remove_phone(old_phone_number)
+        else:
+            self.phones.replace(old_phone_number, phone)
+            if self.book is not None:
+                self.book._on_phone_replaced(self, old_phone.value, phone.value)
 
     def find_phone(self, phone_number: str) -> Optional[Phone]:
         """
@@ -71,10 +129,7 @@ class Record:
         Returns:
         - Phone or None: The Phone instance if found, otherwise None.
         """
-        for phone in self.phones:
-            if phone.value == phone_number:
-                return phone
-        return None
+        return self.phones.get(phone_number)
 
     def __str__(self) -> str:
         """
@@ -83,5 +138,5 @@ class Record:
         Returns:
         - str: A string describing the contact's name and phone numbers.
         """
-        phones_str = '; '.join(str(p) for p in self.phones)
+        phones_str = '; '.join(f"{number:010d}" for number in self.phones.numbers())
         return f"Contact name: {self.name.value}, phones: {phones_str}"
@@ -0,0 +1,188 @@
+"""
+This module defines the SortedKeys class, a sorted set of keys with range queries.
+
+Classes:
+- SortedKeys: Keeps unique keys in sorted order, with logarithmic lookups and cheap
+insertion and removal, and iterates over them in order or over a range of them.
+
+Usage:
+- The keys are split into blocks of at most `2 * BLOCK_SIZE` sorted keys, with the
+largest key of every block kept in a separate list. A lookup bisects that list to find
+the block and then bisects the block, and an insertion or removal only shifts the keys
+of one block, so it stays cheap however many keys there are.
+- AddressBook keeps one of these over the contact names for alphabetical listings and
+range queries.
+
+Example:
+    keys = SortedKeys(["Kateryna", "Ivan", "Olena"])
+    keys.add("Bohdan")
+    list(keys.irange("C", "L"))  # ['Ivan', 'Kateryna']
+"""
+
+from bisect import bisect_left, bisect_right
+from itertools import groupby
+from typing import Any, Iterable, Iterator, List, Optional
+
+BLOCK_SIZE = 1000
+
+class SortedKeys:
+    """
+    A sorted set of keys stored in blocks, supporting ordered iteration and range
+    queries.
+
+    Methods:
+        add(key) -> bool:
+            Inserts a key unless it is already present.
+
+        discard(key) -> bool:
+            Removes a key if present.
+
+        irange(minimum=None, maximum=None, inclusive=(True, True)) -> Iterator:
+            Iterates in order over the keys between two bounds.
+    """
+
+    def __init__(self, keys: Iterable[Any] = ()) -> None:
+        """
+        Initializes the set with some keys.
+
+        Args:
+            keys (Iterable): The initial keys; duplicates are dropped.
+        """
+        ordered = [key for key, _ in groupby(sorted(keys))]
+        self._blocks: List[List[Any]] = [
+            ordered[i:i + BLOCK_SIZE] for i in range(0, len(ordered), BLOCK_SIZE)
+        ]
+        self._maxes: List[Any] = [block[-1] for block in self._blocks]
+        self._len = len(ordered)
+
+    def _locate(self, key: Any) -> int:
+        """
+        Returns the index of the block that holds or would hold a key.
+
+        Args:
+            key: The key to locate.
+
+        Returns:
+            int: The index of the block.
+        """
+        return min(bisect_left(self._maxes, key), len(self._maxes) - 1)
+
+    def add(self, key: Any) -> bool:
+        """
+        Inserts a key unless it is already present.
+
+        Args:
+            key: The key to insert.
+
+        Returns:
+            bool: True if the key was inserted, False if it was already present.
+        """
+        if not self._blocks:
+            self._blocks.append([key])
+            self._maxes.append(key)
+            self._len = 1
+            return True
+        index = self._locate(key)
+        block = self._blocks[index]
+        position = bisect_left(block, key)
+        if position < len(block) and block[position] == key:
+            return False
+        block.insert(position, key)
+        self._maxes[index] = block[-1]
+        self._len += 1
+        if len(block) > 2 * BLOCK_SIZE:
+            self._blocks[index:index + 1] = [block[:BLOCK_SIZE], block[BLOCK_SIZE:]]
+            self._maxes[index:index + 1] = [block[BLOCK_SIZE - 1], block[-1]]
+        return True
+
+    def discard(self, key: Any) -> bool:
+        """
+        Removes a key if it is present.
+
+        Args:
+            key: The key to remove.
+
+        Returns:
+            bool: True if the key was removed, False if it was not present.
+        """
+        if not self._blocks:
+            return False
+        index = self._locate(key)
+        block = self._blocks[index]
+        position = bisect_left(block, key)
+        if position == len(block) or block[position] != key:
+            return False
+        del block[position]
+        self._len -= 1
+        if block:
+            self._maxes[index] = block[-1]
+        else:
+            del self._blocks[index]
+            del self._maxes[index]
+        return True
+
+    def irange(self, minimum: Optional[Any] = None, maximum: Optional[Any] = None,
+               inclusive: tuple = (True, True)) -> Iterator[Any]:
+        """
+        Iterates in order over the keys between two bounds. The keys are read lazily,
+        so stopping early costs only the keys read.
+
+        Args:
+            minimum: The lower bound, or None for no lower bound.
+            maximum: The upper bound, or None for no upper bound.
+            inclusive (tuple[bool, bool]): Whether each bound is included.
+
+        Returns:
+            Iterator: The keys in the range, in ascending order.
+        """
+        if not self._blocks:
+            return
+        if minimum is None:
+            index, position = 0, 0
+        else:
+            find = bisect_left if inclusive[0] else bisect_right
+            index = find(self._maxes, minimum)
+            if index == len(self._maxes):
+                return
+            position = find(self._blocks[index], minimum)
+        for block in self._blocks[index:]:
+            for key in block[position:]:
+                if maximum is not None and (key > maximum or (key == maximum and not inclusive[1])):
+                    return
+                yield key
+            position = 0
+
+    def __contains__(self, key: Any) -> bool:
+        """
+        Checks whether a key is present.
+
+        Args:
+            key: The key to look up.
+
+        Returns:
+            bool: True if the key is present, otherwise False.
+        """
+        if not self._blocks:
+            return False
+        block = self._blocks[self._locate(key)]
+        position = bisect_left(block, key)
+        return position < len(block) and block[position] == key
+
+    def __iter__(self) -> Iterator[Any]:
+        """
+        Iterates over all keys in ascending order.
+
+        Returns:
+            Iterator: The keys.
+        """
+        for block in self._blocks:
+            yield from block
+
+    def __len__(self) -> int:
+        """
+        Returns the number of keys.
+
+        Returns:
+            int: The number of keys.
+        """
+        return self._len
@@ -0,0 +1,23 @@
+"""
+This package serves the assistant bot to many clients over the network.
+
+The package includes the following imports:
+- `CommandServer`, `parse_address` from `.server`: An asyncio server running the
+commands of many TCP or Unix socket connections against one address book.
+- `BotClient`, `connect` from `.client`: An asyncio client for the server.
+- `ThreadPoolHTTPServer`, `ApiRequestHandler`, `make_http_server` from `.http_api`: An
+HTTP/JSON API over the contacts, served by a bounded pool of threads.
+
+Usage:
+- Start a server with `python main.py --serve HOST:PORT` (or `--serve unix:PATH`), then
+send it commands one per line, e.g. with `nc`, or with BotClient.
+- Start the HTTP API with `python main.py --http HOST:PORT`, then e.g.
+`curl -d '{"name": "John", "phone": "0501234567"}' http://HOST:PORT/contacts`.
+
+Example:
+    server = CommandServer(address_book)
+    asyncio.run(server.serve("unix:/tmp/bot.sock"))
+"""
+from .server import CommandServer, parse_address
+from .client import BotClient, connect
+from .http_api import ThreadPoolHTTPServer, ApiRequestHandler, make_http_server
@@ -0,0 +1,147 @@
+"""
+This module provides an asyncio client for the command server of the assistant bot.
+
+Classes:
+- BotClient: A connection to a CommandServer that sends commands and reads replies.
+
+Functions:
+- connect(address: str) -> BotClient: Opens a connection to a server.
+
+Usage:
+- `request` sends one command and waits for its reply, a list of lines without the
+empty line that ends it (see bot.server.server for the protocol).
+- `pipeline` sends many commands before reading their replies, paying one round trip
+for all of them instead of one per command.
+
+Example:
+    client = await connect("127.0.0.1:8765")
+    await client.request("add John 0501234567")  # ['Contact added.']
+    await client.pipeline(["phone John", "hello"])
+    # [['Contact name: John, phones: 0501234567'], ['How can I help you?']]
+    await client.close()
+"""
+
+import asyncio
+from typing import List
+
+from .server import parse_address
+
+class BotClient:
+    """
+    A connection to a CommandServer.
+
+    Methods:
+        request(line: str) -> list[str]:
+            Sends a command and returns its reply.
+
+        pipeline(lines: list[str]) -> list[list[str]]:
+            Sends many commands at once and returns their replies.
+
+        close() -> None:
+            Closes the connection.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Wraps an open connection.
+
+        Args:
+            reader (asyncio.StreamReader): The incoming side of the connection.
+            writer (asyncio.StreamWriter): The outgoing side of the connection.
+        """
+        self._reader = reader
+        self._writer = writer
+
+    async def _read_reply(self) -> List[str]:
+        """
+        Reads one reply.
+
+        Returns:
+            list[str]: The lines of the reply.
+
+        Raises:
+            ConnectionError: If the server closed the connection in the middle of a reply.
+        """
+        lines = []
+        while True:
+            line = await self._reader.readline()
+            if not line:
+                raise ConnectionError("The server closed the connection.")
+            if line == b"\n":
+                return lines
+            lines.append(line.decode("utf-8").rstrip("\n"))
+
+    async def request(self, line: str) -> List[str]:
+        """
+        Sends a command and waits for its reply.
+
+        Args:
+            line (str): The command, in the grammar of the interactive prompt.
+
+        Returns:
+            list[str]: The lines of the reply.
+
+        Raises:
+            ConnectionError: If the connection is lost.
+        """
+        self._writer.write(line.encode("utf-8") + b"\n")
+        await self._writer.drain()
+        return await self._read_reply()
+
+    async def pipeline(self, lines: List[str]) -> List[List[str]]:
+        """
+        Sends many commands without waiting for their replies, then returns the
+        replies in order. The commands are written while the replies are read, so a
+        long pipeline cannot stall with both sides waiting to write.
+
+        Args:
+            lines (list[str]): The commands.
+
+        Returns:
+            list[list[str]]: The lines of the reply of every command.
+
+        Raises:
+            ConnectionError: If the connection is lost.
+        """
+        async def send() -> None:
+            self._writer.write("".join(line + "\n" for line in lines).encode("utf-8"))
+            await self._writer.drain()
+
+        sender = asyncio.create_task(send())
+        try:
+            replies = [await self._read_reply() for _ in lines]
+        finally:
+            await sender
+        return replies
+
+    async def close(self) -> None:
+        """
+        Closes the connection.
+        """
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+
+async def connect(address: str) -> BotClient:
+    """
+    Opens a connection to a command server.
+
+    Args:
+        address (str): `HOST:PORT` or `unix:PATH`.
+
+    Returns:
+        BotClient: The connected client.
+
+    Raises:
+        ValueError: If the address is invalid.
+        OSError: If the server cannot be reached.
+    """
+    kind, location = parse_address(address)
+    if kind == "unix":
+        reader, writer = await asyncio.open_unix_connection(location)
+    else:
+        host, _, port = location.rpartition(":")
+        reader, writer = await asyncio.open_connection(host.strip("[]"), int(port))
+    return BotClient(reader, writer)
@@ -0,0 +1,559 @@
+"""
+This module serves an address book as an HTTP/JSON API, using only the standard library.
+
+Classes:
+- ThreadPoolHTTPServer: An HTTP server handling its requests on a bounded pool of
+worker threads.
+- ApiRequestHandler: Maps the API endpoints to AddressBook operations.
+
+Functions:
+- make_http_server(address_book: AddressBook, host: str, port: int, ...)
+-> ThreadPoolHTTPServer: Creates an API server for an address book.
+- record_to_json(record: Record) -> dict: Encodes a record as a JSON object.
+
+Endpoints:
+- `POST /contacts` with `{"name": "John", "phone": "0501234567"}`: adds a contact (201),
+or the phone number to an existing contact (200).
+- `GET /contacts/<name>`: returns a contact.
+- `PUT /contacts/<name>/phones/<old_phone>` with `{"phone": "0671234567"}`: changes a
+phone number of a contact.
+- `DELETE /contacts/<name>`: deletes a contact (204).
+- `GET /contacts?limit=N&after=<name>`: returns up to N contacts (DEFAULT_PAGE by
+default, at most MAX_PAGE) in alphabetical order after <name>, as
+`{"contacts": [...], "next": <name to pass as after, or null>}`.
+- A contact is `{"name": "John", "phones": ["0501234567"]}`. Errors are
+`{"error": "<message>"}` with status 400 (invalid input), 404 (unknown contact, phone
+or path) or 405 (method not allowed on the path).
+
+Usage:
+- The server speaks HTTP/1.1, so clients keep their connections open between requests.
+A connection holds a worker thread only while its requests are served: between
+requests it waits in a selector watched by one thread, which hands it back to the pool
+when the next request arrives, so idle clients cost no worker. A connection idle for
+KEEPALIVE_TIMEOUT seconds is closed, and one holding a worker for REQUEST_TIMEOUT
+seconds (e.g. a client sending its request slowly) is cut off.
+- At most MAX_QUEUED requests wait for a free worker; a request arriving when the queue
+is full is answered with 503 and its connection closed.
+- The address book is not thread-safe, so every operation holds the server lock.
+A page of contacts is encoded while the lock is held, and the rest of the request
+(parsing, writing the response) runs in parallel with other workers.
+
+Example:
+    server = make_http_server(address_book, "127.0.0.1", 8080, workers=16)
+    server.serve_forever()
+"""
+
+import json
+import selectors
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from bot.models import AddressBook, Record
+
+DEFAULT_PAGE = 100
+MAX_PAGE = 1000
+KEEPALIVE_TIMEOUT = 5.0
+REQUEST_TIMEOUT = 10.0
+MAX_QUEUED = 1024
+MAX_BODY = 64 << 10
+SWEEP_INTERVAL = 0.25
+
+_BUSY_BODY = json.dumps({"error": "The server is busy, try again later."}).encode()
+_BUSY_RESPONSE = (b"HTTP/1.1 503 Service Unavailable\r\n"
+                  b"Content-Type: application/json; charset=utf-8\r\n"
+                  b"Content-Length: " + str(len(_BUSY_BODY)).encode() + b"\r\n"
+                  b"Retry-After: 1\r\nConnection: close\r\n\r\n" + _BUSY_BODY)
+
+class ApiError(Exception):
+    """
+    An error reported to the client with an HTTP status.
+
+    Attributes:
+        status (HTTPStatus): The status of the response.
+    """
+
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        """
+        Initializes the error.
+
+        Args:
+            status (HTTPStatus): The status of the response.
+            message (str): The message sent to the client.
+        """
+        super().__init__(message)
+        self.status = status
+
+def record_to_json(record: Record) -> Dict[str, Any]:
+    """
+    Encodes a record as a JSON object.
+
+    Args:
+        record (Record): The record.
+
+    Returns:
+        dict: The name and phone numbers of the contact.
+    """
+    return {"name": record.name.value, "phones": [phone.value for phone in record.phones]}
+
+class ThreadPoolHTTPServer(HTTPServer):
+    """
+    An HTTP server handling its requests on a bounded pool of worker threads, keeping
+    idle connections in a selector instead of a worker.
+
+    Attributes:
+        address_book (AddressBook): The address book served.
+        lock (threading.Lock): Held during every operation on the address book.
+
+    Methods:
+        renew_deadline(request: socket.socket) -> None:
+            Gives a connection being served another REQUEST_TIMEOUT seconds.
+    """
+
+    request_queue_size = 1024
+
+    def __init__(self, server_address: Tuple[str, int], address_book: AddressBook,
+                 workers: int = 16) -> None:
+        """
+        Binds the server, creates its worker pool and starts watching idle connections.
+
+        Args:
+            server_address (tuple[str, int]): The host and port to listen on.
+            address_book (AddressBook): The address book served.
+            workers (int): The number of worker threads.
+        """
+        super().__init__(server_address, ApiRequestHandler)
+        self.address_book = address_book
+        self.lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http")
+        self._slots = threading.BoundedSemaphore(workers + MAX_QUEUED)
+        self._selector = selectors.DefaultSelector()
+        self._wakeup, self._waker = socket.socketpair()
+        self._selector.register(self._wakeup, selectors.EVENT_READ)
+        self._connections_lock = threading.Lock()
+        self._parked: List[Tuple[socket.socket, Any]] = []
+        self._idle: Dict[socket.socket, float] = {}
+        self._busy: Dict[socket.socket, float] = {}
+        self._closing = False
+        self._watcher = threading.Thread(target=self._watch, name="http-idle", daemon=True)
+        self._watcher.start()
+
+    def process_request(self, request, client_address) -> None:
+        """
+        Leaves an accepted connection to the selector until its first request arrives.
+        """
+        self._park(request, client_address)
+
+    def _park(self, request: socket.socket, client_address: Any) -> None:
+        """
+        Hands a connection waiting for its next request to the watcher thread, or closes
+        it if the server is closing.
+        """
+        with self._connections_lock:
+            if not self._closing:
+                if not self._parked:
+                    self._waker.send(b"\0")
+                self._parked.append((request, client_address))
+                return
+        self.shutdown_request(request)
+
+    def _watch(self) -> None:
+        """
+        Hands the connections whose next request has arrived to the worker pool, and
+        closes the connections idle or busy for too long, until the server is closed.
+
+        The connections are added to the selector on this thread only. Their deadlines
+        are kept in insertion order, which is deadline order since the timeouts are
+        constant, so a sweep stops at the first connection still in time.
+        """
+        while True:
+            for key, _ in self._selector.select(SWEEP_INTERVAL):
+                if key.fileobj is self._wakeup:
+                    self._wakeup.recv(4096)
+                    continue
+                self._selector.unregister(key.fileobj)
+                del self._idle[key.fileobj]
+                self._dispatch(key.fileobj, key.data)
+            with self._connections_lock:
+                if self._closing:
+                    return
+                parked, self._parked = self._parked, []
+            now = time.monotonic()
+            for request, client_address in parked:
+                self._selector.register(request, selectors.EVENT_READ, client_address)
+                self._idle[request] = now + KEEPALIVE_TIMEOUT
+            for request, deadline in list(self._idle.items()):
+                if deadline > now:
+                    break
+                self._selector.unregister(request)
+                del self._idle[request]
+                self.shutdown_request(request)
+            with self._connections_lock:
+                late = []
+                for request, deadline in self._busy.items():
+                    if deadline > now:
+                        break
+                    late.append(request)
+                for request in late:
+                    del self._busy[request]
+            for request in late:
+                try:
+                    request.shutdown(socket.SHUT_RDWR)  # wakes the worker blocked on it
+                except OSError:
+                    pass
+
+    def renew_deadline(self, request: socket.socket) -> None:
+        """
+        Gives a connection being served another REQUEST_TIMEOUT seconds, before each
+        of its pipelined requests.
+
+        Args:
+            request (socket.socket): The connection.
+        """
+        with self._connections_lock:
+            if self._busy.pop(request, None) is not None:
+                self._busy[request] = time.monotonic() + REQUEST_TIMEOUT
+
+    def _dispatch(self, request: socket.socket, client_address: Any) -> None:
+        """
+        Queues a connection with a pending request for a worker, or answers it with 503
+        if MAX_QUEUED requests are already waiting.
+        """
+        if self._slots.acquire(blocking=False):
+            self._executor.submit(self._process, request, client_address)
+            return
+        try:
+            request.setblocking(False)
+            request.recv(MAX_BODY)  # closing with unread data would reset the connection
+            request.send(_BUSY_RESPONSE)
+        except OSError:
+            pass
+        self.shutdown_request(request)
+
+    def _process(self, request: socket.socket, client_address: Any) -> None:
+        """
+        Serves the pending requests of a connection on a worker thread, then parks the
+        connection until its next request, or closes it.
+        """
+        with self._connections_lock:
+            self._busy[request] = time.monotonic() + REQUEST_TIMEOUT
+        keep_alive = False
+        try:
+            handler = self.RequestHandlerClass(request, client_address, self)
+            keep_alive = not handler.close_connection
+        except ConnectionError:
+            pass  # the client went away or was cut off
+        except Exception:  # reported like socketserver does, the server keeps running
+            self.handle_error(request, client_address)
+        finally:
+            with self._connections_lock:
+                self._busy.pop(request, None)
+            self._slots.release()
+        if keep_alive:
+            self._park(request, client_address)
+        else:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        """
+        Stops listening, waits for the workers to finish their requests and closes the
+        idle connections.
+        """
+        super().server_close()
+        with self._connections_lock:
+            self._closing = True
+            self._waker.send(b"\0")
+        self._watcher.join()
+        self._executor.shutdown(wait=True)
+        for request, _ in self._parked:
+            self.shutdown_request(request)
+        for request in self._idle:
+            self.shutdown_request(request)
+        self._selector.close()
+        self._wakeup.close()
+        self._waker.close()
+
+class ApiRequestHandler(BaseHTTPRequestHandler):
+    """
+    Maps the API endpoints to AddressBook operations.
+    """
+
+    protocol_version = "HTTP/1.1"
+    timeout = REQUEST_TIMEOUT
+    # The headers and the body are sent with two writes; without TCP_NODELAY the body
+    # waits for the client's delayed ACK of the headers on a kept-alive connection.
+    disable_nagle_algorithm = True
+    server: ThreadPoolHTTPServer
+
+    def log_message(self, *args: Any) -> None:
+        """
+        Keeps the request log quiet; errors are reported in the responses.
+        """
+
+    def handle(self) -> None:
+        """
+        Serves the requests the client has sent so far, leaving the connection open
+        unless a request closes it. The server waits for the next requests without
+        holding a worker.
+        """
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection and self._pipelined():
+            self.server.renew_deadline(self.connection)
+            self.handle_one_request()
+
+    def _pipelined(self) -> bool:
+        """
+        Checks, without blocking, whether the next request has already arrived. Once
+        some of it is in the read buffer, it must be served by this handler.
+
+        Returns:
+            bool: True if the client has sent more data.
+        """
+        self.connection.setblocking(False)
+        try:
+            return bool(self.rfile.peek(1))
+        except OSError:
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+
+    def do_GET(self) -> None:
+        """
+        Serves a GET request.
+        """
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        """
+        Serves a POST request.
+        """
+        self._handle("POST")
+
+    def do_PUT(self) -> None:
+        """
+        Serves a PUT request.
+        """
+        self._handle("PUT")
+
+    def do_DELETE(self) -> None:
+        """
+        Serves a DELETE request.
+        """
+        self._handle("DELETE")
+
+    def _handle(self, method: str) -> None:
+        """
+        Routes a request to its endpoint and sends the response.
+
+        Args:
+            method (str): The HTTP method.
+        """
+        try:
+            body = self._read_body()
+            url = urlsplit(self.path)
+            parts = [unquote(part) for part in url.path.strip("/").split("/")]
+            status, payload = self._route(method, parts, parse_qs(url.query), body)
+        except ApiError as error:
+            status, payload = error.status, {"error": str(error)}
+        except ValueError as error:
+            status, payload = HTTPStatus.BAD_REQUEST, {"error": str(error)}
+        self._send(status, payload)
+
+    def _route(self, method: str, parts: List[str], query: Dict[str, List[str]],
+               body: Dict[str, Any]) -> Tuple[HTTPStatus, Optional[Dict[str, Any]]]:
+        """
+        Runs the endpoint of a request.
+
+        Args:
+            method (str): The HTTP method.
+            parts (list[str]): The decoded segments of the path.
+            query (dict[str, list[str]]): The query parameters.
+            body (dict): The JSON body, empty if there is none.
+
+        Returns:
+            tuple[HTTPStatus, dict | None]: The status and the JSON payload of the response.
+
+        Raises:
+            ApiError: If the path, method or contact is unknown.
+            ValueError: If the input is invalid.
+        """
+        if parts[0] != "contacts" or len(parts) not in (1, 2, 4):
+            raise ApiError(HTTPStatus.NOT_FOUND, f"Unknown path {self.path}.")
+        if len(parts) == 1:
+            if method == "GET":
+                return self._list(query)
+            if method == "POST":
+                return self._add(_field(body, "name"), _field(body, "phone"))
+        elif len(parts) == 2:
+            if method == "GET":
+                return self._show(parts[1])
+            if method == "DELETE":
+                return self._delete(parts[1])
+        elif parts[2] == "phones" and method == "PUT":
+            return self._change(parts[1], parts[3], _field(body, "phone"))
+        elif parts[2] != "phones":
+            raise ApiError(HTTPStatus.NOT_FOUND, f"Unknown path {self.path}.")
+        raise ApiError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} is not allowed on {self.path}.")
+
+    def _add(self, name: str, phone: str) -> Tuple[HTTPStatus, Dict[str, Any]]:
+        """
+        Adds a contact, or a phone number to an existing contact.
+        """
+        with self.server.lock:
+            book = self.server.address_book
+            record = book.find(name)
+            if record is not None:
+                record.add_phone(phone)
+                return HTTPStatus.OK, record_to_json(record)
+            record = Record(name)
+            record.add_phone(phone)
+            book.add_record(record)
+            return HTTPStatus.CREATED, record_to_json(record)
+
+    def _show(self, name: str) -> Tuple[HTTPStatus, Dict[str, Any]]:
+        """
+        Returns a contact.
+        """
+        with self.server.lock:
+            return HTTPStatus.OK, record_to_json(self._find(name))
+
+    def _change(self, name: str, old_phone: str,
+                new_phone: str) -> Tuple[HTTPStatus, Dict[str, Any]]:
+        """
+        Changes a phone number of a contact.
+        """
+        with self.server.lock:
+            record = self._find(name)
+            if record.find_phone(old_phone) is None:
+                raise ApiError(HTTPStatus.NOT_FOUND,
+                               f"No phone number {old_phone} found for contact {name}.")
+            record.edit_phone(old_phone, new_phone)
+            return HTTPStatus.OK, record_to_json(record)
+
+    def _delete(self, name: str) -> Tuple[HTTPStatus, None]:
+        """
+        Deletes a contact.
+        """
+        with self.server.lock:
+            record = self._find(name)
+            self.server.address_book.delete(record.name.value)
+        return HTTPStatus.NO_CONTENT, None
+
+    def _list(self, query: Dict[str, List[str]]) -> Tuple[HTTPStatus, Dict[str, Any]]:
+        """
+        Returns a page of contacts in alphabetical order.
+        """
+        limit_value = query.get("limit", [str(DEFAULT_PAGE)])[-1]
+        if not limit_value.isdigit() or not 1 <= int(limit_value) <= MAX_PAGE:
+            raise ValueError(f"The limit must be a number from 1 to {MAX_PAGE}.")
+        limit = int(limit_value)
+        after = query.get("after", [None])[-1]
+        with self.server.lock:
+            page = [record_to_json(record) for record in
+                    islice(self.server.address_book.records_after(after), limit + 1)]
+        following = page[limit - 1]["name"] if len(page) > limit else None
+        return HTTPStatus.OK, {"contacts": page[:limit], "next": following}
+
+    def _find(self, name: str) -> Record:
+        """
+        Finds a contact, which must exist.
+
+        Raises:
+            ApiError: If there is no contact with this name.
+        """
+        record = self.server.address_book.find(name)
+        if record is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"No contact found with name {name}.")
+        return record
+
+    def _read_body(self) -> Dict[str, Any]:
+        """
+        Reads and decodes the JSON body of the request.
+
+        Returns:
+            dict: The body, empty if the request has none.
+
+        Raises:
+            ApiError: If the Content-Length is invalid, or the body is too large or not
+            a JSON object.
+        """
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length.")
+        if length > MAX_BODY:
+            self.close_connection = True
+            raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "The request body is too large.")
+        if length == 0:
+            return {}
+        try:
+            body = json.loads(self.rfile.read(length))
+        except ValueError as error:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {error}") from error
+        if not isinstance(body, dict):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "The request body must be a JSON object.")
+        return body
+
+    def _send(self, status: HTTPStatus, payload: Optional[Dict[str, Any]]) -> None:
+        """
+        Sends a JSON response.
+
+        Args:
+            status (HTTPStatus): The status of the response.
+            payload (dict | None): The JSON payload, None for an empty response.
+        """
+        data = b"" if payload is None else json.dumps(payload, ensure_ascii=False).encode()
+        self.send_response(status)
+        if payload is not None:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+def _field(body: Dict[str, Any], name: str) -> str:
+    """
+    Returns a string field of a request body.
+
+    Args:
+        body (dict): The request body.
+        name (str): The name of the field.
+
+    Returns:
+        str: The value of the field.
+
+    Raises:
+        ApiError: If the field is missing or not a string.
+    """
+    value = body.get(name)
+    if not isinstance(value, str):
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"The request body needs a string {name!r}.")
+    return value
+
+def make_http_server(address_book: AddressBook, host: str, port: int,
+                     workers: int = 16) -> ThreadPoolHTTPServer:
+    """
+    Creates an HTTP/JSON API server for an address book.
+
+    Args:
+        address_book (AddressBook): The address book to serve.
+        host (str): The host to listen on.
+        port (int): The port to listen on, 0 for any free port.
+        workers (int): The number of worker threads.
+
+    Returns:
+        ThreadPoolHTTPServer: The bound server; call serve_forever to run it.
+
+    Raises:
+        OSError: If the address cannot be bound.
+    """
+    return ThreadPoolHTTPServer((host, port), address_book, workers)
@@ -0,0 +1,274 @@
+"""
+This module serves the assistant bot over TCP or Unix sockets with asyncio.
+
+Classes:
+- CommandServer: Runs the commands received from many connections against one
+address book.
+
+Functions:
+- parse_address(address: str) -> tuple[str, str]: Splits a server address into
+its kind and location.
+
+Protocol:
+- A request is one line holding a command in the grammar of the interactive prompt.
+- The reply is the output of the command, one or more lines, followed by an empty line,
+so a client reads lines until it gets an empty one. A blank request gets an empty reply.
+- After 'close' or 'exit' the server replies and closes the connection.
+- The last request may lack its newline if the client then shuts down its sending side.
+- Requests may be pipelined: a client can write many requests before reading any reply.
+They are run in order and the replies come back in the same order.
+
+Usage:
+- Every connection is served by a coroutine on one event loop, and the handlers run on
+that loop between reads, so the commands of all connections run one at a time against
+the address book and need no locking. An idle connection costs only its coroutine,
+which lets one process hold thousands of them.
+- The server reads whatever the client has sent, up to READ_SIZE bytes, runs every
+complete request in it and writes all their replies with one write, so a pipelining
+client pays one system call and one round trip per batch instead of per command.
+- Long replies (e.g. `all` on a large book) are written in pieces of FLUSH_SIZE bytes,
+waiting for the client to read them when the socket buffer is full, so they take the
+same memory whatever their size. Other connections are served while a reply waits.
+A request line longer than LINE_LIMIT bytes closes the connection.
+- While a streamed reply waits for its client, other connections may change the book,
+and the rest of the listing reflects those changes, as paging with `all --after` does.
+- The server runs SERVER_REGISTRY by default, which leaves out the commands reading or
+writing files, since their paths would be resolved on the server for any client.
+- Blocking commands (e.g. `compact`) run in a worker thread, so the loop keeps reading
+and accepting connections meanwhile. Every other command waits until the blocking one
+is done, so the book is still changed by one command at a time.
+
+Example:
+    server = CommandServer(address_book)
+    asyncio.run(server.serve("127.0.0.1:8765"))
+"""
+
+import asyncio
+import os
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from bot.cli.commands import SERVER_REGISTRY, CommandRegistry
+from bot.cli.parse_input import parse_input
+from bot.models import AddressBook
+
+BACKLOG = 4096
+END_OF_REPLY = b"\n"
+READ_SIZE = 64 << 10
+LINE_LIMIT = 64 << 10
+FLUSH_SIZE = 64 << 10
+
+def parse_address(address: str) -> Tuple[str, str]:
+    """
+    Splits a server address into its kind and location: `unix:PATH` is a Unix socket,
+    `HOST:PORT` a TCP socket.
+
+    Args:
+        address (str): The address.
+
+    Returns:
+        tuple[str, str]: ("unix", path), or ("tcp", "host:port") with the host and
+        port validated.
+
+    Raises:
+        ValueError: If the address is neither a Unix socket path nor HOST:PORT.
+    """
+    if address.startswith("unix:"):
+        return "unix", address[len("unix:"):]
+    host, _, port = address.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"Invalid address {address}: expected HOST:PORT or unix:PATH")
+    return "tcp", address
+
+class CommandServer:
+    """
+    Serves the commands of the assistant bot to many connections at once.
+
+    Attributes:
+        address_book (AddressBook): The address book shared by all connections.
+        registry (CommandRegistry): The commands.
+        connections (int): The number of open connections.
+
+    Methods:
+        start(address: str) -> asyncio.AbstractServer:
+            Starts listening on an address.
+
+        serve(address: str) -> None:
+            Listens on an address until cancelled.
+    """
+
+    def __init__(self, address_book: AddressBook,
+                 registry: CommandRegistry = SERVER_REGISTRY) -> None:
+        """
+        Initializes a server for an address book.
+
+        Args:
+            address_book (AddressBook): The address book shared by all connections.
+            registry (CommandRegistry): The commands, SERVER_REGISTRY by default.
+        """
+        self.address_book = address_book
+        self.registry = registry
+        self.connections = 0
+        self._busy: Optional[asyncio.Future] = None
+
+    async def start(self, address: str) -> asyncio.AbstractServer:
+        """
+        Starts listening on an address.
+
+        Args:
+            address (str): `HOST:PORT` or `unix:PATH`.
+
+        Returns:
+            asyncio.AbstractServer: The listening server.
+
+        Raises:
+            ValueError: If the address is invalid.
+            OSError: If the socket cannot be bound.
+        """
+        kind, location = parse_address(address)
+        if kind == "unix":
+            if os.path.exists(location):
+                os.unlink(location)
+            return await asyncio.start_unix_server(self._serve_connection, location,
+                                                   backlog=BACKLOG)
+        host, _, port = location.rpartition(":")
+        return await asyncio.start_server(self._serve_connection, host.strip("[]"),
+                                          int(port), backlog=BACKLOG)
+
+    async def serve(self, address: str) -> None:
+        """
+        Listens on an address and serves connections until cancelled, then removes
+        the socket file of a Unix socket.
+
+        Args:
+            address (str): `HOST:PORT` or `unix:PATH`.
+        """
+        server = await self.start(address)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            kind, location = parse_address(address)
+            if kind == "unix" and os.path.exists(location):
+                os.unlink(location)
+
+    async def _wait_idle(self) -> None:
+        """
+        Waits until no blocking command is running in a worker thread.
+        """
+        while self._busy is not None:
+            await asyncio.wait((self._busy,))
+
+    async def _run_blocking(self, command: str, args: List[str]) -> Iterable[str]:
+        """
+        Runs a blocking command in a worker thread, collecting its whole output there,
+        progress messages included, since the connection may only be written from the
+        event loop.
+
+        Args:
+            command (str): The name of the command.
+            args (list[str]): The arguments of the command.
+
+        Returns:
+            Iterable[str]: The progress messages and chunks of output, in order.
+        """
+        def run() -> List[str]:
+            output: List[str] = []
+            for chunk in self.registry.dispatch(command, args, self.address_book,
+                                                output.append):
+                output.append(chunk)
+            return output
+
+        self._busy = asyncio.get_running_loop().run_in_executor(None, run)
+        try:
+            return await self._busy
+        finally:
+            self._busy = None
+
+    async def _run(self, line: str, replies: List[bytes],
+                   writer: asyncio.StreamWriter) -> bool:
+        """
+        Runs the command of a request line, adding its reply, without the end marker,
+        to the pending replies. The pending replies are written out whenever the reply
+        grows by FLUSH_SIZE bytes.
+
+        Args:
+            line (str): The request line.
+            replies (list[bytes]): The pending replies of the connection.
+            writer (asyncio.StreamWriter): The connection.
+
+        Returns:
+            bool: True if the command ends the connection.
+        """
+        if not line:
+            return False
+        command, *args = parse_input(line)
+        found = self.registry.get(command)
+        size = 0
+
+        def progress(message: str) -> None:
+            replies.append(message.encode("utf-8") + b"\n")
+
+        try:
+            await self._wait_idle()
+            if found is not None and found.blocking:
+                chunks = await self._run_blocking(command, args)
+            else:
+                chunks = self.registry.dispatch(command, args, self.address_book, progress)
+            for chunk in chunks:
+                reply = chunk.encode("utf-8") + b"\n"
+                replies.append(reply)
+                size += len(reply)
+                if size >= FLUSH_SIZE:
+                    writer.writelines(replies)
+                    replies.clear()
+                    size = 0
+                    await writer.drain()
+                    await self._wait_idle()
+        except ConnectionError:
+            raise
+        except Exception as error:  # a failing command must not take the server down
+            replies.append(f"Error: {error}".encode("utf-8") + b"\n")
+        return found is not None and found.exits
+
+    async def _serve_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+        """
+        Serves the requests of one connection until it is closed. All the complete
+        request lines received at once are run in order and their replies written
+        together. A last request without a newline is run when the client stops sending.
+
+        Args:
+            reader (asyncio.StreamReader): The incoming side of the connection.
+            writer (asyncio.StreamWriter): The outgoing side of the connection.
+        """
+        self.connections += 1
+        partial = b""
+        replies: List[bytes] = []
+        try:
+            while True:
+                data = await reader.read(READ_SIZE)
+                if data:
+                    *requests, partial = (partial + data).split(b"\n")
+                    if len(partial) > LINE_LIMIT:
+                        break
+                else:
+                    requests = [partial] if partial.strip() else []
+                    if not requests:
+                        break
+                exits = False
+                for request in requests:
+                    exits = await self._run(request.decode("utf-8", "replace").strip(),
+                                            replies, writer)
+                    replies.append(END_OF_REPLY)
+                    if exits:
+                        break
+                writer.writelines(replies)
+                replies.clear()
+                await writer.drain()
+                if exits or not data:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
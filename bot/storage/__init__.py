@@ -0,0 +1,46 @@
+"""
+This module provides durable storage for the assistant bot's address book.
+
+The module includes the following imports:
+- `WriteAheadLog` from `.wal`: An append-only log of address book mutations.
+- `read_log` from `.wal`: A function reading the mutations stored in a log file.
+- `write_snapshot`, `upgrade_snapshot`, `MappedSnapshot` from `.snapshot`: Writing,
+upgrading and memory-mapping binary snapshots of an address book.
+- `MappedAddressBook` from `.mapped_book`: An AddressBook backed by a memory-mapped
+snapshot that builds records on demand.
+- `SQLiteAddressBook` from `.sqlite_book`: An AddressBook stored in a SQLite database.
+- `PersistentAddressBook` from `.persistent_book`: An AddressBook that logs every
+mutation and restores its state from a snapshot and the log when opened.
+- `import_csv`, `ImportStats` from `.csv_import`: Streaming contacts from a CSV file
+into an address book.
+- `export_jsonl`, `import_jsonl` from `.jsonl`: Streaming an address book to and from
+a JSON Lines file.
+
+Classes:
+- `WriteAheadLog`: Appends encoded mutations to a file with a configurable fsync policy.
+- `MappedSnapshot`: A read-only view of a snapshot answering lookups from its on-disk
+hash tables.
+- `MappedAddressBook`: An AddressBook whose contacts stay in the snapshot until used.
+- `PersistentAddressBook`: An AddressBook whose state survives restarts, with log
+compaction through snapshots.
+- `SQLiteAddressBook`: An AddressBook that can grow larger than the available memory.
+- `ImportStats`: The number of rows read and values rejected by an import.
+
+Functions:
+- `read_log`: Reads the mutations stored in a write-ahead log file.
+- `write_snapshot`: Writes a binary snapshot of an address book.
+- `upgrade_snapshot`: Rewrites a snapshot of an earlier format in the current one.
+- `import_csv`: Streams a CSV file into an address book in bounded memory.
+- `export_jsonl`, `import_jsonl`: Stream an address book to and from a JSON Lines file.
+
+Usage:
+- Open a `PersistentAddressBook` instead of an `AddressBook` to keep contacts between runs,
+and close it on exit so that buffered mutations reach the disk.
+"""
+from .wal import WriteAheadLog, read_log, FSYNC_POLICIES
+from .snapshot import write_snapshot, upgrade_snapshot, MappedSnapshot
+from .mapped_book import MappedAddressBook
+from .persistent_book import PersistentAddressBook
+from .sqlite_book import SQLiteAddressBook
+from .csv_import import import_csv, ImportStats
+from .jsonl import export_jsonl, import_jsonl
@@ -0,0 +1,134 @@
+"""
+This module imports contacts from CSV files into an address book.
+
+Functions:
+- read_rows(path: str) -> Iterator[list[str]]: Reads the rows of a CSV file one at a time.
+- parse_rows(rows: Iterable[list[str]]) -> Iterator[tuple[str, list[str]]]: Turns CSV
+rows into a name and its phone numbers.
+- import_entries(address_book: AddressBook, entries: Iterable[tuple[str, list[str]]], ...)
+-> ImportStats: Merges a stream of names and phone numbers into an address book.
+- import_csv(address_book: AddressBook, path: str, ...) -> ImportStats: Streams a CSV
+file into an address book.
+
+Classes:
+- ImportStats: The number of rows read and values rejected by an import.
+
+Usage:
+- Every row holds a contact name followed by one or more phone numbers, e.g.
+`John,0501234567,0671234567`. A first row starting with the cell `name` is treated as
+a header and skipped.
+- The file is streamed through a pipeline of generators (read, parse, then merge in
+chunks of `chunk_size` rows with `AddressBook.bulk_add`), so only one chunk of rows is
+held in memory whatever the size of the file. Phone numbers of existing contacts are
+merged into their records, as the add command does.
+
+Example:
+    stats = import_csv(address_book, "contacts.csv")
+    print(stats.rows, stats.rejected)
+"""
+
+import csv
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from bot.models import AddressBook
+
+CHUNK_SIZE = 10_000
+
+class ImportStats(NamedTuple):
+    """
+    The outcome of an import.
+
+    Attributes:
+        rows (int): The number of contact rows read.
+        rejected (int): The number of phone numbers and rows rejected as invalid.
+    """
+
+    rows: int
+    rejected: int
+
+def read_rows(path: str) -> Iterator[List[str]]:
+    """
+    Reads the rows of a CSV file one at a time.
+
+    Args:
+        path (str): The path of the CSV file.
+
+    Returns:
+        Iterator[list[str]]: The cells of every row.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        yield from csv.reader(file)
+
+def parse_rows(rows: Iterable[List[str]]) -> Iterator[Tuple[str, List[str]]]:
+    """
+    Turns CSV rows into a contact name and its phone numbers, skipping blank rows and
+    the header row.
+
+    Args:
+        rows (Iterable[list[str]]): The cells of every row.
+
+    Returns:
+        Iterator[tuple[str, list[str]]]: The name and phone numbers of every row.
+    """
+    first = True
+    for row in rows:
+        cells = [cell.strip() for cell in row]
+        if not any(cells):
+            continue
+        if first and cells[0].lower() == "name":
+            first = False
+            continue
+        first = False
+        yield cells[0], [cell for cell in cells[1:] if cell]
+
+def import_entries(address_book: AddressBook, entries: Iterable[Tuple[str, List[str]]],
+                   chunk_size: int = CHUNK_SIZE,
+                   progress: Optional[Callable[[ImportStats], None]] = None) -> ImportStats:
+    """
+    Merges a stream of names and phone numbers into an address book chunk by chunk.
+    Entries without a phone number are counted as rejected.
+
+    Args:
+        address_book (AddressBook): The address book to import into.
+        entries (Iterable[tuple[str, list[str]]]): The name and phone numbers of every row.
+        chunk_size (int): The number of rows merged at once.
+        progress (Callable[[ImportStats], None] | None): Called with the running totals
+        after every chunk.
+
+    Returns:
+        ImportStats: The number of rows read and values rejected.
+    """
+    rows = rejected = 0
+    entries = iter(entries)
+    while True:
+        chunk = list(islice(entries, chunk_size))
+        if not chunk:
+            break
+        rows += len(chunk)
+        rejected += sum(1 for _, phones in chunk if not phones)
+        rejected += len(address_book.bulk_add(chunk))
+        if progress is not None:
+            progress(ImportStats(rows, rejected))
+    return ImportStats(rows, rejected)
+
+def import_csv(address_book: AddressBook, path: str, chunk_size: int = CHUNK_SIZE,
+               progress: Optional[Callable[[ImportStats], None]] = None) -> ImportStats:
+    """
+    Streams a CSV file into an address book, merging it chunk by chunk.
+
+    Args:
+        address_book (AddressBook): The address book to import into.
+        path (str): The path of the CSV file.
+        chunk_size (int): The number of rows merged at once.
+        progress (Callable[[ImportStats], None] | None): Called with the running totals
+        after every chunk.
+
+    Returns:
+        ImportStats: The number of rows read and values rejected.
+
+    Raises:
+        OSError: If the file cannot be read.
+        csv.Error: If the file is not valid CSV.
+    """
+    return import_entries(address_book, parse_rows(read_rows(path)), chunk_size, progress)
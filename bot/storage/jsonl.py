@@ -0,0 +1,121 @@
+"""
+This module exports and imports address books as JSON Lines files.
+
+Functions:
+- iter_jsonl(address_book: AddressBook) -> Iterator[str]: Encodes every record as one
+JSON line.
+- export_jsonl(address_book: AddressBook, path: str) -> int: Writes an address book to a
+JSON Lines file.
+- read_jsonl(path: str) -> Iterator[tuple[str, list[str]]]: Reads the records of a JSON
+Lines file one at a time.
+- import_jsonl(address_book: AddressBook, path: str, ...) -> ImportStats: Streams a JSON
+Lines file into an address book.
+
+Format:
+- One record per line: `{"name": "John", "phones": ["0501234567", "0671234567"]}`.
+
+Usage:
+- Both directions are streamed: the export encodes and writes one record at a time
+while iterating over the book, and the import merges the file in chunks with
+`import_entries`, so moving a book between hosts takes the same memory whatever its size.
+- The export is written to a temporary file and renamed, so an interrupted export
+never leaves a truncated file behind.
+
+Example:
+    export_jsonl(address_book, "contacts.jsonl")
+    stats = import_jsonl(other_book, "contacts.jsonl")
+"""
+
+import json
+import os
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from bot.models import AddressBook
+from .csv_import import CHUNK_SIZE, ImportStats, import_entries
+
+def iter_jsonl(address_book: AddressBook) -> Iterator[str]:
+    """
+    Encodes every record of an address book as one JSON line.
+
+    Args:
+        address_book (AddressBook): The address book to encode.
+
+    Returns:
+        Iterator[str]: The JSON lines, each ending with a newline.
+    """
+    for record in address_book.values():
+        phones = [phone.value for phone in record.phones]
+        yield json.dumps({"name": record.name.value, "phones": phones},
+                         ensure_ascii=False) + "\n"
+
+def export_jsonl(address_book: AddressBook, path: str) -> int:
+    """
+    Writes an address book to a JSON Lines file, replacing it atomically.
+
+    Args:
+        address_book (AddressBook): The address book to export.
+        path (str): The path of the JSON Lines file.
+
+    Returns:
+        int: The number of exported records.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    temporary = path + ".tmp"
+    count = 0
+    with open(temporary, "w", encoding="utf-8", buffering=1 << 20) as file:
+        for line in iter_jsonl(address_book):
+            file.write(line)
+            count += 1
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+    return count
+
+def read_jsonl(path: str) -> Iterator[Tuple[str, List[str]]]:
+    """
+    Reads the records of a JSON Lines file one at a time, skipping blank lines.
+    A line that is not a valid record is returned without a name or phone numbers,
+    so that importing it counts it as rejected.
+
+    Args:
+        path (str): The path of the JSON Lines file.
+
+    Returns:
+        Iterator[tuple[str, list[str]]]: The name and phone numbers of every record.
+    """
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                name, phones = entry["name"], entry["phones"]
+            except (ValueError, TypeError, KeyError):
+                yield "", []
+                continue
+            if not isinstance(name, str) or not isinstance(phones, list):
+                yield "", []
+                continue
+            yield name, phones
+
+def import_jsonl(address_book: AddressBook, path: str, chunk_size: int = CHUNK_SIZE,
+                 progress: Optional[Callable[[ImportStats], None]] = None) -> ImportStats:
+    """
+    Streams a JSON Lines file into an address book, merging it chunk by chunk.
+
+    Args:
+        address_book (AddressBook): The address book to import into.
+        path (str): The path of the JSON Lines file.
+        chunk_size (int): The number of records merged at once.
+        progress (Callable[[ImportStats], None] | None): Called with the running totals
+        after every chunk.
+
+    Returns:
+        ImportStats: The number of records read and values rejected.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    return import_entries(address_book, read_jsonl(path), chunk_size, progress)
@@ -0,0 +1,334 @@
+"""
+This module defines the MappedAddressBook class, an AddressBook backed by a memory-mapped
+snapshot.
+
+Classes:
+- MappedAddressBook: An AddressBook whose contacts live in a snapshot file and are
+turned into Record objects only when they are looked up or changed.
+
+Usage:
+- The snapshot is the base state of the book; `data` holds the overlay of records that
+were looked up, added or changed since, and deleted snapshot contacts are remembered
+so that they stay hidden. Opening the book only maps the snapshot, so it takes the
+same time whatever the book size.
+- A contact is decoded into a Record at most once: every record handed out, by a
+lookup or while iterating, joins the overlay, so changing it through any reference
+changes the one record the book holds. Iterating over the whole book therefore loads
+it into memory; lookups and pages of a listing load only the contacts they return.
+- Compaction keeps the overlay records, which the new snapshot then shadows, so records
+held by callers stay attached to the book.
+- With `normalize_names`, a name is resolved through the name key table of the
+snapshot and a key index of the overlay alone, so no stored name is read up front.
+
+Example:
+    book = MappedAddressBook("book.snapshot")
+    record = book.find("John")  # decoded from the snapshot on demand
+    record.add_phone("0501234567")
+    book.close()
+"""
+
+import os
+from typing import Iterable, Iterator, List, Optional, Set
+
+from bot.models import AddressBook, NameKeys, Record
+from .snapshot import MappedSnapshot, upgrade_snapshot
+
+class MappedAddressBook(AddressBook):
+    """
+    An AddressBook backed by a memory-mapped snapshot with an in-memory overlay.
+
+    Attributes:
+        snapshot (MappedSnapshot | None): The mapped snapshot, or None if there is none yet.
+        upgraded_from (str | None): The earlier format the snapshot was rewritten from
+        when the book was opened, or None.
+
+    Methods:
+        close() -> None:
+            Unmaps the snapshot.
+    """
+
+    def __init__(self, snapshot_path: Optional[str] = None,
+                 normalize_names: bool = False) -> None:
+        """
+        Opens an address book on top of a snapshot file, if it exists, first upgrading
+        a snapshot written in an earlier format.
+
+        Args:
+            snapshot_path (str | None): The path of the snapshot file.
+            normalize_names (bool): Whether names are looked up ignoring letter case
+            and Unicode normalization form.
+
+        Raises:
+            ValueError: If the file is not an address book snapshot.
+        """
+        super().__init__(normalize_names=normalize_names)
+        self.snapshot: Optional[MappedSnapshot] = None
+        self.upgraded_from: Optional[str] = None
+        self._shadowed: Set[str] = set()
+        if snapshot_path is not None and os.path.exists(snapshot_path):
+            self.upgraded_from = upgrade_snapshot(snapshot_path)
+            self.snapshot = MappedSnapshot(snapshot_path)
+
+    def _materialize(self, name: str, phones: List[str]) -> Record:
+        """
+        Builds a Record for a contact stored in the snapshot.
+
+        Args:
+            name (str): The name of the contact.
+            phones (list[str]): The phone numbers of the contact.
+
+        Returns:
+            Record: A record attached to this address book.
+        """
+        record = Record(name)
+        record.add_phones(phones)
+        record.book = self
+        return record
+
+    def _adopt(self, record: Record) -> Record:
+        """
+        Moves a snapshot contact into the overlay, where it shadows the snapshot entry.
+
+        Args:
+            record (Record): The record built from the snapshot.
+
+        Returns:
+            Record: The adopted record.
+        """
+        name = record.name.value
+        self._shadowed.add(name)
+        self.data[name] = record
+        if self._name_keys is not None:
+            self._name_keys.add(name)
+        for number in record.phones.numbers():
+            self._phone_index.add_number(number, name)
+        return record
+
+    def _in_snapshot(self, name: str) -> bool:
+        """
+        Checks whether a name still resolves to its snapshot entry.
+
+        Args:
+            name (str): The name of the contact.
+
+        Returns:
+            bool: True if the snapshot holds the current state of the contact.
+        """
+        return self.snapshot is not None and name not in self._shadowed and name in self.snapshot
+
+    def _key_index(self) -> NameKeys:
+        """
+        Returns the index of the normalized keys of the overlay names, building it on
+        first use; the snapshot has its own name key table.
+
+        Returns:
+            NameKeys: The overlay names by their normalized keys.
+        """
+        if self._name_keys is None:
+            self._name_keys = NameKeys(self.data)
+            self._name_indexes.append(self._name_keys)
+        return self._name_keys
+
+    def _stored_name(self, name: str) -> Optional[str]:
+        """
+        Returns the stored name with the same normalized key as a name, looking in the
+        overlay first and then in the name key table of the snapshot.
+
+        Args:
+            name (str): The name as given.
+
+        Returns:
+            str | None: The stored name, or None if no stored name has the same key.
+        """
+        stored = self._key_index().get(name)
+        if stored is None and self.snapshot is not None:
+            stored = self.snapshot.find_key(name)
+            if stored is not None and stored in self._shadowed:
+                return None
+        return stored
+
+    def find(self, name: str) -> Record | None:
+        """
+        Finds a record by name, decoding it from the snapshot on first access.
+
+        Args:
+            name (str): The name of the contact to find.
+
+        Returns:
+            Record | None: The found record or None if not found.
+        """
+        name = self._resolve(name)
+        record = self.data.get(name)
+        if record is not None or self.snapshot is None or name in self._shadowed:
+            return record
+        phones = self.snapshot.find(name)
+        if phones is None:
+            return None
+        return self._adopt(self._materialize(name, phones))
+
+    def find_by_phone(self, phone_number: str) -> List[Record]:
+        """
+        Finds the records owning a phone number in the overlay and in the snapshot.
+
+        Args:
+            phone_number (str): The phone number to look up.
+
+        Returns:
+            list[Record]: The records owning the phone number, empty if nobody owns it.
+        """
+        records = super().find_by_phone(phone_number)
+        if self.snapshot is not None:
+            for name in self.snapshot.owners(phone_number):
+                if name not in self._shadowed:
+                    records.append(self.find(name))
+        return records
+
+    def __getitem__(self, name: str) -> Record:
+        """
+        Returns the record stored under a name.
+
+        Args:
+            name (str): The name of the contact.
+
+        Returns:
+            Record: The record of the contact.
+
+        Raises:
+            KeyError: If there is no record with this name.
+        """
+        record = self.find(name)
+        if record is None:
+            raise KeyError(name)
+        return record
+
+    def __setitem__(self, name: str, record: Record) -> None:
+        """
+        Stores a record under a name, shadowing the snapshot entry with the same name.
+
+        Args:
+            name (str): The name of the contact.
+            record (Record): The record to be stored.
+        """
+        self.find(name)
+        super().__setitem__(name, record)
+
+    def __delitem__(self, name: str) -> None:
+        """
+        Removes the record stored under a name, hiding its snapshot entry.
+
+        Args:
+            name (str): The name of the contact.
+
+        Raises:
+            KeyError: If there is no record with this name.
+        """
+        self.find(name)
+        super().__delitem__(name)
+
+    def __contains__(self, name: object) -> bool:
+        """
+        Checks whether a contact is in the address book.
+
+        Args:
+            name (object): The name of the contact.
+
+        Returns:
+            bool: True if the contact is in the address book, otherwise False.
+        """
+        if not isinstance(name, str):
+            return False
+        name = self._resolve(name)
+        return name in self.data or self._in_snapshot(name)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of contacts in the address book.
+
+        Returns:
+            int: The number of contacts.
+        """
+        base = len(self.snapshot) if self.snapshot is not None else 0
+        return base - len(self._shadowed) + len(self.data)
+
+    def __iter__(self) -> Iterator[str]:
+        """
+        Iterates over the names of all contacts, snapshot contacts first.
+
+        Returns:
+            Iterator[str]: The names of the contacts.
+        """
+        if self.snapshot is not None:
+            for name in self.snapshot.names():
+                if name not in self._shadowed or name in self.data:
+                    yield name
+        for name in list(self.data):
+            if name not in self._shadowed:
+                yield name
+
+    def values(self) -> Iterator[Record]:
+        """
+        Iterates over all records, moving the snapshot contacts into the overlay as
+        they are reached.
+
+        Returns:
+            Iterator[Record]: The records of the contacts, snapshot contacts first.
+        """
+        if self.snapshot is not None:
+            for name, phones in self.snapshot:
+                if name not in self._shadowed:
+                    yield self._adopt(self._materialize(name, phones))
+                elif name in self.data:
+                    yield self.data[name]
+        for name, record in list(self.data.items()):
+            if name not in self._shadowed:
+                yield record
+
+    def _records(self, names: Iterable[str]) -> Iterator[Record]:
+        """
+        Looks up the records of a stream of names for a listing, moving the snapshot
+        contacts into the overlay as they are reached.
+
+        Args:
+            names (Iterable[str]): The names of the contacts.
+
+        Returns:
+            Iterator[Record]: The records of the names that are stored.
+        """
+        for name in names:
+            record = self.data.get(name)
+            if record is None and self._in_snapshot(name):
+                record = self._adopt(self._materialize(name, self.snapshot.find(name)))
+            if record is not None:
+                yield record
+
+    def items(self) -> Iterator:
+        """
+        Iterates over the names and records of all contacts.
+
+        Returns:
+            Iterator[tuple[str, Record]]: The name and record of every contact.
+        """
+        for record in self.values():
+            yield record.name.value, record
+
+    def _rebase(self, snapshot_path: str) -> None:
+        """
+        Replaces the snapshot with a newer one holding the full current state. The
+        overlay records are kept, shadowing their copies in the new snapshot, so the
+        records callers hold stay the ones the book changes.
+
+        Args:
+            snapshot_path (str): The path of the new snapshot file.
+        """
+        if self.snapshot is not None:
+            self.snapshot.close()
+        self.snapshot = MappedSnapshot(snapshot_path)
+        self._shadowed = set(self.data)
+
+    def close(self) -> None:
+        """
+        Unmaps the snapshot.
+        """
+        if self.snapshot is not None:
+            self.snapshot.close()
+            self.snapshot = None
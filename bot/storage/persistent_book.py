@@ -0,0 +1,269 @@
+"""
+This module defines the PersistentAddressBook class, an AddressBook that survives restarts.
+
+Classes:
+- PersistentAddressBook: An AddressBook that appends every mutation to a write-ahead log
+and rebuilds its state from the latest snapshot and the tail of the log when opened.
+
+Usage:
+- Mutations made through the AddressBook and Record APIs (and therefore through the
+command handlers) are logged automatically; call `close` to flush the log on exit.
+- `compact` saves a snapshot next to the log (at `<log path>.snapshot`) and truncates
+the log. It also runs automatically once the log grows past `compact_threshold` bytes,
+after the mutation that crossed the threshold has finished: a record being replaced
+is never saved half-way.
+- The snapshot is memory-mapped rather than loaded (see MappedAddressBook), so only the
+tail of the log has to be replayed when the book is opened.
+- The snapshot and the log carry a generation number, so a crash between writing a
+snapshot and truncating the log never replays the old log twice.
+
+Example:
+    book = PersistentAddressBook("book.wal", fsync="batch")
+    record = Record("John")
+    record.add_phone("0501234567")
+    book.add_record(record)
+    book.close()
+
+    book = PersistentAddressBook("book.wal")
+    book.find("John")  # Contact name: John, phones: 0501234567
+"""
+
+import time
+from itertools import chain
+from typing import Optional, Tuple
+
+from bot.models import Record
+from .mapped_book import MappedAddressBook
+from .snapshot import write_snapshot
+from .wal import (
+    WriteAheadLog, read_log, check_field,
+    OP_CHECKPOINT, OP_ADD_RECORD, OP_DELETE_RECORD, OP_ADD_PHONE, OP_REMOVE_PHONE, OP_EDIT_PHONE,
+)
+
+class PersistentAddressBook(MappedAddressBook):
+    """
+    An AddressBook that logs every mutation to a write-ahead log.
+
+    Attributes:
+        path (str): The path of the write-ahead log.
+        snapshot_path (str): The path of the snapshot.
+        generation (int): The generation of the latest snapshot, 0 if there is none.
+        compact_threshold (int | None): The log size in bytes that triggers compaction.
+        loaded (int): The number of contacts in the snapshot when the book was opened.
+        load_seconds (float): The time spent mapping the snapshot.
+        replayed (int): The number of mutations replayed when the book was opened.
+        replay_seconds (float): The time spent replaying the log.
+
+    Methods:
+        compact() -> tuple[int, float]:
+            Writes a snapshot of the address book and truncates the log.
+
+        sync() -> None:
+            Forces all logged mutations to disk.
+
+        close() -> None:
+            Flushes and closes the write-ahead log and unmaps the snapshot.
+    """
+
+    def __init__(self, path: str, fsync: str = "batch",
+                 compact_threshold: Optional[int] = 64 << 20, normalize_names: bool = False,
+                 **log_options) -> None:
+        """
+        Opens a persistent address book, mapping its latest snapshot and replaying the
+        mutations logged after it.
+
+        Args:
+            path (str): The path of the write-ahead log.
+            fsync (str): The fsync policy of the log, one of 'always', 'batch' or 'never'.
+            compact_threshold (int | None): The log size in bytes that triggers compaction,
+            or None to compact only on request.
+            normalize_names (bool): Whether names are looked up ignoring letter case
+            and Unicode normalization form.
+            **log_options: Extra options for WriteAheadLog, such as batch_size.
+        """
+        self._log: Optional[WriteAheadLog] = None
+        self._changing = 0
+        self.path = path
+        self.snapshot_path = path + ".snapshot"
+        self.compact_threshold = compact_threshold
+
+        started = time.perf_counter()
+        super().__init__(self.snapshot_path, normalize_names)
+        self.generation = self.snapshot.generation if self.snapshot is not None else 0
+        self.loaded = len(self)
+        self.load_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        self.replayed = 0
+        entries = read_log(path)
+        first = next(entries, None)
+        log_generation = 0
+        if first is not None and first[0] == OP_CHECKPOINT:
+            log_generation = int(first[1])
+        elif first is not None:
+            entries = chain((first,), entries)
+        if log_generation == self.generation:
+            for entry in entries:
+                self._apply(entry)
+                self.replayed += 1
+        self.replay_seconds = time.perf_counter() - started
+
+        self._log = WriteAheadLog(path, fsync, **log_options)
+        if log_generation != self.generation:
+            self._reset_log()
+
+    def _apply(self, entry: Tuple) -> None:
+        """
+        Applies one logged mutation to the address book.
+
+        Args:
+            entry (tuple): The operation code followed by its string fields.
+        """
+        op, name, *phones = entry
+        if op == OP_ADD_RECORD:
+            self.add_record(Record(name))
+        elif op == OP_DELETE_RECORD:
+            self.delete(name)
+        elif op == OP_ADD_PHONE:
+            self[name].add_phone(*phones)
+        elif op == OP_REMOVE_PHONE:
+            self[name].remove_phone(*phones)
+        elif op == OP_EDIT_PHONE:
+            self[name].edit_phone(*phones)
+
+    def compact(self) -> Tuple[int, float]:
+        """
+        Writes a snapshot of the address book, maps it in place of the previous one and
+        truncates the write-ahead log.
+
+        Returns:
+            tuple[int, float]: The size of the snapshot in bytes and the time spent
+            writing it in seconds.
+        """
+        started = time.perf_counter()
+        size = write_snapshot(self, self.snapshot_path, self.generation + 1)
+        self.generation += 1
+        self._rebase(self.snapshot_path)
+        self._reset_log()
+        return size, time.perf_counter() - started
+
+    def _reset_log(self) -> None:
+        """
+        Truncates the log and marks it as the continuation of the current snapshot.
+        """
+        self._log.truncate()
+        self._log.append(OP_CHECKPOINT, str(self.generation))
+        self._log.sync()
+
+    def _append(self, op: int, *fields: str) -> None:
+        """
+        Logs a mutation.
+
+        Args:
+            op (int): The operation code.
+            *fields (str): The string fields of the operation.
+        """
+        if self._log is not None:
+            self._log.append(op, *fields)
+
+    def _maybe_compact(self) -> None:
+        """
+        Compacts the log once it grows past the compaction threshold, unless a record is
+        still being stored or removed; that mutation compacts when it is done.
+        """
+        if (self._changing == 0 and self._log is not None
+                and self.compact_threshold is not None
+                and self._log.size >= self.compact_threshold):
+            self.compact()
+
+    def sync(self) -> None:
+        """
+        Forces all logged mutations to disk.
+        """
+        self._log.sync()
+
+    def close(self) -> None:
+        """
+        Flushes and closes the write-ahead log and unmaps the snapshot.
+        """
+        self._log.close()
+        super().close()
+
+    def __setitem__(self, name: str, record: Record) -> None:
+        """
+        Stores a record under a name, rejecting a name too long for the log before the
+        book changes.
+
+        Args:
+            name (str): The name of the contact.
+            record (Record): The record to be stored.
+
+        Raises:
+            ValueError: If the name does not fit in a log entry.
+        """
+        check_field(name)
+        self._changing += 1
+        try:
+            super().__setitem__(name, record)
+        finally:
+            self._changing -= 1
+        self._maybe_compact()
+
+    def __delitem__(self, name: str) -> None:
+        """
+        Removes the record stored under a name, compacting the log afterwards if it has
+        grown past the threshold.
+
+        Args:
+            name (str): The name of the contact.
+
+        Raises:
+            KeyError: If there is no record with this name.
+        """
+        self._changing += 1
+        try:
+            super().__delitem__(name)
+        finally:
+            self._changing -= 1
+        self._maybe_compact()
+
+    def _on_record_added(self, record: Record) -> None:
+        """
+        Indexes a newly stored record and logs it together with its phones.
+        """
+        super()._on_record_added(record)
+        self._append(OP_ADD_RECORD, record.name.value)
+        for phone in record.phones:
+            self._append(OP_ADD_PHONE, record.name.value, phone.value)
+
+    def _on_record_removed(self, record: Record) -> None:
+        """
+        Unindexes a removed record and logs its deletion.
+        """
+        super()._on_record_removed(record)
+        self._append(OP_DELETE_RECORD, record.name.value)
+
+    def _on_phone_added(self, record: Record, phone_number: str) -> None:
+        """
+        Indexes and logs a phone number added to one of the records.
+        """
+        super()._on_phone_added(record, phone_number)
+        self._append(OP_ADD_PHONE, record.name.value, phone_number)
+        self._maybe_compact()
+
+    def _on_phone_removed(self, record: Record, phone_number: str) -> None:
+        """
+        Unindexes and logs a phone number removed from one of the records.
+        """
+        super()._on_phone_removed(record, phone_number)
+        self._append(OP_REMOVE_PHONE, record.name.value, phone_number)
+        self._maybe_compact()
+
+    def _on_phone_replaced(self, record: Record, old_phone_number: str,
+                           new_phone_number: str) -> None:
+        """
+        Reindexes and logs a phone number edited in place in one of the records.
+        """
+        super()._on_phone_replaced(record, old_phone_number, new_phone_number)
+        self._append(OP_EDIT_PHONE, record.name.value, old_phone_number, new_phone_number)
+        self._maybe_compact()
@@ -0,0 +1,467 @@
+"""
+This module reads and writes memory-mappable snapshots of an address book.
+
+Classes:
+- MappedSnapshot: A read-only view of a snapshot file that answers lookups directly
+from the memory-mapped file, decoding only the contacts it is asked for.
+
+Functions:
+- write_snapshot(book: AddressBook, path: str, generation: int) -> int:
+  Atomically writes the full state of an address book to a snapshot file.
+- upgrade_snapshot(path: str) -> str | None: Rewrites a snapshot written in an earlier
+  format in the current one.
+
+Format:
+- A header of the magic bytes, the snapshot generation, the number of contacts, the
+positions and sizes of three hash tables and the size of the file.
+- The contacts: every contact is its name and the number of its phones (32 bits),
+followed by the phones as 64-bit integers (see Phone.number). Names are UTF-8 prefixed
+by their 16-bit length, which the write-ahead log bounds already.
+- A name table, a phone table and a name key table: open-addressing hash tables of
+64-bit slot pairs (the hash of the key and the position of the contact plus one, 0
+marking an empty slot), sized to a power of two at least twice the number of keys.
+The name key table is keyed by the normalized names (see `normalize_name`), so a book
+opened with `normalize_names` resolves a name without reading every stored name.
+- The magic bytes name the format version. Snapshots written by earlier versions
+(LEGACY_FORMATS: ABSNAP01 without hash tables, ABSNAP02 with phones stored as strings,
+ABSNAP03 with 16-bit phone counts and ABSNAP04 without the name key table) are still
+read, by `upgrade_snapshot`, which rewrites them in the current format with the same
+generation.
+
+Usage:
+- PersistentAddressBook writes a snapshot when it compacts its write-ahead log and maps
+the latest snapshot when opened, so opening takes the same time whatever the book size.
+
+Example:
+    write_snapshot(book, "book.snapshot", generation=1)
+    snapshot = MappedSnapshot("book.snapshot")
+    snapshot.find("John")  # ['0501234567']
+    snapshot.find_key("JOHN")  # 'John'
+    snapshot.close()
+"""
+
+import mmap
+import os
+import struct
+from array import array
+from hashlib import blake2b
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from bot.models import AddressBook, normalize_name
+
+MAGIC = b"ABSNAP05"
+
+_HEADER = struct.Struct("<8s9Q")
+_LENGTH = struct.Struct("<H")
+_COUNT = struct.Struct("<I")
+_PHONE = struct.Struct("<Q")
+
+# The header, whether phones are stored as integers and the phone count, by earlier
+# format version.
+LEGACY_FORMATS = {
+    b"ABSNAP01": (struct.Struct("<8sQQ"), False, _LENGTH),
+    b"ABSNAP02": (struct.Struct("<8s7Q"), False, _LENGTH),
+    b"ABSNAP03": (struct.Struct("<8s7Q"), True, _LENGTH),
+    b"ABSNAP04": (struct.Struct("<8s7Q"), True, _COUNT),
+}
+
+def _hash(key: str) -> int:
+    """
+    Returns a stable 64-bit hash of a key, independent of the interpreter's hash seed.
+
+    Args:
+        key (str): The key to hash.
+
+    Returns:
+        int: The hash of the key.
+    """
+    return int.from_bytes(blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+def _build_table(keys: array, offsets: array) -> Tuple[array, int]:
+    """
+    Builds an open-addressing hash table with linear probing.
+
+    Args:
+        keys (array): The hashes of the keys.
+        offsets (array): The position of the contact of every key.
+
+    Returns:
+        tuple[array, int]: The table as pairs of 64-bit integers and its number of slots.
+    """
+    slots = 1 << max(1, (2 * len(keys)).bit_length())
+    mask = slots - 1
+    table = array("Q", bytes(16 * slots))
+    for key, offset in zip(keys, offsets):
+        slot = key & mask
+        while table[2 * slot + 1]:
+            slot = (slot + 1) & mask
+        table[2 * slot] = key
+        table[2 * slot + 1] = offset + 1
+    return table, slots
+
+def _write_str(file, value: str) -> None:
+    """
+    Writes a length-prefixed UTF-8 string.
+
+    Args:
+        file: The binary file to write to.
+        value (str): The string to write.
+    """
+    data = value.encode("utf-8")
+    file.write(_LENGTH.pack(len(data)))
+    file.write(data)
+
+def write_snapshot(book: AddressBook, path: str, generation: int) -> int:
+    """
+    Atomically writes the full state of an address book to a snapshot file.
+
+    The snapshot is written to a temporary file, fsynced and renamed over the old
+    snapshot, so a crash never leaves a partially written snapshot behind.
+
+    Args:
+        book (AddressBook): The address book to save.
+        path (str): The path of the snapshot file.
+        generation (int): The generation number stored in the snapshot.
+
+    Returns:
+        int: The size of the snapshot in bytes.
+    """
+    contacts = ((record.name.value, list(record.phones.numbers())) for record in book.values())
+    return _write_contacts(contacts, path, generation)
+
+def _write_contacts(contacts: Iterable[Tuple[str, List[int]]], path: str,
+                    generation: int) -> int:
+    """
+    Atomically writes contacts to a snapshot file in the current format.
+
+    Args:
+        contacts (Iterable[tuple[str, list[int]]]): The name and phone numbers, in their
+        integer form, of every contact.
+        path (str): The path of the snapshot file.
+        generation (int): The generation number stored in the snapshot.
+
+    Returns:
+        int: The size of the snapshot in bytes.
+    """
+    name_keys, name_offsets = array("Q"), array("Q")
+    phone_keys, phone_offsets = array("Q"), array("Q")
+    key_keys = array("Q")
+
+    temporary = path + ".tmp"
+    with open(temporary, "wb", buffering=1 << 20) as file:
+        file.write(bytes(_HEADER.size))
+        count = 0
+        for name, numbers in contacts:
+            offset = file.tell()
+            name_keys.append(_hash(name))
+            name_offsets.append(offset)
+            key_keys.append(_hash(normalize_name(name)))
+            _write_str(file, name)
+            file.write(_COUNT.pack(len(numbers)))
+            for number in numbers:
+                phone_keys.append(_hash(f"{number:010d}"))
+                phone_offsets.append(offset)
+                file.write(_PHONE.pack(number))
+            count += 1
+
+        file.write(bytes(-file.tell() % 8))
+        name_table_offset = file.tell()
+        name_table, name_slots = _build_table(name_keys, name_offsets)
+        name_table.tofile(file)
+        phone_table_offset = file.tell()
+        phone_table, phone_slots = _build_table(phone_keys, phone_offsets)
+        phone_table.tofile(file)
+        key_table_offset = file.tell()
+        key_table, key_slots = _build_table(key_keys, name_offsets)
+        key_table.tofile(file)
+        size = file.tell()
+
+        file.seek(0)
+        file.write(_HEADER.pack(MAGIC, generation, count, name_table_offset, name_slots,
+                                phone_table_offset, phone_slots, key_table_offset, key_slots,
+                                size))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+    directory = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(directory)
+    finally:
+        os.close(directory)
+    return size
+
+def _read_legacy(data: mmap.mmap, header: struct.Struct, integer_phones: bool,
+                 phone_count: struct.Struct) -> Iterator[Tuple[str, List[int]]]:
+    """
+    Decodes the contacts of a snapshot written in an earlier format.
+
+    Args:
+        data (mmap.mmap): The mapped snapshot file.
+        header (struct.Struct): The header of the format.
+        integer_phones (bool): Whether the format stores phones as integers rather than
+        as length-prefixed strings.
+        phone_count (struct.Struct): The number of phones of a contact.
+
+    Returns:
+        Iterator[tuple[str, list[int]]]: The name and phone numbers of every contact.
+    """
+    count = header.unpack_from(data, 0)[2]
+    offset = header.size
+    for _ in range(count):
+        (length,) = _LENGTH.unpack_from(data, offset)
+        offset += _LENGTH.size
+        name = str(data[offset:offset + length], "utf-8")
+        offset += length
+        (phones,) = phone_count.unpack_from(data, offset)
+        offset += phone_count.size
+        if integer_phones:
+            numbers = list(struct.unpack_from(f"<{phones}Q", data, offset))
+            offset += phones * _PHONE.size
+        else:
+            numbers = []
+            for _ in range(phones):
+                (length,) = _LENGTH.unpack_from(data, offset)
+                offset += _LENGTH.size
+                numbers.append(int(data[offset:offset + length]))
+                offset += length
+        yield name, numbers
+
+def upgrade_snapshot(path: str) -> Optional[str]:
+    """
+    Rewrites a snapshot written in an earlier format in the current one, keeping its
+    generation. The contacts are streamed from the old file to the new one, which then
+    replaces it atomically.
+
+    Args:
+        path (str): The path of the snapshot file.
+
+    Returns:
+        str | None: The earlier format, e.g. 'ABSNAP01', or None if the snapshot was
+        already in the current format.
+
+    Raises:
+        ValueError: If the file is not an address book snapshot.
+    """
+    with open(path, "rb") as file:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        magic = data[:len(MAGIC)]
+        if magic == MAGIC:
+            return None
+        if magic not in LEGACY_FORMATS:
+            raise ValueError(f"{path} is not an address book snapshot")
+        header, integer_phones, phone_count = LEGACY_FORMATS[magic]
+        generation = header.unpack_from(data, 0)[1]
+        _write_contacts(_read_legacy(data, header, integer_phones, phone_count), path,
+                        generation)
+    finally:
+        data.close()
+    return magic.decode("ascii")
+
+class MappedSnapshot:
+    """
+    A read-only, memory-mapped view of a snapshot file.
+
+    Opening a snapshot only reads its header; lookups probe the on-disk hash tables and
+    decode just the contacts they hit.
+
+    Attributes:
+        path (str): The path of the snapshot file.
+        generation (int): The generation number stored in the snapshot.
+
+    Methods:
+        find(name: str) -> list[str] | None:
+            Returns the phone numbers of a contact.
+
+        find_key(name: str) -> str | None:
+            Returns the stored name with the same normalized key as a name.
+
+        owners(phone_number: str) -> list[str]:
+            Returns the names of the contacts owning a phone number.
+
+        names() -> Iterator[str]:
+            Iterates over the names of the stored contacts.
+
+        close() -> None:
+            Unmaps and closes the snapshot file.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Maps a snapshot file into memory and reads its header.
+
+        Args:
+            path (str): The path of the snapshot file.
+
+        Raises:
+            ValueError: If the file is not an address book snapshot.
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            self._map.close()
+            raise ValueError(f"{path} is not an address book snapshot")
+        (magic, self.generation, self._count, name_table_offset, name_slots,
+         phone_table_offset, phone_slots, key_table_offset, key_slots,
+         size) = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or size != len(self._map):
+            self._map.close()
+            raise ValueError(f"{path} is not an address book snapshot")
+        self._name_table = memoryview(self._map)[
+            name_table_offset:name_table_offset + 16 * name_slots].cast("Q")
+        self._phone_table = memoryview(self._map)[
+            phone_table_offset:phone_table_offset + 16 * phone_slots].cast("Q")
+        self._key_table = memoryview(self._map)[
+            key_table_offset:key_table_offset + 16 * key_slots].cast("Q")
+
+    def _probe(self, table: memoryview, key: str) -> Iterator[int]:
+        """
+        Yields the positions of the contacts stored under a key's hash in a table.
+
+        Args:
+            table (memoryview): The hash table to probe.
+            key (str): The key to look up.
+
+        Returns:
+            Iterator[int]: The positions of the candidate contacts.
+        """
+        key_hash = _hash(key)
+        mask = len(table) // 2 - 1
+        slot = key_hash & mask
+        while table[2 * slot + 1]:
+            if table[2 * slot] == key_hash:
+                yield table[2 * slot + 1] - 1
+            slot = (slot + 1) & mask
+
+    def _read_str(self, offset: int) -> Tuple[str, int]:
+        """
+        Decodes a length-prefixed string.
+
+        Args:
+            offset (int): The position of the string.
+
+        Returns:
+            tuple[str, int]: The string and the position following it.
+        """
+        (length,) = _LENGTH.unpack_from(self._map, offset)
+        start = offset + _LENGTH.size
+        return str(self._map[start:start + length], "utf-8"), start + length
+
+    def _read_record(self, offset: int) -> Tuple[str, List[str], int]:
+        """
+        Decodes the contact stored at a position.
+
+        Args:
+            offset (int): The position of the contact.
+
+        Returns:
+            tuple[str, list[str], int]: The name, the phone numbers and the position
+            of the next contact.
+        """
+        name, offset = self._read_str(offset)
+        (count,) = _COUNT.unpack_from(self._map, offset)
+        offset += _COUNT.size
+        numbers = struct.unpack_from(f"<{count}Q", self._map, offset)
+        return name, [f"{number:010d}" for number in numbers], offset + count * _PHONE.size
+
+    def find(self, name: str) -> Optional[List[str]]:
+        """
+        Returns the phone numbers of a contact.
+
+        Args:
+            name (str): The name of the contact.
+
+        Returns:
+            list[str] | None: The phone numbers of the contact, or None if it is not stored.
+        """
+        for offset in self._probe(self._name_table, name):
+            if self._read_str(offset)[0] == name:
+                return self._read_record(offset)[1]
+        return None
+
+    def find_key(self, name: str) -> Optional[str]:
+        """
+        Returns the stored name with the same normalized key as a name.
+
+        Args:
+            name (str): The name to look up, in any letter case or Unicode form.
+
+        Returns:
+            str | None: The stored name, or None if no stored name has the same key.
+        """
+        key = normalize_name(name)
+        for offset in self._probe(self._key_table, key):
+            stored = self._read_str(offset)[0]
+            if normalize_name(stored) == key:
+                return stored
+        return None
+
+    def owners(self, phone_number: str) -> List[str]:
+        """
+        Returns the names of the contacts owning a phone number.
+
+        Args:
+            phone_number (str): The phone number to look up.
+
+        Returns:
+            list[str]: The names of the owners, empty if nobody owns the number.
+        """
+        names = []
+        for offset in self._probe(self._phone_table, phone_number):
+            name, phones, _ = self._read_record(offset)
+            if phone_number in phones and name not in names:
+                names.append(name)
+        return names
+
+    def __contains__(self, name: object) -> bool:
+        """
+        Checks whether a contact is stored.
+
+        Args:
+            name (object): The name of the contact.
+
+        Returns:
+            bool: True if the contact is stored, otherwise False.
+        """
+        return isinstance(name, str) and self.find(name) is not None
+
+    def __iter__(self) -> Iterator[Tuple[str, List[str]]]:
+        """
+        Iterates over the stored contacts in the order they were written.
+
+        Returns:
+            Iterator[tuple[str, list[str]]]: The name and phone numbers of every contact.
+        """
+        offset = _HEADER.size
+        for _ in range(self._count):
+            name, phones, offset = self._read_record(offset)
+            yield name, phones
+
+    def names(self) -> Iterator[str]:
+        """
+        Iterates over the names of the stored contacts in the order they were written.
+
+        Returns:
+            Iterator[str]: The name of every contact.
+        """
+        for name, _ in self:
+            yield name
+
+    def __len__(self) -> int:
+        """
+        Returns the number of stored contacts.
+
+        Returns:
+            int: The number of contacts.
+        """
+        return self._count
+
+    def close(self) -> None:
+        """
+        Unmaps and closes the snapshot file.
+        """
+        self._name_table.release()
+        self._phone_table.release()
+        self._key_table.release()
+        self._map.close()
@@ -0,0 +1,484 @@
+"""
+This module defines the SQLiteAddressBook class, an AddressBook stored in a SQLite database.
+
+Classes:
+- SQLiteAddressBook: An AddressBook with the same interface as the in-memory one that
+keeps its contacts and phone numbers in a local SQLite database, so the book can be
+larger than the available memory.
+
+Usage:
+- Records returned by `find` and by iteration are built from the database on demand and
+write their changes straight back through the address book hooks.
+- Every contact is stored with its normalized name key (see `normalize_name`) in an
+indexed column, so the lookups of `normalize_names` are answered by SQL. Databases
+created before the column existed get it, filled in, when they are opened.
+- Name lookups that SQL cannot answer from an index, such as `find_similar`, use the
+in-memory indexes of AddressBook, built from the stored names on first use.
+- Changes are grouped into transactions of `batch_size` mutations; `commit` ends the
+current transaction early and `close` commits and closes the database. A change is
+durable only once its transaction commits: a crash loses the uncommitted changes of the
+current transaction, up to `batch_size - 1` of them (999 by default) even though their
+methods have returned. Pass `batch_size=1` to commit every change.
+
+Example:
+    book = SQLiteAddressBook("contacts.db")
+    record = Record("John")
+    record.add_phone("0501234567")
+    book.add_record(record)
+    book.find_by_phone("0501234567")  # [Contact name: John, phones: 0501234567]
+    book.close()
+"""
+
+import sqlite3
+from itertools import groupby
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from bot.models import AddressBook, Record, normalize_name
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    name_key TEXT
+);
+CREATE TABLE IF NOT EXISTS phones (
+    contact_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    phone TEXT NOT NULL,
+    PRIMARY KEY (contact_id, phone)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS phones_by_phone ON phones (phone);
+"""
+_ADD_NAME_KEYS = """
+BEGIN;
+ALTER TABLE contacts ADD COLUMN name_key TEXT;
+UPDATE contacts SET name_key = normalize_name(name);
+COMMIT;
+"""
+_KEY_INDEX = "CREATE INDEX IF NOT EXISTS contacts_by_key ON contacts (name_key)"
+
+_CONTACT_ID = "SELECT id FROM contacts WHERE name = ?"
+_INSERT_CONTACT = "INSERT INTO contacts (name, name_key) VALUES (?, ?)"
+_NAME_BY_KEY = "SELECT name FROM contacts WHERE name_key = ? LIMIT 1"
+_DELETE_CONTACT = "DELETE FROM contacts WHERE id = ?"
+_DELETE_PHONES = "DELETE FROM phones WHERE contact_id = ?"
+_INSERT_PHONE = """
+INSERT OR IGNORE INTO phones (contact_id, position, phone)
+SELECT contacts.id, (
+    SELECT COALESCE(MAX(position), 0) + 1 FROM phones WHERE contact_id = contacts.id
+), ?
+FROM contacts WHERE name = ?
+"""
+_INSERT_RECORD_PHONE = "INSERT OR IGNORE INTO phones VALUES (?, ?, ?)"
+_DELETE_PHONE = """
+DELETE FROM phones WHERE contact_id = (SELECT id FROM contacts WHERE name = ?) AND phone = ?
+"""
+_REPLACE_PHONE = """
+UPDATE phones SET phone = ?
+WHERE contact_id = (SELECT id FROM contacts WHERE name = ?) AND phone = ?
+"""
+_CONTACT_PHONES = "SELECT phone FROM phones WHERE contact_id = ? ORDER BY position"
+_PHONE_OWNERS = """
+SELECT contacts.name FROM phones JOIN contacts ON contacts.id = phones.contact_id
+WHERE phones.phone = ? ORDER BY contacts.name
+"""
+_PHONES_BETWEEN = """
+SELECT phones.phone, contacts.name FROM phones JOIN contacts ON contacts.id = phones.contact_id
+WHERE phones.phone >= ? AND phones.phone <= ?
+ORDER BY phones.phone, contacts.name
+"""
+_COUNT = "SELECT COUNT(*) FROM contacts"
+_NAMES = "SELECT name FROM contacts ORDER BY id"
+_NAMES_FROM = "SELECT name FROM contacts WHERE name >= ? ORDER BY name"
+_CONTACTS = """
+SELECT contacts.name, phones.phone FROM contacts
+LEFT JOIN phones ON phones.contact_id = contacts.id
+ORDER BY contacts.id, phones.position
+"""
+_CONTACTS_AFTER = """
+SELECT contacts.name, phones.phone FROM contacts
+LEFT JOIN phones ON phones.contact_id = contacts.id
+WHERE contacts.name > ?
+ORDER BY contacts.name, phones.position
+"""
+_CONTACTS_FROM = """
+SELECT contacts.name, phones.phone FROM contacts
+LEFT JOIN phones ON phones.contact_id = contacts.id
+WHERE contacts.name >= ?
+ORDER BY contacts.name, phones.position
+"""
+_CONTACTS_BETWEEN = """
+SELECT contacts.name, phones.phone FROM contacts
+LEFT JOIN phones ON phones.contact_id = contacts.id
+WHERE contacts.name >= ? AND contacts.name <= ?
+ORDER BY contacts.name, phones.position
+"""
+
+class SQLiteAddressBook(AddressBook):
+    """
+    An AddressBook stored in a SQLite database, indexed by name and by phone number.
+
+    Attributes:
+        path (str): The path of the database file.
+        batch_size (int): The number of mutations grouped into one transaction.
+
+    Methods:
+        commit() -> None:
+            Commits the current transaction.
+
+        close() -> None:
+            Commits and closes the database.
+    """
+
+    def __init__(self, path: str, batch_size: int = 1000,
+                 normalize_names: bool = False) -> None:
+        """
+        Opens or creates an address book database.
+
+        Args:
+            path (str): The path of the database file.
+            batch_size (int): The number of mutations grouped into one transaction; up to
+            batch_size - 1 uncommitted changes are lost on a crash.
+            normalize_names (bool): Whether names are looked up ignoring letter case
+            and Unicode normalization form.
+        """
+        super().__init__(normalize_names=normalize_names)
+        self.path = path
+        self.batch_size = batch_size
+        self._pending = 0
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        self._db.executescript(_SCHEMA)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(contacts)")}
+        if "name_key" not in columns:
+            self._db.create_function("normalize_name", 1, normalize_name, deterministic=True)
+            self._db.executescript(_ADD_NAME_KEYS)
+        self._db.execute(_KEY_INDEX)
+
+    def _write(self, sql: str, parameters: tuple) -> sqlite3.Cursor:
+        """
+        Executes a statement that changes the database inside the current transaction.
+
+        Args:
+            sql (str): The statement.
+            parameters (tuple): The statement parameters.
+
+        Returns:
+            sqlite3.Cursor: The cursor of the executed statement.
+        """
+        if not self._db.in_transaction:
+            self._db.execute("BEGIN")
+        cursor = self._db.execute(sql, parameters)
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.commit()
+        return cursor
+
+    def commit(self) -> None:
+        """
+        Commits the current transaction.
+        """
+        if self._db.in_transaction:
+            self._db.execute("COMMIT")
+        self._pending = 0
+
+    def close(self) -> None:
+        """
+        Commits and closes the database.
+        """
+        self.commit()
+        self._db.close()
+
+    def _contact_id(self, name: str) -> Optional[int]:
+        """
+        Returns the database id of a contact.
+
+        Args:
+            name (str): The name of the contact.
+
+        Returns:
+            int | None: The id of the contact, or None if it is not stored.
+        """
+        row = self._db.execute(_CONTACT_ID, (name,)).fetchone()
+        return row[0] if row is not None else None
+
+    def _stored_name(self, name: str) -> Optional[str]:
+        """
+        Returns the stored name with the same normalized key as a name, from the
+        indexed name_key column.
+
+        Args:
+            name (str): The name as given.
+
+        Returns:
+            str | None: The stored name, or None if no stored name has the same key.
+        """
+        row = self._db.execute(_NAME_BY_KEY, (normalize_name(name),)).fetchone()
+        return row[0] if row is not None else None
+
+    def _materialize(self, name: str, phones: List[str]) -> Record:
+        """
+        Builds a Record attached to this address book from stored values.
+
+        Args:
+            name (str): The name of the contact.
+            phones (list[str]): The phone numbers of the contact.
+
+        Returns:
+            Record: The record of the contact.
+        """
+        record = Record(name)
+        record.add_phones(phones)
+        record.book = self
+        return record
+
+    def find(self, name: str) -> Record | None:
+        """
+        Finds and returns a record by the contact's name.
+
+        Args:
+            name (str): The name of the contact to find.
+
+        Returns:
+            Record | None: The found record or None if not found.
+        """
+        name = self._resolve(name)
+        contact_id = self._contact_id(name)
+        if contact_id is None:
+            return None
+        phones = [row[0] for row in self._db.execute(_CONTACT_PHONES, (contact_id,))]
+        return self._materialize(name, phones)
+
+    def find_by_phone(self, phone_number: str) -> List[Record]:
+        """
+        Finds and returns the records owning a phone number.
+
+        Args:
+            phone_number (str): The phone number to look up.
+
+        Returns:
+            list[Record]: The records owning the phone number, empty if nobody owns it.
+        """
+        names = [row[0] for row in self._db.execute(_PHONE_OWNERS, (phone_number,))]
+        return [self.find(name) for name in names]
+
+    def __getitem__(self, name: str) -> Record:
+        """
+        Returns the record stored under a name.
+
+        Args:
+            name (str): The name of the contact.
+
+        Returns:
+            Record: The record of the contact.
+
+        Raises:
+            KeyError: If there is no record with this name.
+        """
+        record = self.find(name)
+        if record is None:
+            raise KeyError(name)
+        return record
+
+    def __setitem__(self, name: str, record: Record) -> None:
+        """
+        Stores a record under a name, replacing any previous record with this name.
+
+        Args:
+            name (str): The name of the contact.
+            record (Record): The record to be stored.
+        """
+        existing = self._resolve(name)
+        if existing != name:
+            del self[existing]
+        contact_id = self._contact_id(name)
+        if contact_id is not None:
+            self._write(_DELETE_PHONES, (contact_id,))
+            self._write(_DELETE_CONTACT, (contact_id,))
+        contact_id = self._write(_INSERT_CONTACT, (name, normalize_name(name))).lastrowid
+        for position, phone in enumerate(record.phones, 1):
+            self._write(_INSERT_RECORD_PHONE, (contact_id, position, phone.value))
+        record.book = self
+        self._index_name(name)
+
+    def __delitem__(self, name: str) -> None:
+        """
+        Removes the record stored under a name.
+
+        Args:
+            name (str): The name of the contact.
+
+        Raises:
+            KeyError: If there is no record with this name.
+        """
+        name = self._resolve(name)
+        contact_id = self._contact_id(name)
+        if contact_id is None:
+            raise KeyError(name)
+        self._write(_DELETE_PHONES, (contact_id,))
+        self._write(_DELETE_CONTACT, (contact_id,))
+        self._unindex_name(name)
+
+    def __contains__(self, name: object) -> bool:
+        """
+        Checks whether a contact is in the address book.
+
+        Args:
+            name (object): The name of the contact.
+
+        Returns:
+            bool: True if the contact is in the address book, otherwise False.
+        """
+        return isinstance(name, str) and self._contact_id(self._resolve(name)) is not None
+
+    def __len__(self) -> int:
+        """
+        Returns the number of contacts in the address book.
+
+        Returns:
+            int: The number of contacts.
+        """
+        return self._db.execute(_COUNT).fetchone()[0]
+
+    def __iter__(self) -> Iterator[str]:
+        """
+        Iterates over the names of all contacts in the order they were added.
+
+        Returns:
+            Iterator[str]: The names of the contacts.
+        """
+        for (name,) in self._db.execute(_NAMES):
+            yield name
+
+    def values(self) -> Iterator[Record]:
+        """
+        Iterates over all records in the order they were added, streaming them from
+        the database.
+
+        Returns:
+            Iterator[Record]: The records of the contacts.
+        """
+        return self._stream(_CONTACTS, ())
+
+    def records_after(self, name: Optional[str] = None) -> Iterator[Record]:
+        """
+        Iterates over the records in alphabetical order of their names, starting right
+        after a name, using the unique index on the names.
+
+        Args:
+            name (str | None): The name of the last record already listed, or None to
+            start from the first record.
+
+        Returns:
+            Iterator[Record]: The records whose names sort after the name.
+        """
+        return self._stream(_CONTACTS_AFTER, ("" if name is None else name,))
+
+    def range(self, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[Record]:
+        """
+        Iterates in alphabetical order over the records whose names lie between two
+        bounds, both included, using the unique index on the names.
+
+        Args:
+            start (str | None): The first name of the range, or None for no lower bound.
+            end (str | None): The last name of the range, or None for no upper bound.
+
+        Returns:
+            Iterator[Record]: The records in the range.
+        """
+        if end is None:
+            return self._stream(_CONTACTS_FROM, ("" if start is None else start,))
+        return self._stream(_CONTACTS_BETWEEN, ("" if start is None else start, end))
+
+    def names_with_prefix(self, prefix: str) -> Iterator[str]:
+        """
+        Iterates in alphabetical order over the contact names starting with a prefix,
+        seeking to the first one with the unique index on the names.
+
+        Args:
+            prefix (str): The beginning of the names.
+
+        Returns:
+            Iterator[str]: The matching names.
+        """
+        for (name,) in self._db.execute(_NAMES_FROM, (prefix,)):
+            if not name.startswith(prefix):
+                break
+            yield name
+
+    def _records(self, names: Iterable[str]) -> Iterator[Record]:
+        """
+        Looks up the records of a stream of names for a listing.
+
+        Args:
+            names (Iterable[str]): The names of the contacts.
+
+        Returns:
+            Iterator[Record]: The records of the names that are stored.
+        """
+        for name in names:
+            record = self.find(name)
+            if record is not None:
+                yield record
+
+    def _phones_between(self, low: int, high: int) -> Iterator[Tuple[str, Record]]:
+        """
+        Iterates over the phone numbers between two integers and the records owning them,
+        seeking to the first one with the index on the phone numbers.
+
+        Args:
+            low (int): The smallest phone number, as an integer.
+            high (int): The largest phone number, as an integer.
+
+        Returns:
+            Iterator[tuple[str, Record]]: The phone number and owner of every match.
+        """
+        rows = self._db.execute(_PHONES_BETWEEN, (f"{low:010d}", f"{high:010d}"))
+        for phone, name in rows:
+            yield phone, self.find(name)
+
+    def _stream(self, sql: str, parameters: tuple) -> Iterator[Record]:
+        """
+        Streams the records selected by a query returning a name and a phone per row,
+        grouped by contact.
+
+        Args:
+            sql (str): The query.
+            parameters (tuple): The query parameters.
+
+        Returns:
+            Iterator[Record]: The records of the contacts.
+        """
+        rows = self._db.execute(sql, parameters)
+        for name, group in groupby(rows, key=lambda row: row[0]):
+            yield self._materialize(name, [phone for _, phone in group if phone is not None])
+
+    def items(self) -> Iterator:
+        """
+        Iterates over the names and records of all contacts.
+
+        Returns:
+            Iterator[tuple[str, Record]]: The name and record of every contact.
+        """
+        for record in self.values():
+            yield record.name.value, record
+
+    def _on_phone_added(self, record: Record, phone_number: str) -> None:
+        """
+        Stores a phone number added to one of the records.
+        """
+        self._write(_INSERT_PHONE, (phone_number, record.name.value))
+
+    def _on_phone_removed(self, record: Record, phone_number: str) -> None:
+        """
+        Deletes a phone number removed from one of the records.
+        """
+        self._write(_DELETE_PHONE, (record.name.value, phone_number))
+
+    def _on_phone_replaced(self, record: Record, old_phone_number: str,
+                           new_phone_number: str) -> None:
+        """
+        Updates a phone number edited in place in one of the records, keeping its position.
+        """
+        self._write(_REPLACE_PHONE, (new_phone_number, record.name.value, old_phone_number))
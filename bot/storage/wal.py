@@ -0,0 +1,332 @@
+"""
+This module defines the WriteAheadLog class, an append-only log of address book mutations.
+
+Classes:
+- WriteAheadLog: Appends encoded mutations to a file and syncs them to disk according
+to an fsync policy.
+
+Functions:
+- read_log(path: str) -> Iterator[tuple]: Reads the mutations stored in a log file.
+- check_field(field: str) -> None: Checks that a string fits in a log entry.
+
+Format:
+- Every entry is a header of a CRC32 checksum and a payload length, followed by the
+payload: one operation byte and the operation's string fields, each prefixed by its
+length. A torn or corrupted tail (for example after a crash) ends the replay.
+- A payload holds at most MAX_PAYLOAD bytes, so a single field at most MAX_FIELD_BYTES,
+leaving room for the other fields of the largest entry.
+- A log that was truncated after a snapshot starts with a checkpoint entry naming the
+snapshot generation it continues.
+
+Fsync policies:
+- 'always': every mutation is written and fsynced before `append` returns.
+- 'batch': mutations are buffered and a background thread writes and fsyncs them as a
+group once `batch_size` entries are pending or every `batch_interval` seconds
+(group commit). At most one batch of mutations is lost on power failure. If a group
+commit fails (e.g. the disk is full), the error is raised by the next `append` or by
+`close`, and the log accepts no more mutations.
+- 'never': mutations are buffered and written when the buffer fills up, leaving the
+fsync to the operating system.
+
+Example:
+    log = WriteAheadLog("book.wal", fsync="batch")
+    log.append(OP_ADD_RECORD, "John")
+    log.append(OP_ADD_PHONE, "John", "0501234567")
+    log.close()
+    list(read_log("book.wal"))  # [(1, 'John'), (3, 'John', '0501234567')]
+"""
+
+import os
+import struct
+import threading
+import zlib
+from typing import Iterator, List, Optional, Tuple
+
+OP_CHECKPOINT = 0
+OP_ADD_RECORD = 1
+OP_DELETE_RECORD = 2
+OP_ADD_PHONE = 3
+OP_REMOVE_PHONE = 4
+OP_EDIT_PHONE = 5
+
+FSYNC_POLICIES = ("always", "batch", "never")
+
+_HEADER = struct.Struct("<IH")
+_FIELD_LENGTH = struct.Struct("<H")
+_BUFFER_LIMIT = 1 << 16
+
+MAX_PAYLOAD = (1 << 16) - 1
+MAX_FIELD_BYTES = MAX_PAYLOAD - 64
+
+def check_field(field: str) -> None:
+    """
+    Checks that a string fits in a log entry, so that a mutation can be rejected before
+    it is applied.
+
+    Args:
+        field (str): The string.
+
+    Raises:
+        ValueError: If the string is longer than MAX_FIELD_BYTES bytes in UTF-8.
+    """
+    size = len(field.encode("utf-8"))
+    if size > MAX_FIELD_BYTES:
+        raise ValueError(f"The log stores at most {MAX_FIELD_BYTES} bytes per field, "
+                         f"got {size}")
+
+def encode_entry(op: int, *fields: str) -> bytes:
+    """
+    Encodes a mutation as a log entry.
+
+    Args:
+        op (int): The operation code.
+        *fields (str): The string fields of the operation.
+
+    Returns:
+        bytes: The encoded entry, including its header.
+
+    Raises:
+        ValueError: If the payload is longer than MAX_PAYLOAD bytes.
+    """
+    payload = bytearray((op,))
+    for field in fields:
+        data = field.encode("utf-8")
+        if len(data) > MAX_PAYLOAD:
+            raise ValueError(f"A log entry holds at most {MAX_PAYLOAD} bytes, "
+                             f"got a field of {len(data)}")
+        payload += _FIELD_LENGTH.pack(len(data))
+        payload += data
+    if len(payload) > MAX_PAYLOAD:
+        raise ValueError(f"A log entry holds at most {MAX_PAYLOAD} bytes, got {len(payload)}")
+    return _HEADER.pack(zlib.crc32(payload), len(payload)) + payload
+
+def _decode_payload(payload: bytes) -> Tuple:
+    """
+    Decodes the payload of a log entry.
+
+    Args:
+        payload (bytes): The payload following the entry header.
+
+    Returns:
+        tuple: The operation code followed by its string fields.
+    """
+    fields: List = [payload[0]]
+    offset = 1
+    while offset < len(payload):
+        (length,) = _FIELD_LENGTH.unpack_from(payload, offset)
+        offset += _FIELD_LENGTH.size
+        fields.append(payload[offset:offset + length].decode("utf-8"))
+        offset += length
+    return tuple(fields)
+
+def _scan(path: str) -> Iterator[Tuple[int, Tuple]]:
+    """
+    Yields the end offset and decoded fields of every intact entry in a log file.
+
+    Args:
+        path (str): The path of the log file.
+
+    Returns:
+        Iterator[tuple]: Pairs of the entry end offset and the decoded entry.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as file:
+        data = file.read()
+    offset = 0
+    while offset + _HEADER.size <= len(data):
+        checksum, length = _HEADER.unpack_from(data, offset)
+        start = offset + _HEADER.size
+        payload = data[start:start + length]
+        if length == 0 or len(payload) != length or zlib.crc32(payload) != checksum:
+            return
+        offset = start + length
+        yield offset, _decode_payload(payload)
+
+def read_log(path: str) -> Iterator[Tuple]:
+    """
+    Reads the mutations stored in a log file, stopping at a torn or corrupted tail.
+
+    Args:
+        path (str): The path of the log file.
+
+    Returns:
+        Iterator[tuple]: The operation code and string fields of every intact entry.
+    """
+    for _, entry in _scan(path):
+        yield entry
+
+class WriteAheadLog:
+    """
+    An append-only log of address book mutations with a configurable fsync policy.
+
+    Attributes:
+        path (str): The path of the log file.
+        fsync (str): The fsync policy, one of 'always', 'batch' or 'never'.
+        size (int): The size of the log in bytes, including buffered entries.
+
+    Methods:
+        append(op: int, *fields: str) -> None:
+            Appends a mutation to the log, raising the error of a failed group commit.
+
+        sync() -> None:
+            Writes all buffered entries and fsyncs the log file.
+
+        truncate() -> None:
+            Discards every entry of the log.
+
+        close() -> None:
+            Syncs and closes the log file.
+    """
+
+    def __init__(self, path: str, fsync: str = "batch", batch_size: int = 1024,
+                 batch_interval: float = 0.05) -> None:
+        """
+        Opens a log file for appending, cutting off a torn tail left by a crash.
+
+        Args:
+            path (str): The path of the log file.
+            fsync (str): The fsync policy, one of 'always', 'batch' or 'never'.
+            batch_size (int): The number of pending entries that triggers a group commit.
+            batch_interval (float): The maximum delay in seconds before a group commit.
+
+        Raises:
+            ValueError: If the fsync policy is unknown.
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        self.path = path
+        self.fsync = fsync
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+
+        end = 0
+        for end, _ in _scan(path):
+            pass
+        self._file = open(path, "ab")
+        if self._file.tell() != end:
+            self._file.truncate(end)
+        self.size = end
+
+        self._buffer = bytearray()
+        self._pending = 0
+        self._unsynced = False
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._closed = False
+        self._flusher = None
+        self._flush_error: Optional[BaseException] = None
+        if fsync == "batch":
+            self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+            self._flusher.start()
+
+    def append(self, op: int, *fields: str) -> None:
+        """
+        Appends a mutation to the log.
+
+        Args:
+            op (int): The operation code.
+            *fields (str): The string fields of the operation.
+
+        Raises:
+            ValueError: If the entry is too large.
+            OSError: If a background group commit failed.
+        """
+        entry = encode_entry(op, *fields)
+        with self._lock:
+            if self._flush_error is not None:
+                raise self._flush_error
+            self._buffer += entry
+            self._pending += 1
+            self.size += len(entry)
+            if self.fsync == "batch":
+                if self._pending >= self.batch_size:
+                    self._wakeup.notify()
+                return
+            if self.fsync == "never" and len(self._buffer) < _BUFFER_LIMIT:
+                return
+        self._drain(self.fsync == "always")
+
+    def sync(self) -> None:
+        """
+        Writes all buffered entries and fsyncs the log file.
+        """
+        self._drain(True)
+
+    def truncate(self) -> None:
+        """
+        Discards every entry of the log, including buffered ones, once the state they
+        describe has been saved elsewhere.
+        """
+        with self._io_lock:
+            with self._lock:
+                self._buffer.clear()
+                self._pending = 0
+                self.size = 0
+            self._file.truncate(0)
+            os.fsync(self._file.fileno())
+            self._unsynced = False
+
+    def close(self) -> None:
+        """
+        Syncs and closes the log file.
+
+        Raises:
+            OSError: If a background group commit failed; the entries it did not
+            commit are lost.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._wakeup.notify()
+        if self._flusher is not None:
+            self._flusher.join()
+        try:
+            if self._flush_error is not None:
+                raise self._flush_error
+            self._drain(True)
+        finally:
+            self._file.close()
+
+    def _drain(self, durable: bool) -> None:
+        """
+        Writes the buffered entries to the log file and optionally fsyncs it.
+
+        Appends made while another thread is writing or fsyncing go into the buffer and
+        are committed together by the next drain.
+
+        Args:
+            durable (bool): Whether to fsync the file after writing.
+        """
+        with self._io_lock:
+            with self._lock:
+                data = bytes(self._buffer)
+                self._buffer.clear()
+                self._pending = 0
+            if data:
+                self._file.write(data)
+                self._file.flush()
+                self._unsynced = True
+            if durable and self._unsynced:
+                os.fsync(self._file.fileno())
+                self._unsynced = False
+
+    def _flush_loop(self) -> None:
+        """
+        Group-commits the buffered entries until the log is closed or a commit fails,
+        keeping the error for `append` and `close` to raise.
+        """
+        while True:
+            with self._lock:
+                if self._closed:
+                    return
+                if self._pending < self.batch_size:
+                    self._wakeup.wait(self.batch_interval)
+            try:
+                self._drain(True)
+            except OSError as error:
+                with self._lock:
+                    self._flush_error = error
+                return
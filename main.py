@@ -4,20 +4,52 @@ This module provides the main function to run an assistant bot for managing cont
 The assistant bot supports the following commands:
 - 'close' or 'exit': Exit the program.
 - 'hello': Greet the user.
+- 'help': Display the commands, or how to use one of them.
 - 'add': Add a new contact.
 - 'change': Update an existing contact.
+- 'delete': Delete a contact.
 - 'phone': Display a contact's phone number.
-- 'all': Display all contacts.
+- 'all': Display all contacts in alphabetical order, optionally one page at a time.
+- 'range': Display the contacts whose names lie between two names.
+- 'search': Display the first contacts whose names start with a prefix.
+- 'fuzzy': Display the contacts whose names are spelled similarly to a given name.
+- 'sounds': Display the contacts whose names sound like a given name, in any script.
+- 'who': Display the contacts owning a phone number.
+- 'prefix': Display the phone numbers starting with some digits, or in a range.
+- 'compact': Snapshot the persistent address book and truncate its log.
+- 'import': Import contacts from a CSV file.
+- 'export': Export all contacts to a JSON Lines file.
+- 'import-jsonl': Import contacts from a JSON Lines file.
 
 Imports:
-- List from typing: Used for type annotations.
-- handlers from bot.cli: Contains functions to handle various contact management commands.
+- argparse: Used to parse the command-line options.
+- asyncio: Used to run the command server.
+- sys: Used to report to standard error and exit in batch mode.
+- Callable, List, Optional from typing: Used for type annotations.
+- install_completion from bot.cli: Enables tab-completion of commands and names.
+- REGISTRY, CommandRegistry from bot.cli.commands: The table of commands, mapping every
+command name to its handler.
+- open_output, open_script, run_batch from bot.cli.batch: Run a script of commands
+with buffered output.
+- CommandServer, parse_address from bot.server: Serve the commands over TCP or Unix
+sockets.
+- make_http_server from bot.server: Serves the contacts as an HTTP/JSON API.
 - AddressBook from bot.models: Represents a collection of contact records.
 - parse_input from bot.cli.parse_input: Parses user input into commands and arguments.
+- PersistentAddressBook, SQLiteAddressBook, FSYNC_POLICIES from bot.storage: The
+write-ahead-logged and SQLite-backed address books and the log fsync policies.
+- MAGIC from bot.storage.snapshot: The current snapshot format, named when an older
+snapshot is upgraded.
 
 Functions:
-- main: The entry point of the assistant bot, which continuously prompts the user
-for commands and processes them accordingly.
+- parse_args: Parses the command-line options.
+- open_address_book: Creates the address book selected by the command-line options.
+- main: The entry point of the assistant bot, which opens the address book and runs
+the command loop.
+- run_script: Runs the commands of a script without prompting.
+- run_server: Serves the commands, except those using files, to many clients over a socket.
+- run_http: Serves the contacts as an HTTP/JSON API.
+- run: Continuously prompts the user for commands and processes them accordingly.
 
 Usage:
 - Run the module as a script to start the assistant bot.
@@ -26,6 +58,20 @@ Usage:
 Example:
     Run the script:
         $ python module_name.py
+    Keep the contacts between runs in a write-ahead log:
+        $ python module_name.py --wal contacts.wal --fsync batch
+    Keep the contacts in a SQLite database:
+        $ python module_name.py --sqlite contacts.db
+    Run the commands of a script, writing only their results:
+        $ python module_name.py --batch commands.txt
+        $ generate_commands | python module_name.py --wal contacts.wal --batch -
+    Share one address book between many clients over TCP or a Unix socket:
+        $ python module_name.py --wal contacts.wal --serve 127.0.0.1:8765
+        $ python module_name.py --serve unix:/tmp/bot.sock
+    Serve the contacts as an HTTP/JSON API on 16 worker threads:
+        $ python module_name.py --sqlite contacts.db --http 127.0.0.1:8080 --workers 16
+    Match names ignoring letter case and accent encoding ("olena" finds "Olena"):
+        $ python module_name.py --normalize-names
     Interact with the bot using the supported commands.
 
 Main Function:
@@ -39,33 +85,234 @@ The above block ensures that the main function runs only when the module is exec
 as a script, not when it is imported as a module.
 """
 
-from typing import List
+import argparse
+import asyncio
+import sys
+from typing import Callable, List, Optional
 
-from bot.cli import handlers
+from bot.cli import install_completion
+from bot.cli.commands import REGISTRY, CommandRegistry
+from bot.cli.batch import open_output, open_script, run_batch
+from bot.server import CommandServer, make_http_server, parse_address
 from bot.models import AddressBook
 from bot.cli.parse_input import parse_input
+from bot.storage import PersistentAddressBook, SQLiteAddressBook, FSYNC_POLICIES
+from bot.storage.snapshot import MAGIC
 
-def main() -> None:
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parses the command-line options of the assistant bot.
+
+    Args:
+    argv (list[str] | None): The command-line arguments, defaults to sys.argv.
+
+    Returns:
+    argparse.Namespace: The parsed options.
+    """
+    parser = argparse.ArgumentParser(description="Assistant bot for managing contacts.")
+    storage = parser.add_mutually_exclusive_group()
+    storage.add_argument("--wal", metavar="PATH",
+                         help="keep the contacts in a write-ahead log at PATH")
+    storage.add_argument("--sqlite", metavar="PATH",
+                         help="keep the contacts in a SQLite database at PATH")
+    parser.add_argument("--fsync", choices=FSYNC_POLICIES, default="batch",
+                        help="when to fsync the write-ahead log (default: batch)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--batch", metavar="FILE",
+                      help="run the commands in FILE ('-' for standard input) "
+                           "without prompting")
+    mode.add_argument("--serve", metavar="ADDRESS",
+                      help="serve the commands over TCP (HOST:PORT) or a Unix socket "
+                           "(unix:PATH), without the commands reading or writing files")
+    mode.add_argument("--http", metavar="HOST:PORT",
+                      help="serve the contacts as an HTTP/JSON API")
+    parser.add_argument("--workers", type=int, default=16,
+                        help="the number of HTTP worker threads (default: 16)")
+    parser.add_argument("--normalize-names", action="store_true",
+                        help="match contact names ignoring letter case and accent encoding")
+    return parser.parse_args(argv)
+
+def open_address_book(options: argparse.Namespace,
+                      report: Callable[[str], None] = print) -> AddressBook:
+    """
+    Creates the address book selected by the command-line options.
+
+    Args:
+    options (argparse.Namespace): The parsed command-line options.
+    report (Callable[[str], None]): Receives the loading statistics of a persistent
+    address book.
+
+    Returns:
+    AddressBook: An in-memory, write-ahead-logged or SQLite-backed address book.
+    """
+    if options.sqlite:
+        return SQLiteAddressBook(options.sqlite, normalize_names=options.normalize_names)
+
+    if not options.wal:
+        return AddressBook(normalize_names=options.normalize_names)
+
+    address_book = PersistentAddressBook(options.wal, fsync=options.fsync,
+                                         normalize_names=options.normalize_names)
+    if address_book.upgraded_from is not None:
+        report(f"Upgraded the snapshot {address_book.snapshot_path} from format "
+               f"{address_book.upgraded_from} to {MAGIC.decode()}.")
+    report(f"Mapped {address_book.loaded} contacts from the snapshot "
+          f"in {address_book.load_seconds * 1000:.1f} ms, replayed {address_book.replayed} "
+          f"changes from {options.wal} in {address_book.replay_seconds * 1000:.1f} ms.")
+    return address_book
+
+def main(argv: Optional[List[str]] = None) -> None:
     """
     Runs the assistant bot for managing contacts.
 
     The function continuously prompts the user for commands and processes them accordingly:
     - 'close' or 'exit' to exit the program
     - 'hello' to greet the user
+    - 'help' to display the commands, or how to use one of them
     - 'add' to add a contact
     - 'change' to update a contact
+    - 'delete' to delete a contact
     - 'phone' to display a contact's phone number
-    - 'all' to display all contacts
+    - 'all' to display all contacts in alphabetical order, optionally one page at a time
+    - 'range' to display the contacts whose names lie between two names
+    - 'search' to display the first contacts whose names start with a prefix
+    - 'fuzzy' to display the contacts whose names are spelled similarly to a given name
+    - 'sounds' to display the contacts whose names sound like a given name
+    - 'who' to display the contacts owning a phone number
+    - 'prefix' to display the phone numbers starting with some digits, or in a range
+    - 'compact' to snapshot the persistent address book and truncate its log
+    - 'import' to import contacts from a CSV file
+    - 'export' to export all contacts to a JSON Lines file
+    - 'import-jsonl' to import contacts from a JSON Lines file
 
-    Uses handlers from the 'handlers' module for contact management.
+    Commands are dispatched through the command registry (see bot.cli.commands), so
+    commands registered there by other modules are available too. Commands and
+    contact names can be completed with the Tab key where readline is available.
+
+    Args:
+    argv (list[str] | None): The command-line arguments, defaults to sys.argv.
 
     Returns:
     None
     """
-    address_book = AddressBook()
+    options = parse_args(argv)
+    if options.batch is not None:
+        run_script(options)
+        return
+    if options.serve is not None:
+        run_server(options)
+        return
+    if options.http is not None:
+        run_http(options)
+        return
+
+    address_book = open_address_book(options)
 
+    install_completion(address_book, list(REGISTRY))
     print("Welcome to the assistant bot!")
 
+    try:
+        run(address_book)
+    finally:
+        address_book.close()
+
+def run_script(options: argparse.Namespace) -> None:
+    """
+    Runs the commands of the script given with --batch and writes their results to
+    standard output through one buffered writer. Loading statistics go to standard
+    error, so the output holds only the results.
+
+    Args:
+    options (argparse.Namespace): The parsed command-line options.
+
+    Returns:
+    None
+    """
+    def report(message: str) -> None:
+        print(message, file=sys.stderr)
+
+    try:
+        script = open_script(options.batch)
+    except OSError as error:
+        sys.exit(f"Cannot read the script {options.batch}: {error.strerror}")
+
+    address_book = open_address_book(options, report)
+    try:
+        with script, open_output() as output:
+            run_batch(script, address_book, output)
+    finally:
+        address_book.close()
+
+def run_server(options: argparse.Namespace) -> None:
+    """
+    Serves the commands over the address given with --serve until interrupted.
+
+    Args:
+    options (argparse.Namespace): The parsed command-line options.
+
+    Returns:
+    None
+    """
+    try:
+        parse_address(options.serve)
+    except ValueError as error:
+        sys.exit(str(error))
+
+    address_book = open_address_book(options)
+    server = CommandServer(address_book)
+    print(f"Serving the assistant bot on {options.serve}, press Ctrl+C to stop.")
+    try:
+        asyncio.run(server.serve(options.serve))
+    except KeyboardInterrupt:
+        print("Good bye!")
+    except OSError as error:
+        sys.exit(f"Cannot serve on {options.serve}: {error.strerror}")
+    finally:
+        address_book.close()
+
+def run_http(options: argparse.Namespace) -> None:
+    """
+    Serves the contacts as an HTTP/JSON API on the address given with --http until
+    interrupted, handling the connections on --workers threads.
+
+    Args:
+    options (argparse.Namespace): The parsed command-line options.
+
+    Returns:
+    None
+    """
+    host, _, port = options.http.rpartition(":")
+    if not host or not port.isdigit():
+        sys.exit(f"Invalid address {options.http}: expected HOST:PORT")
+    if options.workers < 1:
+        sys.exit("The number of workers must be at least 1.")
+
+    address_book = open_address_book(options)
+    try:
+        server = make_http_server(address_book, host.strip("[]"), int(port), options.workers)
+    except OSError as error:
+        address_book.close()
+        sys.exit(f"Cannot serve on {options.http}: {error.strerror}")
+    print(f"Serving the contacts API on http://{options.http}, press Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Good bye!")
+    finally:
+        server.server_close()
+        address_book.close()
+
+def run(address_book: AddressBook, registry: CommandRegistry = REGISTRY) -> None:
+    """
+    Prompts the user for commands and processes them until 'close' or 'exit' is entered.
+
+    Args:
+    address_book (AddressBook): The address book the commands operate on.
+    registry (CommandRegistry): The commands, REGISTRY by default.
+
+    Returns:
+    None
+    """
     while True:
         user_input: str = input("Enter a command: ")
 
@@ -76,27 +323,12 @@ def main() -> None:
         args: List[str]
         command, *args = parse_input(user_input)
 
-        if command in ["close", "exit"]:
-            print("Good bye!")
-            break
+        for chunk in registry.dispatch(command, args, address_book, progress=print):
+            print(chunk)
 
-        if command == "hello":
-            print("How can I help you?")
-
-        elif command == "add":
-            print(handlers.add_contact(args, address_book))
-
-        elif command == "change":
-            print(handlers.change_contact(args, address_book))
-
-        elif command == "phone":
-            print(handlers.show_phone(args, address_book))
-
-        elif command == "all":
-            print(handlers.show_all(address_book))
-
-        else:
-            print("Invalid command.")
+        found = registry.get(command)
+        if found is not None and found.exits:
+            break
 
 if __name__ == "__main__":
     main()
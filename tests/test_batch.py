@@ -0,0 +1,55 @@
+"""
+Tests of running a script of commands in batch mode.
+"""
+
+import io
+import subprocess
+import sys
+from pathlib import Path
+
+from bot.cli.batch import run_batch
+from bot.models import AddressBook
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCRIPT = """\
+# provisioning
+add John 0501234567
+
+add Jane 0671234567
+phone John
+nope
+exit
+add Late 0931234567
+"""
+
+def test_run_batch_writes_every_result():
+    book = AddressBook()
+    output = io.StringIO()
+    assert run_batch(io.StringIO(SCRIPT), book, output) == 5
+    assert output.getvalue().splitlines() == [
+        "Contact added.",
+        "Contact added.",
+        "Contact name: John, phones: 0501234567",
+        "Invalid command.",
+        "Good bye!",
+    ]
+    assert "Late" not in book
+
+def test_progress_goes_to_the_output(tmp_path):
+    csv_path = tmp_path / "contacts.csv"
+    csv_path.write_text("name,phone\nJohn,0501234567\n", encoding="utf-8")
+    output = io.StringIO()
+    run_batch([f"import {csv_path}"], AddressBook(), output)
+    assert output.getvalue().splitlines()[-1].startswith("Imported 1 ")
+
+def test_batch_option_runs_a_script_from_stdin(tmp_path):
+    wal = str(tmp_path / "book.wal")
+    result = subprocess.run(
+        [sys.executable, "main.py", "--wal", wal, "--batch", "-"], cwd=ROOT,
+        input="add John 0501234567\nphone John\n", capture_output=True, text=True,
+        check=True)
+    assert result.stdout.splitlines() == [
+        "Contact added.", "Contact name: John, phones: 0501234567"
+    ]
+    assert result.stderr.startswith("Mapped 0 contacts")
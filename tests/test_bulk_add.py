@@ -0,0 +1,51 @@
+"""
+Tests of bulk loading contacts into an address book.
+"""
+
+from bot.models import AddressBook, Record
+from bot.storage import PersistentAddressBook
+
+ROWS = [
+    ("John", ["0501234567", "bad"]),
+    ("Jane", ["0671234567"]),
+    ("John", ["0931234567", "0501234567"]),
+    ("", ["0990000000"]),
+    ("Olga", ["123"]),
+    ("Olena", ["0501234567"]),
+]
+
+def phones(book, name):
+    return [phone.value for phone in book.find(name).phones]
+
+def test_bulk_add_merges_rows_and_reports_rejects():
+    book = AddressBook()
+    existing = Record("Olena")
+    existing.add_phone("0000000001")
+    book.add_record(existing)
+
+    rejected = book.bulk_add(ROWS)
+    assert rejected == [("John", "bad"), ("", "0990000000"), ("Olga", "123")]
+    assert sorted(book) == ["Jane", "John", "Olena"]
+    assert phones(book, "John") == ["0501234567", "0931234567"]
+    assert book.find("Olena") is existing
+    assert phones(book, "Olena") == ["0000000001", "0501234567"]
+    assert sorted(r.name.value for r in book.find_by_phone("0501234567")) == [
+        "John", "Olena",
+    ]
+
+def test_bulk_add_is_logged(tmp_path):
+    path = str(tmp_path / "book.wal")
+    book = PersistentAddressBook(path, fsync="never", compact_threshold=None)
+    book.bulk_add(ROWS)
+    book.close()
+
+    book = PersistentAddressBook(path, compact_threshold=None)
+    assert sorted(book) == ["Jane", "John", "Olena"]
+    assert phones(book, "John") == ["0501234567", "0931234567"]
+    book.close()
+
+def test_phone_column_merges_into_existing_records():
+    book = AddressBook()
+    book.add_record(Record("John"))
+    assert book.add_phone_column(["John", "John"], ["0501234567", "0501234567"]) == []
+    assert phones(book, "John") == ["0501234567"]
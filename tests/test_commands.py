@@ -0,0 +1,59 @@
+"""
+Tests of the command registry.
+"""
+
+from bot.cli.commands import REGISTRY, Command, CommandRegistry, build_registry
+from bot.models import AddressBook
+
+def run(registry, line, book):
+    name, *args = line.split()
+    return list(registry.dispatch(name, args, book))
+
+def test_builtin_commands():
+    book = AddressBook()
+    assert run(REGISTRY, "add John 0501234567", book) == ["Contact added."]
+    assert run(REGISTRY, "phone John", book) == ["Contact name: John, phones: 0501234567"]
+    assert run(REGISTRY, "all", book) == ["Contact name: John, phones: 0501234567"]
+    assert run(REGISTRY, "hello", book) == ["How can I help you?"]
+    assert REGISTRY.get("exit").exits and not REGISTRY.get("add").exits
+    assert "import" in REGISTRY and "nope" not in REGISTRY
+    assert list(REGISTRY)[:3] == ["close", "exit", "hello"]
+
+def test_unknown_commands_and_argument_counts():
+    book = AddressBook()
+    assert run(REGISTRY, "nope", book) == ["Invalid command."]
+    assert run(REGISTRY, "add John", book) == [
+        "Invalid number of arguments. Usage: add <name> <phone>"
+    ]
+    assert run(REGISTRY, "phone John Jane", book) == [
+        "Invalid number of arguments. Usage: phone <name>"
+    ]
+
+def test_help():
+    assert REGISTRY.help("phone") == "phone <name>\n  Display a contact's phone numbers."
+    assert REGISTRY.help("nope") == "No command nope."
+    assert len(REGISTRY.help().splitlines()) == len(REGISTRY)
+
+def test_registering_extra_commands():
+    registry = build_registry()
+
+    @registry.command("count", 0, 0, description="Display the number of contacts.")
+    def count(args, address_book):
+        return f"{len(address_book)} contacts."
+
+    assert run(registry, "count", AddressBook()) == ["0 contacts."]
+    assert registry.get("count").usage == "count"
+    assert "count" not in REGISTRY
+
+    registry.register(Command("hello", lambda args, book: "Hi!"))
+    assert run(registry, "hello", AddressBook()) == ["Hi!"]
+
+def test_progress_is_passed_only_to_commands_that_report_it():
+    registry = CommandRegistry()
+    calls = []
+    registry.register(Command("slow", lambda args, book, progress: progress("half") or "done",
+                              progress=True))
+    registry.register(Command("fast", lambda args, book: "done"))
+    assert list(registry.dispatch("fast", [], AddressBook(), calls.append)) == ["done"]
+    assert list(registry.dispatch("slow", [], AddressBook(), calls.append)) == ["done"]
+    assert calls == ["half"]
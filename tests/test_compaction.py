@@ -0,0 +1,116 @@
+"""
+Tests of snapshots and log compaction in PersistentAddressBook.
+"""
+
+import os
+
+from bot.cli.handlers import compact_book
+from bot.models import AddressBook, Record
+from bot.storage import PersistentAddressBook, read_log
+from bot.storage.wal import OP_ADD_RECORD, OP_CHECKPOINT
+
+CONTACTS = {"John": ["0501234567", "0671234567"], "Олена": ["0931234567"], "Jane": []}
+
+def fill(book):
+    for name, phones in CONTACTS.items():
+        record = Record(name)
+        for phone in phones:
+            record.add_phone(phone)
+        book.add_record(record)
+
+def contents(book):
+    return {name: [phone.value for phone in record.phones] for name, record in book.items()}
+
+def test_compact_truncates_the_log(tmp_path):
+    path = str(tmp_path / "book.wal")
+    book = PersistentAddressBook(path, fsync="always", compact_threshold=None)
+    fill(book)
+    size, _ = book.compact()
+    assert size == os.path.getsize(book.snapshot_path)
+    assert book.generation == 1
+    assert list(read_log(path)) == [(OP_CHECKPOINT, "1")]
+    book.find("John").remove_phone("0671234567")
+    book.close()
+
+    book = PersistentAddressBook(path, compact_threshold=None)
+    assert book.loaded == 3
+    assert book.replayed == 1
+    assert contents(book) == {**CONTACTS, "John": ["0501234567"]}
+    assert book.find_by_phone("0931234567") == [book.find("Олена")]
+    book.close()
+
+def test_threshold_triggers_compaction(tmp_path):
+    path = str(tmp_path / "book.wal")
+    book = PersistentAddressBook(path, fsync="never", compact_threshold=256)
+    for i in range(50):
+        record = Record(f"Contact {i}")
+        record.add_phone(f"05000000{i:02d}")
+        book.add_record(record)
+    assert book.generation > 0
+    assert os.path.getsize(path) < 256 + 64
+    book.close()
+
+    book = PersistentAddressBook(path, compact_threshold=None)
+    assert len(book) == 50
+    assert str(book.find("Contact 7")) == "Contact name: Contact 7, phones: 0500000007"
+    book.close()
+
+def test_log_of_an_older_generation_is_not_replayed(tmp_path):
+    path = str(tmp_path / "book.wal")
+    book = PersistentAddressBook(path, fsync="always", compact_threshold=None)
+    fill(book)
+    book.close()
+    with open(path, "rb") as file:
+        old_log = file.read()
+
+    book = PersistentAddressBook(path, fsync="always", compact_threshold=None)
+    book.compact()
+    book.close()
+    # A crash between writing the snapshot and truncating the log leaves the old log.
+    with open(path, "wb") as file:
+        file.write(old_log)
+
+    book = PersistentAddressBook(path, compact_threshold=None)
+    assert book.replayed == 0
+    assert contents(book) == CONTACTS
+    book.add_record(Record("Olga"))
+    book.close()
+    assert list(read_log(path)) == [(OP_CHECKPOINT, "1"), (OP_ADD_RECORD, "Olga")]
+
+def test_compact_command(tmp_path):
+    assert compact_book(AddressBook()).startswith("Nothing to compact")
+    book = PersistentAddressBook(str(tmp_path / "book.wal"), compact_threshold=None)
+    fill(book)
+    assert compact_book(book).startswith("Snapshot of 3 contacts")
+    book.close()
+
+def test_replacing_a_record_compacts_once_it_is_stored(tmp_path, monkeypatch):
+    path = str(tmp_path / "book.wal")
+    book = PersistentAddressBook(path, fsync="always", compact_threshold=1)
+    saved = []
+    compact = book.compact
+
+    def checked_compact():
+        assert all(record.book is book for record in book.data.values())
+        saved.append(contents(book))
+        return compact()
+
+    monkeypatch.setattr(book, "compact", checked_compact)
+    record = Record("A")
+    record.add_phone("0501234567")
+    book.add_record(record)
+    book.add_record(Record("A"))
+    assert saved[-1] == {"A": []}
+    book.delete("A")
+    assert saved[-1] == {}
+    book.close()
+
+    book = PersistentAddressBook(path, compact_threshold=1)
+    assert len(book) == 0
+    book.add_record(Record("A"))
+    book.add_record(Record("A"))
+    book.close()
+    book = PersistentAddressBook(path)
+    assert contents(book) == {"A": []}
+    assert book.find_by_phone("0501234567") == []
+    book.close()
@@ -0,0 +1,52 @@
+"""
+Tests of streaming CSV imports.
+"""
+
+from bot.cli.handlers import import_contacts
+from bot.models import AddressBook
+from bot.storage import ImportStats, import_csv
+
+def write(tmp_path, text):
+    path = tmp_path / "contacts.csv"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+def test_import_merges_rows_and_counts_rejects(tmp_path):
+    path = write(tmp_path, "﻿Name,Phone\n"
+                           "John, 0501234567 ,bad\n"
+                           "\n"
+                           "Jane,0671234567\n"
+                           "John,0931234567\n"
+                           ",0990000000\n"
+                           "Olga\n")
+    book = AddressBook()
+    chunks = []
+    stats = import_csv(book, path, chunk_size=2, progress=chunks.append)
+    assert stats == ImportStats(rows=5, rejected=3)
+    assert chunks[-1] == stats and len(chunks) == 3
+    assert sorted(book) == ["Jane", "John"]
+    assert str(book.find("John")) == "Contact name: John, phones: 0501234567; 0931234567"
+
+def test_first_row_is_data_without_a_header(tmp_path):
+    book = AddressBook()
+    assert import_csv(book, write(tmp_path, "John,0501234567\n")) == ImportStats(1, 0)
+    assert "John" in book
+
+def test_import_command(tmp_path):
+    book = AddressBook()
+    rows = "".join(f"Contact {i},05{i:08d}\n" for i in range(250))
+    messages = []
+    reply = import_contacts([write(tmp_path, rows)], book, progress=messages.append)
+    assert reply.startswith("Imported 250 rows from ")
+    assert reply.endswith(", 0 rejected.")
+    assert len(book) == 250
+
+    missing = str(tmp_path / "missing.csv")
+    assert import_contacts([missing], book).startswith(f"Cannot read {missing}")
+    assert import_contacts([], book) == "Give me only the path of a CSV file."
+
+def test_import_command_reports_files_that_are_not_utf8(tmp_path):
+    path = tmp_path / "contacts.csv"
+    path.write_bytes("Олена,0501234567\n".encode("cp1251"))
+    reply = import_contacts([str(path)], AddressBook())
+    assert reply == f"Cannot parse {path}: it is not a UTF-8 text file."
@@ -0,0 +1,74 @@
+"""
+Tests of the trigram index and of fuzzy name search and suggestions.
+"""
+
+import random
+
+from bot.cli.handlers import show_phone, show_similar
+from bot.models import AddressBook, Record, TrigramIndex
+from bot.models.fuzzy_index import edit_distance
+from bot.storage import SQLiteAddressBook
+
+NAMES = ["Oleksandr", "Olena", "Oleh", "Ivan", "Iryna", "Taras"]
+
+def fill(book):
+    for name in NAMES:
+        book.add_record(Record(name))
+    return book
+
+def test_edit_distance_is_bounded():
+    assert edit_distance("kitten", "sitting", 5) == 3
+    assert edit_distance("kitten", "sitting", 2) == 3
+    assert edit_distance("abc", "abcdef", 1) == 2
+    assert edit_distance("same", "same", 0) == 0
+
+def test_search_matches_a_brute_force_scan():
+    rng = random.Random(7)
+    names = {"".join(rng.choice("abcde") for _ in range(rng.randint(4, 9)))
+             for _ in range(300)}
+    index = TrigramIndex(names)
+    for _ in range(100):
+        query = "".join(rng.choice("abcde") for _ in range(rng.randint(6, 9)))
+        expected = sorted((d, name) for name in names
+                          if (d := edit_distance(query, name, 2)) <= 2)
+        assert index.search(query, 2, len(names)) == expected
+
+def test_search_ignores_case_and_caps_short_queries():
+    index = TrigramIndex(NAMES)
+    assert index.search("olexandr") == [(2, "Oleksandr")]
+    assert index.search("Ivn", 2) == [(1, "Ivan")]
+    index.discard("Ivan")
+    assert index.search("Ivn", 2) == []
+
+def test_find_similar_follows_the_book(tmp_path):
+    sqlite = fill(SQLiteAddressBook(str(tmp_path / "contacts.db")))
+    for book in (fill(AddressBook()), sqlite):
+        assert [(d, r.name.value) for d, r in book.find_similar("Olexandr")] == [
+            (2, "Oleksandr")
+        ]
+        assert [(d, r.name.value) for d, r in book.find_similar("Olna")] == [(1, "Olena")]
+        book.delete("Olena")
+        book.add_record(Record("Olina"))
+        assert [r.name.value for _, r in book.find_similar("Olna")] == ["Olina"]
+    sqlite.close()
+
+def test_similar_command_and_suggestions():
+    book = fill(AddressBook())
+    assert show_similar(["Tars"], book) == "Contact name: Taras, phones:  (edits: 1)"
+    assert show_similar(["Zzzzzz"], book) == "No contacts similar to Zzzzzz."
+    assert show_similar(["Tars", "x"], book) == "The number of edits must be a number."
+    assert show_phone(["Irina"], book) == (
+        "No contact found with name Irina. Did you mean: Iryna?"
+    )
+
+def test_suggestions_stay_cheap():
+    book = fill(AddressBook())
+    assert show_phone(["Tars"], book) == "No contact found with name Tars."
+    assert book._similar_names is None
+    show_similar(["Tars"], book)
+    assert show_phone(["Tars"], book) == (
+        "No contact found with name Tars. Did you mean: Taras?"
+    )
+    index = TrigramIndex(f"Name{i:04d}" for i in range(100))
+    assert index.search("Name0042x", 1, max_candidates=1000) == [(1, "Name0042")]
+    assert index.search("Name0042x", 1, max_candidates=10) == []
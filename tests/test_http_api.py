@@ -0,0 +1,123 @@
+"""
+Tests of the HTTP/JSON API.
+"""
+
+import http.client
+import json
+import socket
+import threading
+import time
+from contextlib import contextmanager
+
+from bot.models import AddressBook
+from bot.server import http_api, make_http_server
+
+@contextmanager
+def running_server(address_book=None, workers=4):
+    server = make_http_server(address_book or AddressBook(), "127.0.0.1", 0, workers)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def call(connection, method, path, body=None):
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+    data = json.dumps(body) if body is not None else None
+    connection.request(method, path, data, headers)
+    response = connection.getresponse()
+    raw = response.read()
+    return response.status, json.loads(raw) if raw else None
+
+def test_contact_endpoints():
+    with running_server() as server:
+        port = server.server_address[1]
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        assert call(connection, "POST", "/contacts",
+                    {"name": "John", "phone": "0501234567"}) == (
+            201, {"name": "John", "phones": ["0501234567"]})
+        assert call(connection, "POST", "/contacts",
+                    {"name": "John", "phone": "0671234567"})[0] == 200
+        assert call(connection, "PUT", "/contacts/John/phones/0501234567",
+                    {"phone": "0931234567"}) == (
+            200, {"name": "John", "phones": ["0931234567", "0671234567"]})
+        assert call(connection, "GET", "/contacts/John")[1]["phones"][0] == "0931234567"
+        assert call(connection, "DELETE", "/contacts/John") == (204, None)
+        assert call(connection, "GET", "/contacts/John")[0] == 404
+        connection.close()
+
+def test_paging_and_names_with_spaces():
+    with running_server() as server:
+        port = server.server_address[1]
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        for name in ("Olga", "Ivan", "Anna Maria"):
+            call(connection, "POST", "/contacts", {"name": name, "phone": "0501234567"})
+        status, page = call(connection, "GET", "/contacts?limit=2")
+        assert [c["name"] for c in page["contacts"]] == ["Anna Maria", "Ivan"]
+        assert page["next"] == "Ivan"
+        status, page = call(connection, "GET", "/contacts?limit=2&after=Ivan")
+        assert [c["name"] for c in page["contacts"]] == ["Olga"] and page["next"] is None
+        assert call(connection, "GET", "/contacts/Anna%20Maria")[0] == 200
+        connection.close()
+
+def test_errors():
+    with running_server() as server:
+        port = server.server_address[1]
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        assert call(connection, "POST", "/contacts", {"name": "John", "phone": "12"})[0] == 400
+        assert call(connection, "POST", "/contacts", {"name": "John"})[0] == 400
+        assert call(connection, "GET", "/contacts?limit=0")[0] == 400
+        assert call(connection, "GET", "/nothing")[0] == 404
+        assert call(connection, "PUT", "/contacts/John/phones/0501234567",
+                    {"phone": "0931234567"})[0] == 404
+        status, payload = call(connection, "DELETE", "/contacts")
+        assert status == 405 and "error" in payload
+        connection.close()
+
+def raw_request(port, request):
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        sock.sendall(request)
+        chunks = []
+        while True:
+            data = sock.recv(65536)
+            if not data:
+                return b"".join(chunks)
+            chunks.append(data)
+
+def test_invalid_content_length_is_rejected():
+    with running_server() as server:
+        port = server.server_address[1]
+        for length in (b"-1", b"abc"):
+            reply = raw_request(port, b"POST /contacts HTTP/1.1\r\nHost: x\r\n"
+                                      b"Content-Length: " + length + b"\r\n\r\n{}")
+            assert reply.startswith(b"HTTP/1.0 400") or reply.startswith(b"HTTP/1.1 400")
+            assert b"Invalid Content-Length." in reply
+
+def test_idle_connections_do_not_hold_workers():
+    with running_server(workers=2) as server:
+        port = server.server_address[1]
+        idle = [http.client.HTTPConnection("127.0.0.1", port, timeout=5) for _ in range(2)]
+        for connection in idle:
+            assert call(connection, "GET", "/contacts")[0] == 200
+        started = time.monotonic()
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        assert call(connection, "GET", "/contacts")[0] == 200
+        assert time.monotonic() - started < 1
+        for connection in idle + [connection]:
+            assert call(connection, "GET", "/contacts")[0] == 200
+            connection.close()
+
+def test_requests_beyond_the_queue_get_503(monkeypatch):
+    monkeypatch.setattr(http_api, "MAX_QUEUED", 0)
+    with running_server(workers=1) as server:
+        port = server.server_address[1]
+        with server.lock:
+            waiting = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            waiting.request("GET", "/contacts")
+            time.sleep(0.3)
+            reply = raw_request(port, b"GET /contacts HTTP/1.1\r\nHost: x\r\n\r\n")
+        assert reply.startswith(b"HTTP/1.1 503")
+        assert waiting.getresponse().status == 200
+        waiting.close()
@@ -0,0 +1,67 @@
+"""
+Tests of JSON Lines export and import.
+"""
+
+import json
+
+from bot.cli.handlers import export_contacts, import_jsonl_contacts
+from bot.models import AddressBook, Record
+from bot.storage import MappedAddressBook, export_jsonl, import_jsonl, write_snapshot
+
+def make_book():
+    book = AddressBook()
+    for name, phones in [("John", ["0501234567", "0671234567"]), ("Олена", ["0000000001"]),
+                         ("Jane", ["0931234567"])]:
+        record = Record(name)
+        for phone in phones:
+            record.add_phone(phone)
+        book.add_record(record)
+    return book
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "contacts.jsonl")
+    assert export_jsonl(make_book(), path) == 3
+    lines = (tmp_path / "contacts.jsonl").read_text(encoding="utf-8").splitlines()
+    assert json.loads(lines[1]) == {"name": "Олена", "phones": ["0000000001"]}
+
+    book = AddressBook()
+    stats = import_jsonl(book, path, chunk_size=2)
+    assert stats.rows == 3
+    assert str(book) == str(make_book())
+
+def test_export_streams_a_mapped_book(tmp_path):
+    snapshot = str(tmp_path / "book.snapshot")
+    write_snapshot(make_book(), snapshot, generation=1)
+    mapped = MappedAddressBook(snapshot)
+    path = str(tmp_path / "contacts.jsonl")
+    assert export_jsonl(mapped, path) == 3
+    mapped.close()
+    book = AddressBook()
+    import_jsonl(book, path)
+    assert sorted(book) == ["Jane", "John", "Олена"]
+
+def test_invalid_lines_are_rejected(tmp_path):
+    path = tmp_path / "contacts.jsonl"
+    path.write_text('{"name": "John", "phones": ["0501234567", "bad", 501234567]}\n'
+                    "\n"
+                    "not json\n"
+                    '{"name": 1, "phones": []}\n'
+                    '{"name": "Jane"}\n'
+                    '{"name": "Olga", "phones": "0671234567"}\n', encoding="utf-8")
+    book = AddressBook()
+    stats = import_jsonl(book, str(path))
+    assert stats.rows == 5
+    assert stats.rejected == 6
+    assert str(book) == "Contact name: John, phones: 0501234567"
+
+def test_commands(tmp_path):
+    path = str(tmp_path / "contacts.jsonl")
+    assert export_contacts([path], make_book()) == f"Exported 3 contacts to {path}."
+    book = AddressBook()
+    assert import_jsonl_contacts([path], book) == (
+        f"Imported 3 records from {path}, 0 rejected."
+    )
+    assert len(book) == 3
+    missing = str(tmp_path / "missing" / "contacts.jsonl")
+    assert export_contacts([missing], book).startswith(f"Cannot write {missing}")
+    assert import_jsonl_contacts([missing], book).startswith(f"Cannot read {missing}")
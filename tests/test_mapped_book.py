@@ -0,0 +1,124 @@
+"""
+Tests of memory-mapped snapshots and of the address book overlaying them.
+"""
+
+from bot.models import AddressBook, Record
+from bot.storage import MappedAddressBook, PersistentAddressBook, write_snapshot
+from bot.storage.snapshot import MappedSnapshot
+
+CONTACTS = {"John": ["0501234567", "0671234567"], "Олена": ["0501234567"], "Jane": []}
+
+def make_snapshot(tmp_path, contacts=CONTACTS):
+    book = AddressBook()
+    for name, phones in contacts.items():
+        record = Record(name)
+        for phone in phones:
+            record.add_phone(phone)
+        book.add_record(record)
+    path = str(tmp_path / "book.snapshot")
+    write_snapshot(book, path, generation=7)
+    return path
+
+def names(records):
+    return sorted(record.name.value for record in records)
+
+def test_snapshot_lookups(tmp_path):
+    snapshot = MappedSnapshot(make_snapshot(tmp_path))
+    assert snapshot.generation == 7
+    assert len(snapshot) == 3
+    assert snapshot.find("John") == ["0501234567", "0671234567"]
+    assert snapshot.find("Olga") is None
+    assert "Олена" in snapshot and "Olga" not in snapshot
+    assert sorted(snapshot.owners("0501234567")) == ["John", "Олена"]
+    assert snapshot.owners("0990000000") == []
+    assert sorted(snapshot.names()) == sorted(CONTACTS)
+    assert dict(snapshot) == CONTACTS
+    snapshot.close()
+
+def test_large_snapshot_lookups(tmp_path):
+    contacts = {f"Contact {i}": [f"05{i:08d}"] for i in range(5000)}
+    snapshot = MappedSnapshot(make_snapshot(tmp_path, contacts))
+    assert all(snapshot.find(name) == phones for name, phones in contacts.items())
+    assert snapshot.owners("0500004321") == ["Contact 4321"]
+    snapshot.close()
+
+def test_overlay_shadows_the_snapshot(tmp_path):
+    book = MappedAddressBook(make_snapshot(tmp_path))
+    assert len(book) == 3 and not book.data
+    assert "John" in book and "Olga" not in book
+
+    book.find("John").remove_phone("0501234567")
+    assert names(book.find_by_phone("0501234567")) == ["Олена"]
+    assert names(book.find_by_phone("0671234567")) == ["John"]
+
+    book.delete("Олена")
+    assert "Олена" not in book
+    assert book.find("Олена") is None
+    assert book.find_by_phone("0501234567") == []
+
+    olga = Record("Olga")
+    olga.add_phone("0931234567")
+    book.add_record(olga)
+    replacement = Record("Jane")
+    replacement.add_phone("0931234567")
+    book.add_record(replacement)
+
+    assert len(book) == 3
+    assert sorted(book) == ["Jane", "John", "Olga"]
+    assert book["Jane"] is replacement
+    assert names(book.find_by_phone("0931234567")) == ["Jane", "Olga"]
+    assert sorted(str(record) for record in book.values()) == [
+        "Contact name: Jane, phones: 0931234567",
+        "Contact name: John, phones: 0671234567",
+        "Contact name: Olga, phones: 0931234567",
+    ]
+    book.close()
+
+def test_persistent_book_maps_its_snapshot(tmp_path):
+    path = str(tmp_path / "book.wal")
+    book = PersistentAddressBook(path, fsync="always", compact_threshold=None)
+    for name, phones in CONTACTS.items():
+        record = Record(name)
+        for phone in phones:
+            record.add_phone(phone)
+        book.add_record(record)
+    book.compact()
+    book.find("Jane").add_phone("0990000000")
+    book.close()
+
+    book = PersistentAddressBook(path, compact_threshold=None)
+    assert book.loaded == 3 and book.replayed == 1
+    assert book.snapshot is not None
+    assert names(book.find_by_phone("0990000000")) == ["Jane"]
+    assert str(book.find("John")) == "Contact name: John, phones: 0501234567; 0671234567"
+    book.close()
+
+def test_iterating_hands_out_the_live_records(tmp_path):
+    book = MappedAddressBook(make_snapshot(tmp_path))
+    listed = {record.name.value: record for record in book.values()}
+    assert book.find("John") is listed["John"]
+    listed["Jane"].add_phone("0990000000")
+    assert book.find("Jane") is listed["Jane"]
+    assert names(book.find_by_phone("0990000000")) == ["Jane"]
+    book.close()
+
+def test_records_stay_attached_across_compaction(tmp_path):
+    path = str(tmp_path / "book.wal")
+    book = PersistentAddressBook(path, fsync="always", compact_threshold=None)
+    book.add_record(Record("John"))
+    book.compact()
+    book.close()
+
+    book = PersistentAddressBook(path, fsync="always", compact_threshold=None)
+    stale = book.find("John")
+    listed = next(iter(book.values()))
+    assert listed is stale
+    book.compact()
+    stale.add_phone("0501234567")
+    assert book.find("John") is stale
+    assert names(book.find_by_phone("0501234567")) == ["John"]
+    book.close()
+
+    book = PersistentAddressBook(path, compact_threshold=None)
+    assert str(book.find("John")) == "Contact name: John, phones: 0501234567"
+    book.close()
@@ -0,0 +1,97 @@
+"""
+Tests of case- and Unicode-insensitive name lookup.
+"""
+
+import sqlite3
+
+from bot.models import AddressBook, NameKeys, Record
+from bot.models.name import normalize_name
+from bot.storage import PersistentAddressBook, SQLiteAddressBook
+
+COMPOSED = "Ren\u00e9"
+DECOMPOSED = "Rene\u0301"
+
+def test_normalize_name():
+    assert normalize_name("OLENA") == normalize_name("olena") == "olena"
+    assert normalize_name(COMPOSED) == normalize_name(DECOMPOSED.upper())
+    keys = NameKeys(["Olena"])
+    assert keys.get("OLENA") == "Olena"
+    keys.discard("Olena")
+    assert keys.get("olena") is None
+
+def check_book(book):
+    record = Record("Olena")
+    record.add_phone("0501234567")
+    book.add_record(record)
+    book.add_record(Record(COMPOSED))
+    assert book.find("OLENA").name.value == "Olena"
+    assert "olena" in book
+    assert book.find(DECOMPOSED).name.value == COMPOSED
+    book.add_record(Record("olena"))
+    assert [r.name.value for r in book.values()].count("olena") == 1
+    assert book.find("Olena").name.value == "olena"
+    book.delete(COMPOSED.upper())
+    assert book.find(COMPOSED) is None
+
+def test_lookups_ignore_case_and_normal_form(tmp_path):
+    check_book(AddressBook(normalize_names=True))
+    sqlite = SQLiteAddressBook(str(tmp_path / "contacts.db"), normalize_names=True)
+    check_book(sqlite)
+    sqlite.close()
+    persistent = PersistentAddressBook(str(tmp_path / "book.wal"), normalize_names=True)
+    check_book(persistent)
+    persistent.close()
+
+def test_lookups_are_exact_by_default():
+    book = AddressBook()
+    book.add_record(Record("Olena"))
+    assert book.find("olena") is None
+    book.add_record(Record("olena"))
+    assert len(book) == 2
+
+def test_persistent_book_resolves_snapshot_names(tmp_path):
+    path = str(tmp_path / "book.wal")
+    book = PersistentAddressBook(path, normalize_names=True)
+    book.add_record(Record("Olena"))
+    book.compact()
+    book.close()
+    book = PersistentAddressBook(path, normalize_names=True)
+    assert book.find("OLENA").name.value == "Olena"
+    book.find("olena").add_phone("0501234567")
+    book.close()
+    book = PersistentAddressBook(path)
+    assert str(book.find("Olena")) == "Contact name: Olena, phones: 0501234567"
+    book.close()
+
+def test_stored_books_resolve_names_without_reading_them_all(tmp_path):
+    path = str(tmp_path / "book.wal")
+    book = PersistentAddressBook(path, normalize_names=True)
+    for name in ("Olena", "Ivan", COMPOSED):
+        book.add_record(Record(name))
+    book.compact()
+    book.close()
+    book = PersistentAddressBook(path, normalize_names=True)
+    assert book.snapshot.find_key("IVAN") == "Ivan"
+    assert book.find(DECOMPOSED).name.value == COMPOSED
+    assert list(book.data) == [COMPOSED]
+    book.delete("olena")
+    assert book.find("Olena") is None
+    book.close()
+
+    sqlite = SQLiteAddressBook(str(tmp_path / "contacts.db"), normalize_names=True)
+    sqlite.add_record(Record("Olena"))
+    assert sqlite.find("OLENA").name.value == "Olena"
+    assert sqlite._name_keys is None
+    sqlite.close()
+
+def test_old_sqlite_database_gets_name_keys(tmp_path):
+    path = str(tmp_path / "contacts.db")
+    db = sqlite3.connect(path)
+    db.executescript("""
+        CREATE TABLE contacts (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+        INSERT INTO contacts (name) VALUES ('Olena');
+    """)
+    db.close()
+    book = SQLiteAddressBook(path, normalize_names=True)
+    assert book.find("OLENA").name.value == "Olena"
+    book.close()
@@ -0,0 +1,57 @@
+"""
+Tests of whole-column phone validation.
+"""
+
+import random
+
+import pytest
+
+from bot.models import AddressBook, validate_phone_column
+from bot.models import phone_column
+
+COLUMN = ["0501234567", "12345", "0671234567", "05012345678", "050123456a", "",
+          "0000000001", "٠٥٠١٢٣٤٥٦٧", "0501234567 ", "09912345é7"]
+EXPECTED = ([501234567, 671234567, 1, 501234567], [1, 3, 4, 5, 8, 9])
+
+def test_numpy_column():
+    pytest.importorskip("numpy")
+    assert validate_phone_column(COLUMN) == EXPECTED
+
+def test_python_column(monkeypatch):
+    monkeypatch.setattr(phone_column, "np", None)
+    assert validate_phone_column(COLUMN) == EXPECTED
+
+def test_empty_column():
+    assert validate_phone_column([]) == ([], [])
+
+def test_add_phone_column():
+    book = AddressBook()
+    names = ["John", "John", "", "Jane", "Jane"]
+    phones = ["0501234567", "bad", "0671234567", "0671234567", "0501234567"]
+    assert book.add_phone_column(names, phones) == [1, 2]
+    assert str(book.find("John")) == "Contact name: John, phones: 0501234567"
+    assert str(book.find("Jane")) == "Contact name: Jane, phones: 0671234567; 0501234567"
+    assert sorted(r.name.value for r in book.find_by_phone("0501234567")) == ["Jane", "John"]
+    with pytest.raises(ValueError):
+        book.add_phone_column(["John"], [])
+
+def test_both_paths_agree_on_random_columns(monkeypatch):
+    pytest.importorskip("numpy")
+    rng = random.Random(10)
+    alphabet = "0123456789\x00a٣ "
+    column = ["".join(rng.choice(alphabet) for _ in range(rng.choice((9, 10, 10, 11))))
+              for _ in range(2000)]
+    column += ["0501234567\x00", "050123456\x00"]
+    expected = validate_phone_column(column)
+    assert expected[1][-2:] == [len(column) - 2, len(column) - 1]
+    monkeypatch.setattr(phone_column, "np", None)
+    assert validate_phone_column(column) == expected
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_non_string_cells_are_rejected(monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(phone_column, "np", None)
+    column = ["0501234567", None, 501234567, "0671234567"]
+    assert validate_phone_column(column) == ([501234567, 671234567], [1, 2])
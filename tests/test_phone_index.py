@@ -0,0 +1,53 @@
+"""
+Tests of the reverse phone index and the `who` command.
+"""
+
+from bot.cli.handlers import show_owner
+from bot.models import AddressBook, PhoneIndex, Record
+
+def make_book(*contacts):
+    book = AddressBook()
+    for name, *phones in contacts:
+        record = Record(name)
+        for phone in phones:
+            record.add_phone(phone)
+        book.add_record(record)
+    return book
+
+def owners(book, phone):
+    return sorted(record.name.value for record in book.find_by_phone(phone))
+
+def test_index_tracks_shared_numbers():
+    index = PhoneIndex()
+    index.add("0501234567", "John")
+    index.add("0501234567", "Jane")
+    assert index.owners("0501234567") == ["Jane", "John"]
+    index.discard("0501234567", "John")
+    assert index.owners("0501234567") == ["Jane"]
+    index.discard("0501234567", "Jane")
+    assert index.owners("0501234567") == []
+    assert len(index) == 0
+
+def test_find_by_phone_follows_record_changes():
+    book = make_book(("John", "0501234567"), ("Jane", "0501234567", "0671234567"))
+    assert owners(book, "0501234567") == ["Jane", "John"]
+
+    book.find("John").edit_phone("0501234567", "0931234567")
+    assert owners(book, "0501234567") == ["Jane"]
+    assert owners(book, "0931234567") == ["John"]
+
+    book.find("Jane").remove_phone("0671234567")
+    assert owners(book, "0671234567") == []
+
+    book.delete("Jane")
+    assert owners(book, "0501234567") == []
+
+def test_replacing_a_record_reindexes_it():
+    book = make_book(("John", "0501234567"))
+    book.add_record(Record("John"))
+    assert owners(book, "0501234567") == []
+
+def test_who_command():
+    book = make_book(("John", "0501234567"))
+    assert show_owner(["0501234567"], book) == "Contact name: John, phones: 0501234567"
+    assert show_owner(["0990000000"], book) == "No contact found with phone 0990000000."
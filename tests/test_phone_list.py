@@ -0,0 +1,71 @@
+"""
+Tests of PhoneList and of the Record phone operations built on it.
+"""
+
+from bot.models import AddressBook, Phone, PhoneList, Record
+
+def values(phones):
+    return [phone.value for phone in phones]
+
+def test_add_keeps_insertion_order_and_skips_duplicates():
+    phones = PhoneList()
+    assert phones.add(Phone("0501234567"))
+    assert phones.add(Phone("0671234567"))
+    assert not phones.add(Phone("0501234567"))
+    assert values(phones) == ["0501234567", "0671234567"]
+    assert len(phones) == 2
+    assert "0671234567" in phones
+    assert Phone("0501234567") in phones
+
+def test_remove_and_replace_keep_positions():
+    phones = PhoneList()
+    for number in ("0500000001", "0500000002", "0500000003"):
+        phones.add(Phone(number))
+    assert phones.replace("0500000002", Phone("0990000000"))
+    assert phones.remove("0500000001").value == "0500000001"
+    assert phones.remove("0500000001") is None
+    assert values(phones) == ["0990000000", "0500000003"]
+    assert phones[0].value == "0990000000"
+    assert phones[-1].value == "0500000003"
+    assert phones.get("0990000000").value == "0990000000"
+    assert phones.get("0500000002") is None
+
+def test_many_removals_keep_lookups_consistent():
+    phones = PhoneList()
+    numbers = [f"05000000{i:02d}" for i in range(50)]
+    for number in numbers:
+        phones.add(Phone(number))
+    for number in numbers[:40]:
+        phones.remove(number)
+    assert values(phones) == numbers[40:]
+    assert [phones[i].value for i in range(len(phones))] == numbers[40:]
+    assert phones.remove(numbers[45]) is not None
+    assert numbers[45] not in phones
+
+def test_record_edit_phone_keeps_position():
+    record = Record("John")
+    for number in ("0500000001", "0500000002", "0500000003"):
+        record.add_phone(number)
+    record.add_phone("0500000001")
+    record.edit_phone("0500000002", "0990000000")
+    assert values(record.phones) == ["0500000001", "0990000000", "0500000003"]
+
+def test_edit_phone_to_an_existing_number_drops_the_old_one():
+    book = AddressBook()
+    record = Record("John")
+    record.add_phone("0500000001")
+    record.add_phone("0500000002")
+    book.add_record(record)
+    record.edit_phone("0500000001", "0500000002")
+    assert values(record.phones) == ["0500000002"]
+    assert book.find_by_phone("0500000001") == []
+    assert book.find_by_phone("0500000002") == [record]
+
+def test_edit_phone_to_the_same_number_keeps_it():
+    book = AddressBook()
+    record = Record("John")
+    record.add_phone("0500000001")
+    book.add_record(record)
+    record.edit_phone("0500000001", "0500000001")
+    assert values(record.phones) == ["0500000001"]
+    assert book.find_by_phone("0500000001") == [record]
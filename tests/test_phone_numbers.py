@@ -0,0 +1,53 @@
+"""
+Tests of phone numbers stored as integers.
+"""
+
+import pytest
+
+from bot.models import AddressBook, Phone, PhoneIndex, Record
+from bot.storage import MappedAddressBook, write_snapshot
+
+def test_phone_keeps_leading_zeros():
+    phone = Phone("0050000001")
+    assert phone.number == 50000001
+    assert phone.value == "0050000001"
+    assert str(phone) == "0050000001"
+    assert Phone.from_number(50000001) == phone
+    assert hash(Phone.from_number(50000001)) == hash(phone)
+    assert Phone("0050000002") != phone
+
+@pytest.mark.parametrize("value", ["", "123", "05012345678", "050123456x", "+380501234"])
+def test_invalid_numbers_are_rejected(value):
+    assert Phone.to_number(value) is None
+    with pytest.raises(ValueError):
+        Phone(value)
+
+def test_setting_the_value_revalidates():
+    phone = Phone("0501234567")
+    phone.value = "0671234567"
+    assert phone.number == 671234567
+    with pytest.raises(ValueError):
+        phone.value = "067"
+
+def test_index_accepts_strings_and_integers():
+    index = PhoneIndex()
+    index.add("0501234567", "John")
+    index.add_number(501234567, "Jane")
+    assert index.owners("0501234567") == ["Jane", "John"]
+    index.discard_number(501234567, "John")
+    index.discard("0501234567", "Jane")
+    assert len(index) == 0
+
+def test_snapshot_keeps_integer_phones(tmp_path):
+    book = AddressBook()
+    record = Record("John")
+    record.add_phone("0000000001")
+    record.add_phone("0501234567")
+    book.add_record(record)
+    path = str(tmp_path / "book.snapshot")
+    write_snapshot(book, path, generation=1)
+
+    mapped = MappedAddressBook(path)
+    assert str(mapped.find("John")) == "Contact name: John, phones: 0000000001; 0501234567"
+    assert [r.name.value for r in mapped.find_by_phone("0000000001")] == ["John"]
+    mapped.close()
@@ -0,0 +1,73 @@
+"""
+Tests of phone number prefix and range queries.
+"""
+
+import pytest
+
+from bot.cli.handlers import show_phone_prefix
+from bot.models import AddressBook, Record
+from bot.storage import PersistentAddressBook, SQLiteAddressBook
+
+CONTACTS = {
+    "John": ["0501234567", "0441000000"],
+    "Jane": ["0509999999"],
+    "Olena": ["0671234567", "0441000000"],
+}
+
+def fill(book):
+    for name, phones in CONTACTS.items():
+        record = Record(name)
+        for phone in phones:
+            record.add_phone(phone)
+        book.add_record(record)
+    return book
+
+def matches(pairs):
+    return [(phone, record.name.value) for phone, record in pairs]
+
+def test_prefix_and_range_on_every_book(tmp_path):
+    sqlite = fill(SQLiteAddressBook(str(tmp_path / "contacts.db")))
+    persistent = fill(PersistentAddressBook(str(tmp_path / "book.wal")))
+    persistent.compact()
+    for book in (fill(AddressBook()), sqlite, persistent):
+        assert matches(book.find_by_phone_prefix("050")) == [
+            ("0501234567", "John"), ("0509999999", "Jane")
+        ]
+        assert matches(book.find_by_phone_range("044", "050")) == [
+            ("0441000000", "John"), ("0441000000", "Olena"),
+            ("0501234567", "John"), ("0509999999", "Jane"),
+        ]
+        assert matches(book.find_by_phone_prefix("")) == matches(
+            book.find_by_phone_range("0000000000", "9999999999"))
+        book.find("Jane").edit_phone("0509999999", "0931234567")
+        assert matches(book.find_by_phone_prefix("0509")) == []
+        assert matches(book.find_by_phone_prefix("093")) == [("0931234567", "Jane")]
+        with pytest.raises(ValueError):
+            book.find_by_phone_prefix("05x")
+    sqlite.close()
+    persistent.close()
+
+def test_prefix_command():
+    book = fill(AddressBook())
+    assert list(show_phone_prefix(["067"], book)) == [
+        "0671234567: Contact name: Olena, phones: 0671234567; 0441000000"
+    ]
+    assert list(show_phone_prefix(["0670000000", "0679999999"], book)) == [
+        "0671234567: Contact name: Olena, phones: 0671234567; 0441000000"
+    ]
+    assert list(show_phone_prefix(["099"], book)) == ["No phone numbers starting with 099."]
+    assert list(show_phone_prefix(["099", "0999"], book)) == [
+        "No phone numbers from 099 to 0999."
+    ]
+    assert list(show_phone_prefix(["abc"], book)) == ["Phone prefix must be up to 10 digits"]
+    assert list(show_phone_prefix([], book)) == [
+        "Give me a phone prefix, or the first and the last number of a range."
+    ]
+
+def test_prefix_command_reports_errors_raised_while_streaming():
+    class FailingBook(AddressBook):
+        def _phones_between(self, low, high):
+            yield "0501234567", Record("John")
+            raise KeyError("John")
+
+    assert list(show_phone_prefix(["050"], FailingBook())) == ["Contact not found."]
@@ -0,0 +1,45 @@
+"""
+Tests of the phonetic index and of searching contacts by how their names sound.
+"""
+
+from bot.cli.handlers import show_sounding
+from bot.models import AddressBook, PhoneticIndex, Record
+from bot.models.phonetic_index import sound_code, transliterate
+from bot.storage import SQLiteAddressBook
+
+def test_transliterate_and_sound_code():
+    assert transliterate("Олена") == transliterate("Olena") == "OLENA"
+    assert transliterate("Сергій") == "SERHII"
+    assert sound_code("Olena") == sound_code("Helen") == sound_code("Олена")
+    assert sound_code("Kateryna") == sound_code("Catherine") == "2365"
+    assert sound_code("Serhii") == sound_code("Sergey")
+    assert sound_code("Oleksandr") == sound_code("Alexander") == sound_code("Александр")
+    assert sound_code("Ivan") != sound_code("Olena")
+
+def test_index_add_discard_and_limit():
+    index = PhoneticIndex(["Oleksandr", "Alexander", "Kateryna"])
+    assert index.search("Олександр") == ["Alexander", "Oleksandr"]
+    assert index.search("Олександр", 1) == ["Alexander"]
+    index.discard("Alexander")
+    index.add("Ivan")
+    assert index.search("Alexander") == ["Oleksandr"]
+    assert index.search("Іван") == ["Ivan"]
+
+def test_find_sounding_follows_the_book(tmp_path):
+    sqlite = SQLiteAddressBook(str(tmp_path / "contacts.db"))
+    for book in (AddressBook(), sqlite):
+        for name in ("Olena", "Kateryna", "Ivan"):
+            book.add_record(Record(name))
+        assert [r.name.value for r in book.find_sounding("Олена")] == ["Olena"]
+        book.add_record(Record("Helen"))
+        book.delete("Kateryna")
+        assert [r.name.value for r in book.find_sounding("Olena")] == ["Helen", "Olena"]
+        assert book.find_sounding("Catherine") == []
+    sqlite.close()
+
+def test_sounds_command():
+    book = AddressBook()
+    book.add_record(Record("Serhii"))
+    assert show_sounding(["Сергей"], book) == "Contact name: Serhii, phones: "
+    assert show_sounding(["Kateryna"], book) == "No contacts sounding like Kateryna."
+    assert show_sounding([], book) == "Give me a name."
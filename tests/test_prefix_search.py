@@ -0,0 +1,54 @@
+"""
+Tests of prefix search and tab-completion of contact names.
+"""
+
+from bot.cli import completion
+from bot.cli.completion import make_completer
+from bot.cli.handlers import search_contacts
+from bot.models import AddressBook, Record
+from bot.storage import SQLiteAddressBook
+
+NAMES = ["Olena", "Oleh", "Olga", "Oksana", "Ivan", "Ol"]
+
+def fill(book):
+    for name in NAMES:
+        book.add_record(Record(name))
+    return book
+
+def test_names_with_prefix(tmp_path):
+    sqlite = fill(SQLiteAddressBook(str(tmp_path / "contacts.db")))
+    for book in (fill(AddressBook()), sqlite):
+        assert list(book.names_with_prefix("Ol")) == ["Ol", "Oleh", "Olena", "Olga"]
+        assert list(book.names_with_prefix("Ole")) == ["Oleh", "Olena"]
+        assert list(book.names_with_prefix("X")) == []
+        assert [r.name.value for r in book.search("O", 2)] == ["Oksana", "Ol"]
+    sqlite.close()
+
+def test_search_command():
+    book = fill(AddressBook())
+    assert search_contacts(["Ole"], book) == (
+        "Contact name: Oleh, phones: \nContact name: Olena, phones: "
+    )
+    reply = search_contacts(["Ol", "2"], book)
+    assert reply.splitlines()[-1].startswith("More contacts start with Ol")
+    assert search_contacts(["Z"], book) == "No contacts starting with Z."
+    assert search_contacts(["Ol", "0"], book) == (
+        "The number of results must be a positive number."
+    )
+
+def test_completer(monkeypatch):
+    monkeypatch.setattr(completion, "readline", None)
+    complete = make_completer(fill(AddressBook()), ["add", "all", "phone"])
+    assert [complete("a", state) for state in range(3)] == ["add", "all", None]
+
+    class FakeReadline:
+        @staticmethod
+        def get_line_buffer():
+            return "phone Ole"
+
+        @staticmethod
+        def get_begidx():
+            return len("phone ")
+
+    monkeypatch.setattr(completion, "readline", FakeReadline)
+    assert [complete("Ole", state) for state in range(3)] == ["Oleh", "Olena", None]
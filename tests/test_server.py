@@ -0,0 +1,150 @@
+"""
+Tests of the asyncio command server and its client.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from bot.cli.commands import REGISTRY, SERVER_REGISTRY, build_registry
+from bot.models import AddressBook, Record
+from bot.server import CommandServer, connect, parse_address
+
+def test_parse_address():
+    assert parse_address("unix:/tmp/bot.sock") == ("unix", "/tmp/bot.sock")
+    assert parse_address("127.0.0.1:8765") == ("tcp", "127.0.0.1:8765")
+    with pytest.raises(ValueError):
+        parse_address("localhost")
+
+def serve(tmp_path, scenario):
+    address = f"unix:{tmp_path / 'bot.sock'}"
+    server = CommandServer(AddressBook())
+
+    async def main():
+        listening = await server.start(address)
+        try:
+            return await scenario(address)
+        finally:
+            listening.close()
+            await listening.wait_closed()
+
+    return server, asyncio.run(main())
+
+def test_requests_from_many_connections_share_the_book(tmp_path):
+    async def scenario(address):
+        clients = [await connect(address) for _ in range(20)]
+        replies = await asyncio.gather(*(client.request(f"add User{i:02d} 05000000{i:02d}")
+                                         for i, client in enumerate(clients)))
+        listing = await clients[0].request("all")
+        for client in clients:
+            await client.close()
+        return replies, listing
+
+    server, (replies, listing) = serve(tmp_path, scenario)
+    assert replies == [["Contact added."]] * 20
+    assert len(listing) == 20 and listing[0].startswith("Contact name: User00")
+    assert len(server.address_book) == 20
+
+def test_blank_unknown_and_closing_requests(tmp_path):
+    async def scenario(address):
+        client = await connect(address)
+        replies = [await client.request(line) for line in ("", "nope", "hello", "exit")]
+        await client.close()
+        return replies
+
+    _, replies = serve(tmp_path, scenario)
+    assert replies == [[], ["Invalid command."], ["How can I help you?"], ["Good bye!"]]
+
+def test_server_leaves_out_file_commands(tmp_path):
+    async def scenario(address):
+        client = await connect(address)
+        reply = await client.request(f"export {tmp_path / 'stolen.jsonl'}")
+        await client.close()
+        return reply
+
+    _, reply = serve(tmp_path, scenario)
+    assert reply == ["Invalid command."]
+    assert not (tmp_path / "stolen.jsonl").exists()
+    assert "export" in REGISTRY and "export" not in SERVER_REGISTRY
+
+def test_blocking_commands_run_in_a_worker_thread(tmp_path):
+    registry = build_registry(files=False)
+    started = threading.Event()
+    release = threading.Event()
+
+    @registry.command("slow", progress=True, blocking=True)
+    def slow(args, address_book, progress):
+        progress(f"thread {threading.get_ident() != loop_thread}")
+        started.set()
+        release.wait(5)
+        address_book.add_record(Record("Slow"))
+        return "done"
+
+    loop_thread = threading.get_ident()
+    address = f"unix:{tmp_path / 'bot.sock'}"
+    server = CommandServer(AddressBook(), registry)
+
+    async def main():
+        listening = await server.start(address)
+        slow_client, fast_client = await connect(address), await connect(address)
+        slow_reply = asyncio.ensure_future(slow_client.request("slow"))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        third_client = await connect(address)
+        phone = asyncio.ensure_future(fast_client.request("phone Slow"))
+        await asyncio.sleep(0.05)
+        assert not phone.done()
+        release.set()
+        replies = await slow_reply, await phone
+        await third_client.close()
+        await slow_client.close()
+        await fast_client.close()
+        listening.close()
+        await listening.wait_closed()
+        return replies
+
+    slow_reply, phone = asyncio.run(main())
+    assert slow_reply == ["thread True", "done"]
+    assert phone == ["Contact name: Slow, phones: "]
+
+def test_pipelined_requests_are_answered_in_order(tmp_path):
+    lines = [f"add User{i:04d} 05{i:08d}" for i in range(2000)] + ["phone User1999", "all"]
+
+    async def scenario(address):
+        client = await connect(address)
+        replies = await client.pipeline(lines)
+        await client.close()
+        return replies
+
+    _, replies = serve(tmp_path, scenario)
+    assert replies[:2000] == [["Contact added."]] * 2000
+    assert replies[2000] == ["Contact name: User1999, phones: 0500001999"]
+    assert len(replies[2001]) == 2000
+
+def test_raw_pipelined_bytes(tmp_path):
+    async def scenario(address):
+        reader, writer = await asyncio.open_unix_connection(address[len("unix:"):])
+        writer.write(b"hello\nadd John 0501234567\nph")
+        await writer.drain()
+        await asyncio.sleep(0.05)
+        writer.write(b"one John\nexit\n")
+        await writer.drain()
+        data = await reader.read()
+        writer.close()
+        return data
+
+    _, data = serve(tmp_path, scenario)
+    assert data == (b"How can I help you?\n\nContact added.\n\n"
+                    b"Contact name: John, phones: 0501234567\n\nGood bye!\n\n")
+
+def test_last_request_without_a_newline_is_run(tmp_path):
+    async def scenario(address):
+        reader, writer = await asyncio.open_unix_connection(address[len("unix:"):])
+        writer.write(b"add John 0501234567\nphone John")
+        writer.write_eof()
+        data = await reader.read()
+        writer.close()
+        return data
+
+    _, data = serve(tmp_path, scenario)
+    assert data == b"Contact added.\n\nContact name: John, phones: 0501234567\n\n"
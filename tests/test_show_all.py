@@ -0,0 +1,62 @@
+"""
+Tests of the streamed and paged `all` command.
+"""
+
+from bot.cli import handlers
+from bot.cli.handlers import show_all
+from bot.models import AddressBook, Record
+from bot.storage import SQLiteAddressBook
+
+def fill(book, count):
+    for i in range(count):
+        record = Record(f"Contact {i:03d}")
+        record.add_phone(f"05{i:08d}")
+        book.add_record(record)
+    return book
+
+def test_empty_book():
+    assert list(show_all([], AddressBook())) == ["No contacts."]
+
+def test_listing_is_chunked(monkeypatch):
+    monkeypatch.setattr(handlers, "PAGE_CHUNK", 4)
+    chunks = list(show_all([], fill(AddressBook(), 10)))
+    assert [chunk.count("\n") + 1 for chunk in chunks] == [4, 4, 2]
+    assert chunks[0].startswith("Contact name: Contact 000, phones: 0500000000")
+
+def test_pages_resume_after_a_name():
+    book = fill(AddressBook(), 5)
+    first = list(show_all(["--limit", "2"], book))
+    assert first == [
+        "Contact name: Contact 000, phones: 0500000000\n"
+        "Contact name: Contact 001, phones: 0500000001",
+        "More contacts: all --limit 2 --after Contact 001",
+    ]
+    last = list(show_all(["--limit", "3", "--after", "Contact 001"], book))
+    assert len(last) == 1 and last[0].count("\n") == 2
+    assert list(show_all(["--after", "Contact 004"], book)) == [
+        "No contacts after Contact 004."
+    ]
+    assert list(show_all(["--after", "Olga"], book)) == ["No contacts after Olga."]
+
+def test_invalid_options():
+    book = fill(AddressBook(), 1)
+    for args in (["--limit", "0"], ["--limit"], ["--page", "2"], ["--limit", "x"]):
+        (reply,) = show_all(args, book)
+        assert reply.endswith("Usage: all [--limit N] [--after <name>]")
+
+def test_sqlite_pages(tmp_path):
+    book = fill(SQLiteAddressBook(str(tmp_path / "contacts.db")), 5)
+    names = [record.name.value for record in book.records_after("Contact 002")]
+    assert names == ["Contact 003", "Contact 004"]
+    assert list(book.records_after("Olga")) == []
+    book.close()
+
+def test_errors_raised_while_streaming_end_the_output():
+    class FailingBook(AddressBook):
+        def records_after(self, name=None):
+            yield Record("John")
+            raise KeyError(name)
+
+    book = FailingBook()
+    book.add_record(Record("John"))
+    assert list(show_all([], book)) == ["Contact not found."]
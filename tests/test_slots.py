@@ -0,0 +1,43 @@
+"""
+Tests of the compact layout of the contact models.
+"""
+
+import pytest
+
+from bot.models import Name, Phone, PhoneList, Record
+from bot.models.phone_list import INDEX_THRESHOLD
+
+@pytest.mark.parametrize("instance", [
+    Name("John"), Phone("0501234567"), PhoneList(), Record("John"),
+])
+def test_models_have_no_instance_dict(instance):
+    assert not hasattr(instance, "__dict__")
+    with pytest.raises(AttributeError):
+        instance.extra = 1
+
+@pytest.mark.parametrize("count", [1, INDEX_THRESHOLD, INDEX_THRESHOLD + 1, 40])
+def test_phone_list_behaves_the_same_with_and_without_index(count):
+    phones = PhoneList()
+    numbers = [f"05000000{i:02d}" for i in range(count)]
+    for number in numbers:
+        assert phones.add(Phone(number))
+    assert not phones.add(Phone(numbers[-1]))
+    assert len(phones) == count
+    assert all(number in phones for number in numbers)
+
+    assert phones.replace(numbers[0], Phone("0990000000"))
+    assert not phones.replace("0000000000", Phone("0990000001"))
+    for number in numbers[1:count // 2 + 1]:
+        assert phones.remove(number) is not None
+    expected = ["0990000000"] + numbers[count // 2 + 1:]
+    assert [phone.value for phone in phones] == expected
+    assert [phones[i].value for i in range(len(phones))] == expected
+    assert phones.get(expected[-1]).value == expected[-1]
+    assert phones.get(numbers[0]) is None
+
+def declared_slots(cls):
+    return [slot for klass in cls.__mro__ for slot in klass.__dict__.get("__slots__", ())]
+
+@pytest.mark.parametrize("cls", [Name, Phone])
+def test_fields_carry_a_single_slot(cls):
+    assert len(declared_slots(cls)) == 1
@@ -0,0 +1,106 @@
+"""
+Tests of reading snapshots written in earlier formats.
+"""
+
+import struct
+
+import pytest
+
+from bot.models import Record
+from bot.storage import MappedAddressBook, PersistentAddressBook, upgrade_snapshot
+from bot.storage.snapshot import MAGIC
+
+CONTACTS = [("John", ["0501234567", "0000000001"]), ("Олена", []), ("Jane", ["0671234567"])]
+
+def pack_str(value):
+    data = value.encode("utf-8")
+    return struct.pack("<H", len(data)) + data
+
+def pack_contacts(contacts):
+    body = b""
+    for name, phones in contacts:
+        body += pack_str(name) + struct.pack("<H", len(phones))
+        body += b"".join(pack_str(phone) for phone in phones)
+    return body
+
+def write_absnap01(path, generation, contacts):
+    header = struct.pack("<8sQQ", b"ABSNAP01", generation, len(contacts))
+    path.write_bytes(header + pack_contacts(contacts))
+
+def write_absnap02(path, generation, contacts):
+    # The hash tables that follow the contacts are not needed to upgrade the file.
+    body = pack_contacts(contacts)
+    header = struct.pack("<8s7Q", b"ABSNAP02", generation, len(contacts), 0, 0, 0, 0,
+                         64 + len(body))
+    path.write_bytes(header + body)
+
+def write_integer_phones(path, magic, count_format, generation, contacts):
+    body = b""
+    for name, phones in contacts:
+        body += pack_str(name) + struct.pack(f"<{count_format}{len(phones)}Q", len(phones),
+                                             *map(int, phones))
+    header = struct.pack("<8s7Q", magic, generation, len(contacts), 0, 0, 0, 0,
+                         64 + len(body))
+    path.write_bytes(header + body)
+
+def write_absnap03(path, generation, contacts):
+    write_integer_phones(path, b"ABSNAP03", "H", generation, contacts)
+
+def write_absnap04(path, generation, contacts):
+    write_integer_phones(path, b"ABSNAP04", "I", generation, contacts)
+
+def contents(book):
+    return [(record.name.value, [phone.value for phone in record.phones])
+            for record in book.values()]
+
+@pytest.mark.parametrize("write, magic", [
+    (write_absnap01, "ABSNAP01"), (write_absnap02, "ABSNAP02"), (write_absnap03, "ABSNAP03"),
+    (write_absnap04, "ABSNAP04"),
+])
+def test_legacy_snapshot_is_upgraded(tmp_path, write, magic):
+    path = tmp_path / "book.snapshot"
+    write(path, 3, CONTACTS)
+    book = MappedAddressBook(str(path))
+    assert book.upgraded_from == magic
+    assert book.snapshot.generation == 3
+    assert path.read_bytes()[:8] == MAGIC
+    assert contents(book) == CONTACTS
+    assert [record.name.value for record in book.find_by_phone("0000000001")] == ["John"]
+    book.close()
+    assert upgrade_snapshot(str(path)) is None
+
+def test_persistent_book_keeps_replaying_after_an_upgrade(tmp_path):
+    wal = tmp_path / "book.wal"
+    write_absnap01(tmp_path / "book.wal.snapshot", 0, CONTACTS)
+    book = PersistentAddressBook(str(wal), fsync="always", compact_threshold=None)
+    assert book.upgraded_from == "ABSNAP01"
+    book.find("Олена").add_phone("0931234567")
+    book.close()
+
+    book = PersistentAddressBook(str(wal), compact_threshold=None)
+    assert book.upgraded_from is None
+    assert str(book.find("Олена")) == "Contact name: Олена, phones: 0931234567"
+    book.close()
+
+def test_unknown_file_is_rejected(tmp_path):
+    path = tmp_path / "book.snapshot"
+    path.write_bytes(b"NOTASNAP" + bytes(64))
+    with pytest.raises(ValueError):
+        MappedAddressBook(str(path))
+
+def test_contact_with_more_phones_than_a_16_bit_count(tmp_path):
+    path = str(tmp_path / "book.wal")
+    book = PersistentAddressBook(path, fsync="never", compact_threshold=None)
+    record = Record("Switchboard")
+    for i in range(70000):
+        record.add_phone(f"05{i:08d}")
+    book.add_record(record)
+    book.add_record(Record("John"))
+    book.compact()
+    book.close()
+
+    book = PersistentAddressBook(path, compact_threshold=None)
+    assert book.snapshot.find("John") == []
+    phones = book.snapshot.find("Switchboard")
+    assert len(phones) == 70000 and phones[-1] == "0500069999"
+    book.close()
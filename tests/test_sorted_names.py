@@ -0,0 +1,81 @@
+"""
+Tests of the sorted name index and range queries.
+"""
+
+import random
+
+from bot.cli.handlers import show_range
+from bot.models import AddressBook, Record
+from bot.models import sorted_keys
+from bot.models.sorted_keys import SortedKeys
+from bot.storage import MappedAddressBook, SQLiteAddressBook, write_snapshot
+
+NAMES = ["Olena", "Ivan", "Kateryna", "Bohdan", "Andrii", "Taras"]
+
+def fill(book, names=NAMES):
+    for name in names:
+        book.add_record(Record(name))
+    return book
+
+def names(records):
+    return [record.name.value for record in records]
+
+def test_sorted_keys_against_a_sorted_list(monkeypatch):
+    monkeypatch.setattr(sorted_keys, "BLOCK_SIZE", 4)
+    rng = random.Random(15)
+    keys, expected = SortedKeys(), set()
+    for _ in range(2000):
+        key = rng.randrange(300)
+        if rng.random() < 0.6:
+            assert keys.add(key) == (key not in expected)
+            expected.add(key)
+        else:
+            assert keys.discard(key) == (key in expected)
+            expected.discard(key)
+    assert list(keys) == sorted(expected)
+    assert len(keys) == len(expected)
+    assert all((key in keys) == (key in expected) for key in range(300))
+    assert list(keys.irange(100, 200)) == [k for k in sorted(expected) if 100 <= k <= 200]
+    assert list(keys.irange(100, 200, inclusive=(False, False))) == [
+        k for k in sorted(expected) if 100 < k < 200
+    ]
+
+def test_book_range_and_listing_follow_changes():
+    book = fill(AddressBook())
+    assert names(book.range("B", "L")) == ["Bohdan", "Ivan", "Kateryna"]
+    assert names(book.range(None, "B")) == ["Andrii"]
+    book.add_record(Record("Dmytro"))
+    book.delete("Ivan")
+    assert names(book.range("B", "L")) == ["Bohdan", "Dmytro", "Kateryna"]
+    assert names(book.records_after("K")) == ["Kateryna", "Olena", "Taras"]
+
+def test_range_command():
+    book = fill(AddressBook())
+    assert list(show_range(["Ivan", "Olena"], book)) == [
+        "Contact name: Ivan, phones: \n"
+        "Contact name: Kateryna, phones: \n"
+        "Contact name: Olena, phones: "
+    ]
+    assert list(show_range(["X", "Z"], book)) == ["No contacts from X to Z."]
+    assert list(show_range(["X"], book)) == ["Give me the first and the last name of the range."]
+
+def test_backends_list_in_the_same_order(tmp_path):
+    snapshot = str(tmp_path / "book.snapshot")
+    write_snapshot(fill(AddressBook(), NAMES[:3]), snapshot, generation=1)
+    mapped = fill(MappedAddressBook(snapshot), NAMES[3:])
+    sqlite = fill(SQLiteAddressBook(str(tmp_path / "contacts.db")))
+    for book in (mapped, sqlite):
+        assert names(book.range("B", "L")) == ["Bohdan", "Ivan", "Kateryna"]
+        assert names(book.records_after("Kateryna")) == ["Olena", "Taras"]
+    listed = next(iter(mapped.range("Ivan", "Ivan")))
+    assert mapped.find("Ivan") is listed
+    mapped.close()
+    sqlite.close()
+
+def test_range_command_reports_errors_raised_while_streaming():
+    class FailingBook(AddressBook):
+        def range(self, start=None, end=None):
+            raise KeyError(start)
+            yield
+
+    assert list(show_range(["A", "B"], FailingBook())) == ["Contact not found."]
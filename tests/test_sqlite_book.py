@@ -0,0 +1,74 @@
+"""
+Tests of the SQLite-backed address book.
+"""
+
+from bot.models import Record
+from bot.storage import SQLiteAddressBook
+
+def add(book, name, *phones):
+    record = Record(name)
+    for phone in phones:
+        record.add_phone(phone)
+    book.add_record(record)
+    return record
+
+def test_records_round_trip(tmp_path):
+    path = str(tmp_path / "contacts.db")
+    book = SQLiteAddressBook(path, batch_size=2)
+    add(book, "John", "0501234567", "0671234567")
+    add(book, "Олена", "0501234567")
+    add(book, "Jane")
+    book.close()
+
+    book = SQLiteAddressBook(path)
+    assert len(book) == 3
+    assert list(book) == ["John", "Олена", "Jane"]
+    assert "Jane" in book and "Olga" not in book
+    assert str(book.find("John")) == "Contact name: John, phones: 0501234567; 0671234567"
+    assert book.find("Olga") is None
+    assert [str(record) for record in book.values()] == [
+        "Contact name: John, phones: 0501234567; 0671234567",
+        "Contact name: Олена, phones: 0501234567",
+        "Contact name: Jane, phones: ",
+    ]
+    assert [record.name.value for record in book.find_by_phone("0501234567")] == [
+        "John", "Олена",
+    ]
+    book.close()
+
+def test_record_changes_are_written_back(tmp_path):
+    path = str(tmp_path / "contacts.db")
+    book = SQLiteAddressBook(path)
+    add(book, "John", "0500000001", "0500000002", "0500000003")
+    record = book.find("John")
+    record.edit_phone("0500000002", "0990000000")
+    record.remove_phone("0500000001")
+    record.add_phone("0500000004")
+    book.commit()
+    assert str(book.find("John")) == (
+        "Contact name: John, phones: 0990000000; 0500000003; 0500000004"
+    )
+    assert book.find_by_phone("0500000002") == []
+
+    add(book, "John", "0931234567")
+    assert str(book.find("John")) == "Contact name: John, phones: 0931234567"
+    book.delete("John")
+    book.delete("John")
+    assert len(book) == 0
+    assert book.find_by_phone("0931234567") == []
+    book.close()
+
+def test_batch_size_bounds_the_uncommitted_changes(tmp_path):
+    path = str(tmp_path / "contacts.db")
+    book = SQLiteAddressBook(path, batch_size=1)
+    reader = SQLiteAddressBook(path)
+    add(book, "John", "0501234567")
+    assert str(reader.find("John")) == "Contact name: John, phones: 0501234567"
+
+    book.batch_size = 1000
+    add(book, "Jane")
+    assert "Jane" not in reader
+    book.commit()
+    assert "Jane" in reader
+    reader.close()
+    book.close()
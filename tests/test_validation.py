@@ -0,0 +1,34 @@
+"""
+Tests of non-raising bulk phone validation.
+"""
+
+import re
+
+import pytest
+
+from bot.models import AddressBook, Phone, Record, validate_phones
+
+SAMPLES = ["0501234567", "050123456", "05012345678", "050-123-45", "abcdefghij", "",
+           "0000000000", " 050123456", "٠١٢٣٤٥٦٧٨٩"]
+
+@pytest.mark.parametrize("value", SAMPLES)
+def test_try_parse_agrees_with_the_constructor(value):
+    try:
+        expected = Phone(value)
+    except ValueError:
+        expected = None
+    assert Phone.try_parse(value) == expected
+    assert (Phone.try_parse(value) is not None) == bool(re.fullmatch(r"\d{10}", value))
+
+def test_validate_phones_returns_a_mask():
+    assert validate_phones(SAMPLES) == [Phone.try_parse(v) is not None for v in SAMPLES]
+    assert validate_phones([]) == []
+
+def test_add_phones_reports_the_rejected_numbers():
+    book = AddressBook()
+    record = Record("John")
+    book.add_record(record)
+    rejected = record.add_phones(["0501234567", "bad", "0671234567", "0501234567", "123"])
+    assert rejected == ["bad", "123"]
+    assert [phone.value for phone in record.phones] == ["0501234567", "0671234567"]
+    assert [r.name.value for r in book.find_by_phone("0671234567")] == ["John"]
@@ -0,0 +1,115 @@
+"""
+Tests of the write-ahead log and of the address book replaying it.
+"""
+
+import pytest
+
+from bot.models import Record
+from bot.storage import FSYNC_POLICIES, PersistentAddressBook, WriteAheadLog, read_log
+from bot.storage.wal import (
+    MAX_FIELD_BYTES, MAX_PAYLOAD, OP_ADD_PHONE, OP_ADD_RECORD, OP_DELETE_RECORD, encode_entry,
+)
+
+@pytest.mark.parametrize("fsync", FSYNC_POLICIES)
+def test_log_round_trip(tmp_path, fsync):
+    path = str(tmp_path / "book.wal")
+    log = WriteAheadLog(path, fsync=fsync)
+    log.append(OP_ADD_RECORD, "Олена")
+    log.append(OP_ADD_PHONE, "Олена", "0501234567")
+    log.append(OP_DELETE_RECORD, "Олена")
+    log.close()
+    assert list(read_log(path)) == [
+        (OP_ADD_RECORD, "Олена"),
+        (OP_ADD_PHONE, "Олена", "0501234567"),
+        (OP_DELETE_RECORD, "Олена"),
+    ]
+
+def test_unknown_fsync_policy(tmp_path):
+    with pytest.raises(ValueError):
+        WriteAheadLog(str(tmp_path / "book.wal"), fsync="sometimes")
+
+def test_torn_tail_is_ignored_and_cut_off(tmp_path):
+    path = tmp_path / "book.wal"
+    log = WriteAheadLog(str(path), fsync="always")
+    log.append(OP_ADD_RECORD, "John")
+    log.append(OP_ADD_RECORD, "Jane")
+    log.close()
+    intact = path.stat().st_size
+    with open(path, "ab") as file:
+        file.write(b"\x01\x02\x03")
+    assert list(read_log(str(path))) == [(OP_ADD_RECORD, "John"), (OP_ADD_RECORD, "Jane")]
+
+    log = WriteAheadLog(str(path), fsync="always")
+    assert path.stat().st_size == intact
+    log.append(OP_ADD_RECORD, "Olena")
+    log.close()
+    assert [name for _, name in read_log(str(path))] == ["John", "Jane", "Olena"]
+
+def test_corrupted_entry_ends_the_replay(tmp_path):
+    path = tmp_path / "book.wal"
+    log = WriteAheadLog(str(path), fsync="always")
+    log.append(OP_ADD_RECORD, "John")
+    log.append(OP_ADD_RECORD, "Jane")
+    log.close()
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    assert list(read_log(str(path))) == [(OP_ADD_RECORD, "John")]
+
+@pytest.mark.parametrize("fsync", FSYNC_POLICIES)
+def test_book_survives_reopen(tmp_path, fsync):
+    path = str(tmp_path / "book.wal")
+    book = PersistentAddressBook(path, fsync=fsync)
+    record = Record("John")
+    record.add_phone("0501234567")
+    book.add_record(record)
+    record.add_phone("0671234567")
+    record.edit_phone("0501234567", "0931234567")
+    jane = Record("Jane")
+    jane.add_phone("0671234567")
+    book.add_record(jane)
+    jane.remove_phone("0671234567")
+    book.add_record(Record("Olena"))
+    book.delete("Olena")
+    book.close()
+
+    book = PersistentAddressBook(path, fsync=fsync)
+    assert sorted(book) == ["Jane", "John"]
+    assert str(book.find("John")) == "Contact name: John, phones: 0931234567; 0671234567"
+    assert str(book.find("Jane")) == "Contact name: Jane, phones: "
+    assert book.find_by_phone("0931234567") == [book.find("John")]
+    assert book.replayed > 0
+    book.close()
+
+def test_sync_makes_batched_mutations_visible(tmp_path):
+    path = str(tmp_path / "book.wal")
+    book = PersistentAddressBook(path, fsync="batch", batch_size=10**6, batch_interval=60)
+    book.add_record(Record("John"))
+    book.sync()
+    assert list(read_log(path)) == [(OP_ADD_RECORD, "John")]
+    book.close()
+
+def test_oversized_fields_are_rejected(tmp_path):
+    path = str(tmp_path / "book.wal")
+    with pytest.raises(ValueError):
+        encode_entry(OP_ADD_RECORD, "x" * (MAX_PAYLOAD + 1))
+    book = PersistentAddressBook(path, fsync="always")
+    with pytest.raises(ValueError):
+        book.add_record(Record("x" * (MAX_FIELD_BYTES + 1)))
+    assert len(book) == 0
+    book.add_record(Record("John"))
+    book.close()
+    assert list(read_log(path)) == [(OP_ADD_RECORD, "John")]
+
+def test_failed_group_commit_is_raised(tmp_path, monkeypatch):
+    def failing_fsync(fd):
+        raise OSError(28, "No space left on device")
+
+    log = WriteAheadLog(str(tmp_path / "book.wal"), fsync="batch", batch_size=1)
+    monkeypatch.setattr("bot.storage.wal.os.fsync", failing_fsync)
+    log.append(OP_ADD_RECORD, "John")
+    log._flusher.join(5)
+    with pytest.raises(OSError):
+        log.append(OP_ADD_RECORD, "Jane")
+    with pytest.raises(OSError):
+        log.close()